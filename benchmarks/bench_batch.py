@@ -0,0 +1,50 @@
+"""Benchmarks comparing proper_tea.numpy.validate_batch with assigning values
+one at a time.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+size = 100000
+
+
+class Batch:
+    percent = pt.int_in_range((0, 100))
+    colour = pt.in_set({"red", "green", "blue"})
+    odd = pt.property_factory(condition=lambda x: x % 2 == 1)
+
+
+def make_values(name):
+    rng = np.random.default_rng(0)
+    if name == "colour":
+        return rng.choice(["red", "green", "blue", "purple"], size)
+    return rng.uniform(-10, 110, size)
+
+
+def assign_all(name, values):
+    obj = Batch()
+    valid = np.ones(len(values), dtype=bool)
+    for idx, value in enumerate(values):
+        try:
+            setattr(obj, name, value)
+        except ValueError:
+            valid[idx] = False
+    return valid
+
+
+@pytest.mark.benchmark(group="batch")
+@pytest.mark.parametrize("name", ["percent", "colour", "odd"])
+@pytest.mark.parametrize("method", ["loop", "batch"])
+def bench_batch(benchmark, name, method):
+    values = make_values(name)
+    if method == "loop":
+        values = values.tolist()
+        benchmark(assign_all, name, values)
+    else:
+        benchmark(pt.numpy.validate_batch, getattr(Batch, name), values)
@@ -0,0 +1,39 @@
+"""Benchmarks for the class decorators in proper_tea.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+
+
+class Item:
+    weight = pt.positive()
+    price = pt.positive_int()
+    temperature = pt.float_greater_than(-273.15)
+    rating = pt.int_in_range((1, 10))
+    format = pt.in_set({"jpeg", "png"})
+
+    def __init__(self, weight, price, temperature, rating, format):
+        self.weight = weight
+        self.price = price
+        self.temperature = temperature
+        self.rating = rating
+        self.format = format
+
+
+@pt.model
+class ModelItem:
+    weight = pt.positive()
+    price = pt.positive_int()
+    temperature = pt.float_greater_than(-273.15)
+    rating = pt.int_in_range((1, 10))
+    format = pt.in_set({"jpeg", "png"})
+
+
+@pytest.mark.benchmark(group="init")
+@pytest.mark.parametrize("cls", [Item, ModelItem], ids=["setters", "model"])
+def bench_init(benchmark, cls):
+    benchmark(cls, 2.4, 300, 20.0, 5, "png")
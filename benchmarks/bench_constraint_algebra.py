@@ -0,0 +1,65 @@
+"""Benchmarks comparing constraints combined with '&', '|' and '~' against the
+equivalent nested lambdas.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+
+allowed = set(range(0, 1000, 3))
+
+combined = {
+    "ranges": pt.int_in_range((0, 100)) & pt.greater_than(5) & ~pt.in_range((40, 50)),
+    "with-set": pt.positive_int(allow_zero=False)
+    & pt.not_in_range((10, 20))
+    & pt.in_set(allowed),
+}
+
+
+def greater_than(x):
+    return lambda v: v > x
+
+
+def in_range(lower, upper):
+    return lambda v: lower <= v <= upper
+
+
+def not_in_range(lower, upper):
+    return lambda v: v < lower or v > upper
+
+
+def all_of(*conditions):
+    return lambda v: all(condition(v) for condition in conditions)
+
+
+nested = {
+    "ranges": pt.property_factory(
+        condition=all_of(
+            in_range(0, 100),
+            greater_than(5),
+            lambda v: not in_range(40, 50)(v),
+        ),
+        transform=int,
+    ),
+    "with-set": pt.property_factory(
+        condition=all_of(greater_than(0), not_in_range(10, 20), lambda v: v in allowed),
+        transform=int,
+    ),
+}
+
+
+@pytest.mark.benchmark(group="constraint-algebra")
+@pytest.mark.parametrize("case", ["ranges", "with-set"])
+@pytest.mark.parametrize("method", ["combined", "nested-lambdas"])
+def bench_constraint_algebra(benchmark, case, method):
+    prop = combined[case] if method == "combined" else nested[case]
+    cls = type("MyClass", (), {"x": prop})
+    obj = cls()
+
+    def write():
+        obj.x = 60
+
+    benchmark(write)
@@ -0,0 +1,51 @@
+"""Benchmarks for assignment to properties created by in_set.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import tracemalloc
+import proper_tea as pt
+
+sizes = [2, 100, 10000]
+
+
+@pytest.mark.benchmark(group="in_set")
+@pytest.mark.parametrize("size", sizes)
+def bench_in_set(benchmark, size):
+    codes = [f"P{i:06d}" for i in range(size)]
+    cls = type("MyClass", (), {"x": pt.in_set(codes)})
+    obj = cls()
+    value = codes[-1]
+
+    def write():
+        obj.x = value
+
+    benchmark(write)
+
+
+@pytest.mark.benchmark(group="in_set-memory")
+@pytest.mark.parametrize("encode", [False, True], ids=["plain", "encoded"])
+def bench_in_set_memory(benchmark, encode):
+    """Memory used by a million instances, reported under 'extra_info'."""
+    cls = type("MyClass", (), {"x": pt.in_set({"jpeg", "png"}, encode=encode)})
+    n = 1000000
+
+    def build():
+        items = [cls() for _ in range(n)]
+        for item in items:
+            # Strings read from a file are distinct objects, even when equal
+            item.x = "".join(["pn", "g"])
+        return items
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build()
+    benchmark.extra_info["bytes_per_instance"] = (
+        tracemalloc.get_traced_memory()[0] - before
+    ) / n
+    tracemalloc.stop()
+    del items
+    benchmark.pedantic(build, rounds=1, iterations=1)
@@ -0,0 +1,58 @@
+"""Benchmarks for the failure path of a setter.
+
+'eager' raises a ValueError with its message formatted up front, as setters
+did before errors were formatted lazily. 'lazy' is the current setter, and
+'check' validates without raising using proper_tea.check. Each rejects a value
+and, as a filtering pipeline would, discards the error unread.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+
+
+class Validated:
+    x = pt.float_in_range((0.0, 10.0))
+
+
+class Eager:
+    """Hand-written setter which formats its message before raising."""
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        if not 0.0 <= value <= 10.0:
+            raise ValueError(
+                f"Setter condition for property 'x' in class "
+                f"{self.__class__.__name__} returned False.\n"
+                f"{Validated.x.condition_err_msg}"
+            )
+        self._x = value
+
+
+@pytest.mark.benchmark(group="errors-reject")
+@pytest.mark.parametrize("method", ["eager", "lazy", "check"])
+def bench_reject(benchmark, method):
+    if method == "check":
+
+        def reject():
+            pt.check(Validated, "x", 20.0)
+
+    else:
+        obj = Eager() if method == "eager" else Validated()
+
+        def reject():
+            try:
+                obj.x = 20.0
+            except ValueError:
+                pass
+
+    # Generate the checker before measuring
+    reject()
+    benchmark(reject)
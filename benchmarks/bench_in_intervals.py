@@ -0,0 +1,48 @@
+"""Benchmarks comparing in_intervals with a chain of per-band conditions.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+n_bands = [10, 100, 1000]
+
+
+def make_bands(n):
+    return [(10.0 * i, 10.0 * i + 5.0) for i in range(n)]
+
+
+def chained(bands):
+    return pt.property_factory(
+        condition=lambda x: any(lower <= x <= upper for lower, upper in bands)
+    )
+
+
+@pytest.mark.benchmark(group="in_intervals")
+@pytest.mark.parametrize("n", n_bands)
+@pytest.mark.parametrize("method", ["in_intervals", "chained"])
+def bench_in_intervals(benchmark, method, n):
+    bands = make_bands(n)
+    prop = pt.in_intervals(bands) if method == "in_intervals" else chained(bands)
+    cls = type("MyClass", (), {"x": prop})
+    obj = cls()
+    # Falls in the last band, the worst case for a chain of conditions
+    value = bands[-1][0] + 1.0
+
+    def write():
+        obj.x = value
+
+    benchmark(write)
+
+
+@pytest.mark.benchmark(group="in_intervals-batch")
+@pytest.mark.parametrize("n", n_bands)
+def bench_in_intervals_batch(benchmark, n):
+    cls = type("MyClass", (), {"x": pt.in_intervals(make_bands(n))})
+    values = np.random.default_rng(0).uniform(0, 10 * n, 100000)
+    benchmark(pt.numpy.validate_batch, cls.x, values)
@@ -0,0 +1,36 @@
+"""Benchmarks for assignment with and without instrumentation.
+
+'disabled' switches instrumentation on and then off again before measuring,
+and should match 'never-enabled'.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+
+
+class Validated:
+    x = pt.float_in_range((0.0, 10.0))
+
+
+@pytest.mark.benchmark(group="instrumentation-write")
+@pytest.mark.parametrize("mode", ["never-enabled", "disabled", "enabled"])
+def bench_write(benchmark, mode):
+    obj = Validated()
+
+    def write():
+        obj.x = 2.0
+
+    if mode == "never-enabled":
+        benchmark(write)
+    elif mode == "disabled":
+        with pt.instrumented():
+            write()
+        benchmark(write)
+    else:
+        with pt.instrumented():
+            benchmark(write)
+        pt.reset_stats()
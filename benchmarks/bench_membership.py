@@ -0,0 +1,64 @@
+"""Benchmarks for the in_set membership backends in proper_tea.numpy.
+
+Lookup latency is measured by the benchmark itself, while the memory held by
+each backend is reported under 'extra_info'. The number of allowed values may
+be set using the environment variable PT_BENCH_MEMBERSHIP_SIZE.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import os
+import tracemalloc
+
+import pytest
+import proper_tea as pt
+import proper_tea.numpy
+
+size = int(os.environ.get("PT_BENCH_MEMBERSHIP_SIZE", 1000000))
+
+
+@pytest.fixture(scope="module")
+def codes():
+    return [f"P{i:09d}" for i in range(0, 2 * size, 2)]
+
+
+@pytest.fixture(scope="module")
+def mapped_path(tmp_path_factory, codes):
+    path = tmp_path_factory.mktemp("membership") / "codes.npy"
+    pt.numpy.MappedSortedSet.write(path, codes)
+    return path
+
+
+def make_backend(kind, codes, mapped_path):
+    if kind == "frozenset":
+        return codes
+    if kind == "sorted":
+        return pt.numpy.SortedArraySet(codes)
+    if kind == "mapped":
+        return pt.numpy.MappedSortedSet(mapped_path)
+    if kind == "mapped-bloom":
+        return pt.numpy.BloomFilter(pt.numpy.MappedSortedSet(mapped_path))
+
+
+@pytest.mark.benchmark(group="membership")
+@pytest.mark.parametrize("kind", ["frozenset", "sorted", "mapped", "mapped-bloom"])
+@pytest.mark.parametrize("hit", [True, False], ids=["hit", "miss"])
+def bench_membership(benchmark, codes, mapped_path, kind, hit):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cls = type("MyClass", (), {"x": pt.in_set(make_backend(kind, codes, mapped_path))})
+    benchmark.extra_info["resident_bytes"] = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    obj = cls()
+    value = codes[size // 2] if hit else "P000000001"
+
+    def write():
+        try:
+            obj.x = value
+        except ValueError:
+            pass
+
+    benchmark(write)
@@ -0,0 +1,124 @@
+"""Benchmarks for assigning to numpy_array(sort=True) and mapped_array
+properties.
+
+'np.sort' is the previous behaviour, which sorted every input into a new
+array. The remaining cases check whether the input is already sorted first,
+and differ in how unsorted input is sorted.
+
+The number of elements may be set using the environment variable
+PT_BENCH_SORT_SIZE, and defaults to ten million. 'nearly-sorted' swaps one
+pair of neighbouring elements in every thousand.
+
+The 'numpy-layout' group measures the overhead of memory layout requirements
+which the input already meets, and of storing a read-only view.
+
+'mapped' compares loading a .npy file of the same size into memory and
+assigning it to a numpy_array property, against mapping it with a
+mapped_array property and reading one row.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import os
+
+import numpy as np
+import pytest
+import proper_tea as pt
+import proper_tea.numpy
+
+size = int(os.environ.get("PT_BENCH_SORT_SIZE", 10000000))
+
+
+def make_array(order):
+    rng = np.random.default_rng(42)
+    x = np.sort(rng.random(size))
+    if order == "nearly-sorted":
+        idx = np.arange(0, size - 1, 1000)
+        x[idx], x[idx + 1] = x[idx + 1], x[idx].copy()
+    elif order == "random":
+        rng.shuffle(x)
+    return x
+
+
+class Sorted:
+    default = pt.numpy.numpy_array(sort=True)
+    stable = pt.numpy.numpy_array(sort=True, kind="stable")
+    in_place = pt.numpy.numpy_array(sort=True, in_place=True)
+
+
+@pytest.mark.benchmark(group="numpy-sort")
+@pytest.mark.parametrize("order", ["sorted", "nearly-sorted", "random"])
+@pytest.mark.parametrize("method", ["np.sort", "default", "stable", "in_place"])
+def bench_sort(benchmark, method, order):
+    x = make_array(order)
+    obj = Sorted()
+    if method == "np.sort":
+
+        def assign():
+            obj.default = np.sort(np.asarray(x))
+
+    elif method == "in_place":
+        # Each round sorts a fresh copy, made outside of the timed region
+        def setup():
+            return (x.copy(),), {}
+
+        def assign(y):
+            obj.in_place = y
+
+        benchmark.pedantic(assign, setup=setup, rounds=5)
+        return
+
+    else:
+
+        def assign():
+            setattr(obj, method, x)
+
+    benchmark.pedantic(assign, rounds=5)
+
+
+class Loaded:
+    array = pt.numpy.numpy_array(shape=(None, 10), dtype=float)
+    mapped = pt.numpy.mapped_array(shape=(None, 10), dtype=float)
+
+
+@pytest.fixture(scope="module")
+def npy(tmp_path_factory):
+    path = tmp_path_factory.mktemp("mapped") / "table.npy"
+    np.save(path, np.random.default_rng(42).random((size // 10, 10)))
+    return path
+
+
+@pytest.mark.benchmark(group="numpy-mapped")
+@pytest.mark.parametrize("method", ["np.load", "mapped_array"])
+def bench_mapped(benchmark, method, npy):
+    obj = Loaded()
+    if method == "np.load":
+
+        def assign():
+            obj.array = np.load(npy)
+            return obj.array[0]
+
+    else:
+
+        def assign():
+            obj.mapped = npy
+            return obj.mapped[0]
+
+    benchmark.pedantic(assign, rounds=5)
+
+
+class Layout:
+    plain = pt.numpy.numpy_array()
+    c_order = pt.numpy.numpy_array(order="C")
+    aligned = pt.numpy.numpy_array(aligned=True)
+    frozen = pt.numpy.numpy_array(writeable=False)
+
+
+@pytest.mark.benchmark(group="numpy-layout")
+@pytest.mark.parametrize("name", ["plain", "c_order", "aligned", "frozen"])
+def bench_layout(benchmark, name):
+    obj = Layout()
+    x = np.zeros((100, 100))
+    benchmark(setattr, obj, name, x)
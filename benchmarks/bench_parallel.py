@@ -0,0 +1,33 @@
+"""Benchmarks showing how proper_tea.parallel_validate scales with the number
+of worker processes.
+
+Throughput in records per second is reported under 'extra_info'. The number of
+records may be set using the environment variable PT_BENCH_PARALLEL_SIZE.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import os
+
+import pytest
+import proper_tea as pt
+from conftest import Reading, feed, record_extra_info
+
+size = int(os.environ.get("PT_BENCH_PARALLEL_SIZE", 500000))
+max_workers = os.cpu_count() or 1
+
+
+@pytest.fixture(scope="module")
+def records():
+    return list(feed(size))
+
+
+@pytest.mark.benchmark(group="parallel")
+@pytest.mark.parametrize(
+    "workers", sorted({1, 2, 4, 8, max_workers} & set(range(1, max_workers + 1)))
+)
+def bench_parallel_validate(benchmark, records, workers):
+    benchmark.pedantic(pt.parallel_validate, args=(Reading, records, workers), rounds=1)
+    record_extra_info(benchmark, "records_per_second", lambda mean: size / mean)
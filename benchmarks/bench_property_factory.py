@@ -0,0 +1,54 @@
+"""Benchmarks for the descriptor underlying all proper_tea properties.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+
+
+class Plain:
+    def __init__(self):
+        self.x = 1.0
+
+
+class Validated:
+    x = pt.positive()
+
+    def __init__(self):
+        self.x = 1.0
+
+
+@pytest.mark.benchmark(group="read")
+def bench_read_plain_attribute(benchmark):
+    obj = Plain()
+    benchmark(lambda: obj.x)
+
+
+@pytest.mark.benchmark(group="read")
+def bench_read_proper_tea(benchmark):
+    obj = Validated()
+    benchmark(lambda: obj.x)
+
+
+def expensive_transform(x):
+    # Stands in for e.g. parsing or a database lookup
+    return sum(float(c) for c in str(x).split(","))
+
+
+@pytest.mark.benchmark(group="cache")
+@pytest.mark.parametrize("cache", [None, True], ids=["uncached", "cached"])
+def bench_write_cache(benchmark, cache):
+    cls = type(
+        "MyClass",
+        (),
+        {"x": pt.property_factory(transform=expensive_transform, cache=cache)},
+    )
+    obj = cls()
+
+    def write():
+        obj.x = "1.5,2.5,3.5"
+
+    benchmark(write)
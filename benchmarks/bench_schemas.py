@@ -0,0 +1,41 @@
+"""Benchmarks for validating a stream of records with proper_tea.schema,
+compared with creating an instance from each record.
+
+Throughput in records per second is reported under 'extra_info'. The number of
+records may be set using the environment variable PT_BENCH_STREAM_SIZE, and
+defaults to one million. One record in every hundred is invalid.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+from conftest import Reading, feed, record_extra_info, stream_size
+
+
+def validate_all(validate):
+    valid = 0
+    for record in feed():
+        try:
+            validate(record)
+        except ValueError:
+            continue
+        valid += 1
+    return valid
+
+
+@pytest.mark.benchmark(group="schema-stream")
+@pytest.mark.parametrize("method", ["instance", "schema-dict", "schema-tuple"])
+def bench_schema(benchmark, method):
+    if method == "instance":
+
+        def validate(record):
+            return Reading(**record)
+
+    else:
+        validate = pt.schema(Reading, as_tuple=method == "schema-tuple")
+    valid = benchmark.pedantic(validate_all, args=(validate,), rounds=1)
+    assert valid == stream_size - stream_size // 100
+    record_extra_info(benchmark, "records_per_second", lambda mean: stream_size / mean)
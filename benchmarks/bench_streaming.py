@@ -0,0 +1,47 @@
+"""Benchmarks for proper_tea.stream on a synthetic feed of records.
+
+Throughput in records per second is reported under 'extra_info'. The number of
+records may be set using the environment variable PT_BENCH_STREAM_SIZE, and
+defaults to one million. One record in every hundred is invalid.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+from collections import deque
+
+import pytest
+import proper_tea as pt
+from conftest import Reading, feed, record_extra_info, stream_size
+
+
+def loop():
+    # The baseline: construct each instance in its own try/except
+    items, rejects = [], []
+    for record in feed():
+        try:
+            items.append(Reading(**record))
+        except ValueError as exc:
+            rejects.append((record, exc))
+    return items
+
+
+def consume(items):
+    # Discard instances as they arrive, so memory use stays bounded
+    deque(items, maxlen=0)
+
+
+@pytest.mark.benchmark(group="stream")
+@pytest.mark.parametrize("method", ["loop", "stream"])
+def bench_stream(benchmark, method):
+    if method == "loop":
+        benchmark.pedantic(loop, rounds=1)
+    else:
+        rejects = []
+        benchmark.pedantic(
+            lambda: consume(pt.stream(Reading, feed(), rejects=rejects.append)),
+            rounds=1,
+        )
+        assert len(rejects) == stream_size // 100
+    record_extra_info(benchmark, "records_per_second", lambda mean: stream_size / mean)
@@ -0,0 +1,124 @@
+"""Baseline benchmarks for reading and writing every kind of proper_tea
+property, alongside a plain attribute and the hand-written property from the
+README.
+
+Every case is in the group 'suite-write' or 'suite-read', so each property is
+compared directly against the two baselines. The mean time per operation in
+nanoseconds is also stored under 'extra_info' as 'ns_per_op'.
+
+Results for the committed baseline are stored in benchmarks/baseline. To
+compare against them, failing if any case has become more than 20% slower:
+
+    pytest benchmarks/bench_suite.py --benchmark-time-unit=ns \\
+        --benchmark-storage=file://benchmarks/baseline \\
+        --benchmark-compare --benchmark-compare-fail=mean:20%
+
+To update the baseline, replace the '--benchmark-compare' options with
+'--benchmark-save=baseline'. Baselines are stored separately for each
+platform and Python version.
+"""
+
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+from conftest import record_extra_info
+
+
+class Plain:
+    pass
+
+
+class Handwritten:
+    """The hand-written Item.weight property from the README."""
+
+    @property
+    def weight(self):
+        return self._weight
+
+    @weight.setter
+    def weight(self, value):
+        if value < 0:
+            raise ValueError("Weight cannot be negative")
+        self._weight = value
+
+
+large_set = [f"P{i:06d}" for i in range(100000)]
+
+# (name, property, valid value)
+cases = [
+    ("floating_point", pt.floating_point(), 2.0),
+    ("integer", pt.integer(), 2),
+    ("boolean", pt.boolean(), True),
+    ("positive", pt.positive(), 2.0),
+    ("positive_float", pt.positive_float(), 2.0),
+    ("positive_int", pt.positive_int(), 2),
+    ("negative", pt.negative(), -2.0),
+    ("negative_float", pt.negative_float(), -2.0),
+    ("negative_int", pt.negative_int(), -2),
+    ("greater_than", pt.greater_than(1.0), 2.0),
+    ("float_greater_than", pt.float_greater_than(1.0), 2.0),
+    ("int_greater_than", pt.int_greater_than(1), 2),
+    ("less_than", pt.less_than(3.0), 2.0),
+    ("float_less_than", pt.float_less_than(3.0), 2.0),
+    ("int_less_than", pt.int_less_than(3), 2),
+    ("in_range", pt.in_range((0, 10)), 2.0),
+    ("float_in_range", pt.float_in_range((0, 10)), 2.0),
+    ("int_in_range", pt.int_in_range((0, 10)), 2),
+    ("not_in_range", pt.not_in_range((10, 20)), 2.0),
+    ("float_not_in_range", pt.float_not_in_range((10, 20)), 2.0),
+    ("int_not_in_range", pt.int_not_in_range((10, 20)), 2),
+    ("in_set-small", pt.in_set({"jpeg", "png", "gif"}), "png"),
+    ("in_set-large", pt.in_set(large_set), large_set[-1]),
+    ("numpy_array", pt.numpy.numpy_array(), np.zeros(8)),
+    ("numpy_array-shape", pt.numpy.numpy_array(shape=8), np.zeros(8)),
+    ("numpy_array-dtype", pt.numpy.numpy_array(dtype=float), np.zeros(8)),
+    ("numpy_array-sort", pt.numpy.numpy_array(sort=True), np.zeros(8)),
+    (
+        "numpy_array-all",
+        pt.numpy.numpy_array(shape=8, dtype=float, sort=True),
+        np.zeros(8),
+    ),
+]
+
+
+def make_object(name):
+    if name == "attribute":
+        return Plain(), "weight", 2.0
+    if name == "handwritten":
+        return Handwritten(), "weight", 2.0
+    for case_name, prop, value in cases:
+        if case_name == name:
+            cls = type("MyClass", (), {"x": prop})
+            return cls(), "x", value
+    raise ValueError(name)
+
+
+names = ["attribute", "handwritten", *(case[0] for case in cases)]
+
+
+def record(benchmark):
+    record_extra_info(benchmark, "ns_per_op", lambda mean: mean * 1e9)
+
+
+@pytest.mark.benchmark(group="suite-write")
+@pytest.mark.parametrize("name", names)
+def bench_write(benchmark, name):
+    obj, attr, value = make_object(name)
+    # Compile a function which assigns to the attribute directly, as
+    # setattr() would add overhead which is not present in real code
+    namespace = {}
+    exec(f"def write(obj, value):\n    obj.{attr} = value", namespace)
+    benchmark(namespace["write"], obj, value)
+    record(benchmark)
+
+
+@pytest.mark.benchmark(group="suite-read")
+@pytest.mark.parametrize("name", names)
+def bench_read(benchmark, name):
+    obj, attr, value = make_object(name)
+    setattr(obj, attr, value)
+    namespace = {}
+    exec(f"def read(obj):\n    return obj.{attr}", namespace)
+    benchmark(namespace["read"], obj)
+    record(benchmark)
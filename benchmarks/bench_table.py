@@ -0,0 +1,73 @@
+"""Benchmarks comparing proper_tea.numpy.Table with a list of instances.
+
+Bulk-update throughput is measured by the benchmark itself, while the memory
+held by each container is reported under 'extra_info'.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import tracemalloc
+
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+size = 100000
+
+
+@pt.model
+class Point:
+    x = pt.floating_point()
+    y = pt.floating_point()
+    weight = pt.positive()
+    count = pt.positive_int()
+
+
+def make_container(kind):
+    if kind == "list":
+        return [Point(0.0, 0.0, 1.0, 1) for _ in range(size)]
+    return pt.numpy.Table(Point, size)
+
+
+@pytest.mark.benchmark(group="table-memory")
+@pytest.mark.parametrize("kind", ["list", "table"])
+def bench_table_memory(benchmark, kind):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = benchmark.pedantic(make_container, args=(kind,), rounds=1)
+    benchmark.extra_info["bytes_per_row"] = (
+        tracemalloc.get_traced_memory()[0] - before
+    ) / size
+    tracemalloc.stop()
+    del container
+
+
+@pytest.mark.benchmark(group="table-update")
+@pytest.mark.parametrize("kind", ["list", "table", "table-rows"])
+def bench_table_update(benchmark, kind):
+    container = make_container("list" if kind == "list" else "table")
+    counts = np.random.default_rng(0).integers(1, 100, size)
+
+    if kind == "list":
+        counts = counts.tolist()
+
+        def update():
+            for point, count in zip(container, counts):
+                point.count = count
+
+    elif kind == "table-rows":
+        counts = counts.tolist()
+
+        def update():
+            for row, count in zip(container, counts):
+                row.count = count
+
+    else:
+
+        def update():
+            container["count"] = counts
+
+    benchmark(update)
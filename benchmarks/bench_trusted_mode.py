@@ -0,0 +1,42 @@
+"""Benchmarks for assignment in trusted mode.
+
+Run with:
+
+    pytest benchmarks --benchmark-group-by=group
+"""
+
+import pytest
+import proper_tea as pt
+
+
+class Plain:
+    pass
+
+
+class Validated:
+    x = pt.float_in_range((0.0, 10.0))
+
+
+@pytest.mark.benchmark(group="trusted-write")
+def bench_write_plain_attribute(benchmark):
+    obj = Plain()
+
+    def write():
+        obj.x = 2.0
+
+    benchmark(write)
+
+
+@pytest.mark.benchmark(group="trusted-write")
+@pytest.mark.parametrize("mode", ["validated", "trusted", "trusted-transforms"])
+def bench_write(benchmark, mode):
+    obj = Validated()
+
+    def write():
+        obj.x = 2.0
+
+    if mode == "validated":
+        benchmark(write)
+    else:
+        with pt.trusted(transforms=(mode == "trusted-transforms")):
+            benchmark(write)
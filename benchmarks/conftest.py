@@ -0,0 +1,40 @@
+"""Shared data and helpers for the benchmarks.
+
+Contains:
+    - Reading
+    - feed
+    - stream_size
+    - record_extra_info
+"""
+
+import os
+
+import proper_tea as pt
+
+# Number of records validated by the streaming and schema benchmarks
+stream_size = int(os.environ.get("PT_BENCH_STREAM_SIZE", 1000000))
+
+
+@pt.model
+class Reading:
+    sensor = pt.in_set({"a", "b", "c"})
+    value = pt.floating_point()
+    count = pt.positive_int()
+
+
+def feed(size: int = stream_size):
+    """Yield 'size' records for Reading, of which one in every hundred has an
+    invalid count."""
+    for i in range(size):
+        count = -1 if i % 100 == 0 else i
+        yield {"sensor": "abc"[i % 3], "value": i * 0.5, "count": count}
+
+
+def record_extra_info(benchmark, key: str, from_mean):
+    """Store 'from_mean' applied to the mean time of a benchmark, in seconds,
+    under benchmark.extra_info[key].
+
+    Nothing is stored under --benchmark-disable, when there are no timings.
+    """
+    if benchmark.stats is not None:
+        benchmark.extra_info[key] = from_mean(benchmark.stats["mean"])
@@ -1,38 +1,135 @@
-try:
-    from importlib.metadata import version, PackageNotFoundError
-except (ModuleNotFoundError, ImportError):
-    from importlib_metadata import version, PackageNotFoundError
-try:
-    __version__ = version("proper_tea")
-except PackageNotFoundError:
-    from setuptools_scm import get_version
-
-    __version__ = get_version(root="..", relative_to=__file__)
-
-__all__ = ["__version__"]
-
-from .property_factory import property_factory
-from .constrained_numbers import (
-    floating_point,
-    integer,
-    boolean,
-    positive,
-    positive_int,
-    positive_float,
-    negative,
-    negative_int,
-    negative_float,
-    greater_than,
-    int_greater_than,
-    float_greater_than,
-    less_than,
-    int_less_than,
-    float_less_than,
-    in_range,
-    int_in_range,
-    float_in_range,
-    not_in_range,
-    int_not_in_range,
-    float_not_in_range,
+from importlib import import_module
+
+from .property_factory import (
+    property_factory,
+    ProperTeaDescriptor,
+    SlottedProperTeaDescriptor,
+)
+from .class_decorators import fields, slotted, model
+from .trusted_mode import trusted, set_trusted, is_trusted
+from .instrumentation import (
+    stats,
+    reset_stats,
+    instrumented,
+    set_instrumented,
+    is_instrumented,
 )
-from .discrete_sets import in_set
+from .errors import (
+    ProperTeaValidationError,
+    ConditionError,
+    TransformError,
+    BatchError,
+    check,
+    CheckResult,
+)
+
+# Names which are imported from their submodule on first access (PEP 562), so
+# that 'import proper_tea' only loads the core of the package
+_lazy = {
+    **dict.fromkeys(
+        [
+            "floating_point",
+            "integer",
+            "boolean",
+            "positive",
+            "positive_int",
+            "positive_float",
+            "negative",
+            "negative_int",
+            "negative_float",
+            "greater_than",
+            "int_greater_than",
+            "float_greater_than",
+            "less_than",
+            "int_less_than",
+            "float_less_than",
+            "in_range",
+            "int_in_range",
+            "float_in_range",
+            "not_in_range",
+            "int_not_in_range",
+            "float_not_in_range",
+            "in_intervals",
+        ],
+        "constrained_numbers",
+    ),
+    "in_set": "discrete_sets",
+    "MembershipBackend": "discrete_sets",
+    "stream": "streaming",
+    "Reject": "streaming",
+    "parallel_validate": "parallel",
+    "schema": "schemas",
+}
+
+_submodules = {
+    "constrained_numbers",
+    "discrete_sets",
+    "streaming",
+    "parallel",
+    "schemas",
+    "numpy",
+}
+
+__all__ = [
+    "__version__",
+    "property_factory",
+    "ProperTeaDescriptor",
+    "SlottedProperTeaDescriptor",
+    "fields",
+    "slotted",
+    "model",
+    "trusted",
+    "set_trusted",
+    "is_trusted",
+    "stats",
+    "reset_stats",
+    "instrumented",
+    "set_instrumented",
+    "is_instrumented",
+    "ProperTeaValidationError",
+    "ConditionError",
+    "TransformError",
+    "BatchError",
+    "check",
+    "CheckResult",
+    *_lazy,
+]
+
+
+def _get_version():
+    # _version.py is written by setuptools_scm when the package is built or
+    # installed. Fall back to the installed metadata, then to the git history.
+    try:
+        from ._version import version
+
+        return version
+    except ImportError:
+        pass
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        from importlib_metadata import version, PackageNotFoundError
+    try:
+        return version("proper_tea")
+    except PackageNotFoundError:
+        from setuptools_scm import get_version
+
+        return get_version(root="..", relative_to=__file__)
+
+
+def __getattr__(name):
+    if name == "__version__":
+        value = _get_version()
+    elif name in _lazy:
+        value = getattr(import_module(f".{_lazy[name]}", __name__), name)
+    elif name in _submodules:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Store the result, so that __getattr__ is not called again for this name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__, *_submodules})
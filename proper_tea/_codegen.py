@@ -0,0 +1,78 @@
+"""_codegen
+
+Utilities for generating specialised functions from source code, in the
+style of the standard library's dataclasses module. Functions are compiled
+once per distinct source text, and any values they depend upon are bound as
+closure variables so they are fast to look up and do not affect the source.
+"""
+
+import builtins
+
+# Maps function source text to the compiled function which creates it.
+_creator_cache = {}
+
+
+class Namespace:
+    """Collects the values referenced by a generated function.
+
+    Each value is given a name derived from 'prefix' and the order in which it
+    was added, so that functions with the same structure share the same
+    source text regardless of the values they are bound to.
+
+    Parameters:
+
+        prefix (str): Prefix for all names created by this namespace.
+    """
+
+    def __init__(self, prefix: str = "_pt_"):
+        self.prefix = prefix
+        self.values = {}
+
+    def add(self, value, hint: str = "c") -> str:
+        """Bind 'value' to a new name and return that name."""
+        name = f"{self.prefix}{hint}{len(self.values)}"
+        self.values[name] = value
+        return name
+
+    def child(self, prefix: str):
+        """Return a namespace which shares storage but uses a longer prefix."""
+        child = Namespace(self.prefix + prefix)
+        child.values = self.values
+        return child
+
+
+def indent(lines, level: int = 1):
+    """Indent each line in 'lines' by 4 spaces per level."""
+    pad = "    " * level
+    return [pad + line for line in lines]
+
+
+def create_function(name: str, args, body, namespace: Namespace):
+    """Compile a function from source, caching the result by source text.
+
+    Parameters:
+
+        name (str): Name of the generated function.
+        args (Iterable[str]): Argument list of the generated function.
+        body (Iterable[str]): Lines making up the function body, without
+            indentation.
+        namespace (Namespace): Values referenced by 'body'.
+
+    Returns:
+
+        function
+    """
+    free_vars = ", ".join(namespace.values)
+    lines = [
+        f"def __create_fn__({free_vars}):",
+        f"    def {name}({', '.join(args)}):",
+        *indent(body, 2),
+        f"    return {name}",
+    ]
+    source = "\n".join(lines)
+    creator = _creator_cache.get(source)
+    if creator is None:
+        local_vars = {}
+        exec(source, {"__builtins__": builtins}, local_vars)
+        creator = _creator_cache[source] = local_vars["__create_fn__"]
+    return creator(**namespace.values)
@@ -0,0 +1,195 @@
+"""class_decorators
+
+Defines class decorators which operate on every proper_tea property of a
+class at once.
+
+Contains:
+    - fields
+    - slotted
+    - model
+"""
+
+import weakref
+
+from ._codegen import Namespace, create_function
+from .property_factory import ProperTeaDescriptor
+from . import trusted_mode, instrumentation
+
+# All classes decorated with 'model', so their __init__ can be regenerated on a
+# mode change
+_models = weakref.WeakSet()
+
+
+def _recompile_models():
+    for cls in list(_models):
+        if getattr(cls.__dict__.get("__init__"), "_pt_generated", False):
+            cls.__init__ = _create_init(cls)
+
+
+trusted_mode._refresh_hooks.append(_recompile_models)
+
+
+def _own_fields(cls):
+    """Return dict of the proper_tea properties defined directly on cls."""
+    own = {
+        name: attr
+        for name, attr in cls.__dict__.items()
+        if isinstance(attr, ProperTeaDescriptor)
+    }
+    for name, descriptor in own.items():
+        if descriptor.name is None:
+            # Attached after the class was created, so __set_name__ was not
+            # called
+            descriptor.__set_name__(cls, name)
+    return own
+
+
+def fields(cls):
+    """Return all proper_tea properties of a class, including inherited ones.
+
+    Parameters:
+
+        cls: The class to inspect.
+
+    Returns:
+
+        dict : Maps attribute names to descriptors. Properties of base classes
+            come first, and otherwise properties are in definition order.
+    """
+    result = {}
+    for klass in reversed(cls.__mro__):
+        result.update(_own_fields(klass))
+    # Subclasses may replace a property with a non-proper_tea attribute
+    return {
+        name: descriptor
+        for name, descriptor in result.items()
+        if isinstance(getattr(cls, name, None), ProperTeaDescriptor)
+    }
+
+
+def _update_class_cells(namespace, old_cls, new_cls):
+    # Methods using zero-argument super() hold a reference to the class they
+    # were defined in via a '__class__' closure cell. Point these at the
+    # rebuilt class, or super() would fail for instances of the new class.
+    for attr in namespace.values():
+        func = getattr(attr, "__func__", attr)
+        if isinstance(attr, property):
+            func = attr.fget
+        closure = getattr(func, "__closure__", None)
+        if not closure:
+            continue
+        for cell in closure:
+            try:
+                if cell.cell_contents is old_cls:
+                    cell.cell_contents = new_cls
+            except ValueError:
+                # Empty cell
+                continue
+
+
+def slotted(cls):
+    """Class decorator which stores every proper_tea property in a slot.
+
+    The class is rebuilt with a ``__slots__`` entry for each proper_tea
+    property defined in its body, and the properties are replaced by
+    equivalent descriptors which read and write the slot storage directly.
+    Any existing ``__slots__`` are preserved. Instances will only be free of a
+    per-instance ``__dict__`` if every base class also defines ``__slots__``.
+
+    Parameters:
+
+        cls: The class to decorate.
+
+    Returns:
+
+        type : A new class with the same name, bases and namespace as 'cls'.
+    """
+    own_fields = _own_fields(cls)
+
+    existing_slots = cls.__dict__.get("__slots__", ())
+    if isinstance(existing_slots, str):
+        existing_slots = (existing_slots,)
+    existing_slots = tuple(existing_slots)
+
+    namespace = dict(cls.__dict__)
+    for name in (*own_fields, *existing_slots, "__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = existing_slots + tuple(
+        name for name in own_fields if name not in existing_slots
+    )
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    new_cls.__qualname__ = cls.__qualname__
+    _update_class_cells(namespace, cls, new_cls)
+
+    for name, descriptor in own_fields.items():
+        slot_descriptor = descriptor._bind_slot(new_cls.__dict__[name])
+        slot_descriptor.__set_name__(new_cls, name)
+        # Python sorts slot names, so delete first to restore definition order
+        delattr(new_cls, name)
+        setattr(new_cls, name, slot_descriptor)
+
+    # An __init__ created by 'model' must be regenerated to write to slots
+    if getattr(namespace.get("__init__"), "_pt_generated", False):
+        new_cls.__init__ = _create_init(new_cls)
+        _models.add(new_cls)
+
+    return new_cls
+
+
+def _create_init(cls):
+    """Generate an __init__ which validates and stores every property."""
+    cls_fields = fields(cls)
+    self_name = "_pt_self" if "self" in cls_fields else "self"
+    namespace = Namespace()
+    mode = trusted_mode._mode
+    instrument = instrumentation._enabled
+    validation, store = [], []
+    for idx, (name, descriptor) in enumerate(cls_fields.items()):
+        field_namespace = namespace.child(f"{idx}_")
+        # Fields validated so far are held in local variables of the same name
+        siblings = {sibling: sibling for sibling in list(cls_fields)[:idx]}
+        validation += descriptor._validation_lines(
+            name,
+            self_name,
+            field_namespace,
+            mode,
+            instrument=instrument,
+            siblings=siblings,
+        )
+        store += descriptor._store_lines(name, self_name, field_namespace)
+    # Validate everything before storing anything, so a failed __init__
+    # leaves no partially initialised state behind.
+    body = [*validation, *store] or ["pass"]
+    init = create_function("__init__", [self_name, *cls_fields], body, namespace)
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    init.__module__ = cls.__module__
+    init._pt_generated = True
+    return init
+
+
+def model(cls):
+    """Class decorator which generates an __init__ for all proper_tea properties.
+
+    The generated __init__ takes one argument for each property returned by
+    'fields', in the same order, and validates and stores all of them within
+    a single function body. This avoids the overhead of calling each
+    property's setter in turn. Error messages still name the failing
+    property.
+
+    Parameters:
+
+        cls: The class to decorate. Must not define its own __init__.
+
+    Returns:
+
+        type : 'cls', modified in place.
+    """
+    if "__init__" in cls.__dict__:
+        raise TypeError(
+            f"Class {cls.__name__} already defines __init__, which would be "
+            "replaced by proper_tea.model"
+        )
+    cls.__init__ = _create_init(cls)
+    _models.add(cls)
+    return cls
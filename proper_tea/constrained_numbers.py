@@ -25,9 +25,11 @@ Contains:
     - not_in_range
     - float_not_in_range
     - int_not_in_range
+    - in_intervals
 """
 
 from .property_factory import property_factory
+from .constraints import GreaterThan, LessThan, InRange, NotInRange, InIntervals
 
 # Define helper functions
 
@@ -43,7 +45,7 @@ def _convert_args(type_constraint=None):
 
 def _greater_than_args(x, inclusive: bool):
     return {
-        "condition": (lambda y: y >= x if inclusive else y > x),
+        "condition": GreaterThan(x, inclusive),
         "condition_err_msg": (
             f"Must be greater than {'or equal to ' if inclusive else ''}{x}"
         ),
@@ -52,7 +54,7 @@ def _greater_than_args(x, inclusive: bool):
 
 def _less_than_args(x, inclusive: bool):
     return {
-        "condition": (lambda y: y <= x if inclusive else y < x),
+        "condition": LessThan(x, inclusive),
         "condition_err_msg": (
             f"Must be less than {'or equal to ' if inclusive else ''}{x}"
         ),
@@ -90,12 +92,7 @@ def _ranged_inclusive_as_tuple(inclusive):
 
 def _in_range_args(bounds, inclusive: True):
     inclusive = _ranged_inclusive_as_tuple(inclusive)
-
-    def condition(x):
-        above_min = x >= bounds[0] if inclusive[0] else x > bounds[0]
-        below_max = x <= bounds[1] if inclusive[1] else x < bounds[1]
-        return above_min and below_max
-
+    condition = InRange(bounds, inclusive)
     err_msg = (
         f"Must be within range {'[' if inclusive[0] else '('}{bounds[0]},"
         f"{bounds[1]}{']' if inclusive[1] else ')'}"
@@ -105,12 +102,7 @@ def _in_range_args(bounds, inclusive: True):
 
 def _not_in_range_args(bounds, inclusive: False):
     inclusive = _ranged_inclusive_as_tuple(inclusive)
-
-    def condition(x):
-        below_min = x <= bounds[0] if inclusive[0] else x < bounds[0]
-        above_max = x >= bounds[1] if inclusive[1] else x > bounds[1]
-        return below_min or above_max
-
+    condition = NotInRange(bounds, inclusive)
     err_msg = (
         f"Must be outside range {'[' if inclusive[0] else '('}{bounds[0]},"
         f"{bounds[1]}{']' if inclusive[1] else ')'}"
@@ -118,25 +110,80 @@ def _not_in_range_args(bounds, inclusive: False):
     return {"condition": condition, "condition_err_msg": err_msg}
 
 
+def _in_intervals_args(intervals, inclusive):
+    intervals = [_test_bounds(bounds) for bounds in intervals]
+    if not intervals:
+        raise ValueError("At least one interval is required")
+    # A single bool or pair of bools applies to every interval
+    if isinstance(inclusive, bool) or (
+        len(inclusive) == 2 and all(isinstance(x, bool) for x in inclusive)
+    ):
+        inclusive = [inclusive] * len(intervals)
+    if len(inclusive) != len(intervals):
+        raise ValueError(
+            "'inclusive' should be a single bool, a pair of bools, or have "
+            "one entry per interval"
+        )
+    inclusive = [_ranged_inclusive_as_tuple(x) for x in inclusive]
+    condition = InIntervals(
+        (bounds[0], bounds[1], *inc) for bounds, inc in zip(intervals, inclusive)
+    )
+    shown = [
+        f"{'[' if lower_inc else '('}{lower},{upper}{']' if upper_inc else ')'}"
+        for lower, upper, lower_inc, upper_inc in condition.intervals
+    ]
+    if len(shown) > 10:
+        shown = [*shown[:10], f"... ({len(shown)} ranges in total)"]
+    err_msg = f"Must be within one of the ranges {', '.join(shown)}"
+    return {"condition": condition, "condition_err_msg": err_msg}
+
+
 # Define properties
 
 
-def floating_point():
-    """Creates property that transforms to floating point"""
-    return property_factory(**_convert_args(float))
+def floating_point(cache=None):
+    """Creates property that transforms to floating point
+
+    Parameters:
+
+        cache: Optionally memoize validated inputs. See property_factory.
+
+    Returns:
+
+        property
+    """
+    return property_factory(**_convert_args(float), cache=cache)
+
+
+def integer(cache=None):
+    """Creates property that transforms to int
+
+    Parameters:
+
+        cache: Optionally memoize validated inputs. See property_factory.
+
+    Returns:
+
+        property
+    """
+    return property_factory(**_convert_args(int), cache=cache)
+
+
+def boolean(cache=None):
+    """Creates property that transforms to bool
 
+    Parameters:
 
-def integer():
-    """Creates property that transforms to int"""
-    return property_factory(**_convert_args(int))
+        cache: Optionally memoize validated inputs. See property_factory.
 
+    Returns:
 
-def boolean():
-    """Creates property that transforms to bool"""
-    return property_factory(**_convert_args(bool))
+        property
+    """
+    return property_factory(**_convert_args(bool), cache=cache)
 
 
-def positive(allow_zero: bool = True, type_constraint=None):
+def positive(allow_zero: bool = True, type_constraint=None, cache=None):
     """Creates property that must be positive, possibly including zero
 
     Parameters:
@@ -144,6 +191,7 @@ def positive(allow_zero: bool = True, type_constraint=None):
         allow_zero (bool): If set to False, excludes zero as a possibility.
         type_constraint: If set to None, does not constrain. Can be set to int,
             float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
@@ -153,38 +201,41 @@ def positive(allow_zero: bool = True, type_constraint=None):
     return property_factory(
         **_greater_than_args(0, inclusive=allow_zero),
         **_convert_args(type_constraint),
+        cache=cache,
     )
 
 
-def positive_float(allow_zero: bool = True):
+def positive_float(allow_zero: bool = True, cache=None):
     """Creates property that must be positive float
 
     Parameters:
 
         allow_zero (bool): If set to False, excludes zero as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return positive(allow_zero=allow_zero, type_constraint=float)
+    return positive(allow_zero=allow_zero, type_constraint=float, cache=cache)
 
 
-def positive_int(allow_zero: bool = True):
+def positive_int(allow_zero: bool = True, cache=None):
     """Creates property that must be positive int
 
     Parameters:
 
         allow_zero (bool): If set to False, excludes zero as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return positive(allow_zero=allow_zero, type_constraint=int)
+    return positive(allow_zero=allow_zero, type_constraint=int, cache=cache)
 
 
-def negative(allow_zero: bool = False, type_constraint=None):
+def negative(allow_zero: bool = False, type_constraint=None, cache=None):
     """Creates property that must be negative, possibly including zero
 
     Parameters:
@@ -192,6 +243,7 @@ def negative(allow_zero: bool = False, type_constraint=None):
         allow_zero (bool): If set to True, includes zero as a possibility.
         type_constraint: If set to None, does not constrain. Can be set to int,
             float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
@@ -200,38 +252,41 @@ def negative(allow_zero: bool = False, type_constraint=None):
     return property_factory(
         **_less_than_args(0, inclusive=allow_zero),
         **_convert_args(type_constraint),
+        cache=cache,
     )
 
 
-def negative_float(allow_zero: bool = True):
+def negative_float(allow_zero: bool = True, cache=None):
     """Creates property that must be negative float
 
     Parameters:
 
         allow_zero (bool): If set to True, includes zero as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return negative(allow_zero=allow_zero, type_constraint=float)
+    return negative(allow_zero=allow_zero, type_constraint=float, cache=cache)
 
 
-def negative_int(allow_zero: bool = True):
+def negative_int(allow_zero: bool = True, cache=None):
     """Creates property that must be negative int
 
     Parameters:
 
         allow_zero (bool): If set to True, includes zero as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return negative(allow_zero=allow_zero, type_constraint=int)
+    return negative(allow_zero=allow_zero, type_constraint=int, cache=cache)
 
 
-def greater_than(x, inclusive: bool = False, type_constraint=None):
+def greater_than(x, inclusive: bool = False, type_constraint=None, cache=None):
     """Creates property that must be greater than (or equal to) some value
 
     Parameters:
@@ -240,6 +295,7 @@ def greater_than(x, inclusive: bool = False, type_constraint=None):
         inclusive (bool): If set to True, includes x as a possibility.
         type_constraint: If set to None, does not constrain. Can be set to int,
             float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
@@ -249,10 +305,11 @@ def greater_than(x, inclusive: bool = False, type_constraint=None):
     return property_factory(
         **_greater_than_args(x, inclusive=inclusive),
         **_convert_args(type_constraint),
+        cache=cache,
     )
 
 
-def float_greater_than(x, inclusive: bool = False):
+def float_greater_than(x, inclusive: bool = False, cache=None):
     """Creates property that must be a float greater than (or equal to)
     some value
 
@@ -260,15 +317,16 @@ def float_greater_than(x, inclusive: bool = False):
 
         x: Value that the property must be greater than
         inclusive (bool): If set to True, includes x as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return greater_than(x, inclusive=inclusive, type_constraint=float)
+    return greater_than(x, inclusive=inclusive, type_constraint=float, cache=cache)
 
 
-def int_greater_than(x, inclusive: bool = False):
+def int_greater_than(x, inclusive: bool = False, cache=None):
     """Creates property that must be an int greater than (or equal to)
     some value
 
@@ -276,15 +334,16 @@ def int_greater_than(x, inclusive: bool = False):
 
         x: Value that the property must be greater than
         inclusive (bool): If set to True, includes x as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return greater_than(x, inclusive=inclusive, type_constraint=int)
+    return greater_than(x, inclusive=inclusive, type_constraint=int, cache=cache)
 
 
-def less_than(x, inclusive: bool = False, type_constraint=None):
+def less_than(x, inclusive: bool = False, type_constraint=None, cache=None):
     """Creates property that must be less than (or equal to) some value
 
     Parameters:
@@ -293,6 +352,7 @@ def less_than(x, inclusive: bool = False, type_constraint=None):
         inclusive (bool): If set to True, includes x as a possibility.
         type_constraint: If set to None, does not constrain. Can be set to int,
             float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
@@ -302,10 +362,11 @@ def less_than(x, inclusive: bool = False, type_constraint=None):
     return property_factory(
         **_less_than_args(x, inclusive=inclusive),
         **_convert_args(type_constraint),
+        cache=cache,
     )
 
 
-def float_less_than(x, inclusive: bool = False):
+def float_less_than(x, inclusive: bool = False, cache=None):
     """Creates property that must be a float less than (or equal to)
     some value
 
@@ -313,15 +374,16 @@ def float_less_than(x, inclusive: bool = False):
 
         x: Value that the property must be less than
         inclusive (bool): If set to True, includes x as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return less_than(x, inclusive=inclusive, type_constraint=float)
+    return less_than(x, inclusive=inclusive, type_constraint=float, cache=cache)
 
 
-def int_less_than(x, inclusive: bool = False):
+def int_less_than(x, inclusive: bool = False, cache=None):
     """Creates property that must be an int less than (or equal to)
     some value
 
@@ -329,15 +391,16 @@ def int_less_than(x, inclusive: bool = False):
 
         x: Value that the property must be less than
         inclusive (bool): If set to True, includes x as a possibility.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return less_than(x, inclusive=inclusive, type_constraint=int)
+    return less_than(x, inclusive=inclusive, type_constraint=int, cache=cache)
 
 
-def in_range(bounds, inclusive=True, type_constraint=None):
+def in_range(bounds, inclusive=True, type_constraint=None, cache=None):
     """Creates property that must be between bounds[0] and bounds[1].
 
     Parameters:
@@ -352,6 +415,7 @@ def in_range(bounds, inclusive=True, type_constraint=None):
             while the upper bound is not.
         type_constraint: If set to None, does not constrain. Can be set to int,
             float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
@@ -360,10 +424,11 @@ def in_range(bounds, inclusive=True, type_constraint=None):
     return property_factory(
         **_in_range_args(bounds, inclusive),
         **_convert_args(type_constraint),
+        cache=cache,
     )
 
 
-def float_in_range(bounds, inclusive=True):
+def float_in_range(bounds, inclusive=True, cache=None):
     """Creates property that must be a float between bounds[0] and bounds[1].
 
     Parameters:
@@ -376,15 +441,16 @@ def float_in_range(bounds, inclusive=True):
             inclusive and the other exclusive by setting this to a tuple
             of 2 bools, e.g. (True,False) makes the lower bound inclusive
             while the upper bound is not.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return in_range(bounds, inclusive, type_constraint=float)
+    return in_range(bounds, inclusive, type_constraint=float, cache=cache)
 
 
-def int_in_range(bounds, inclusive=True):
+def int_in_range(bounds, inclusive=True, cache=None):
     """Creates property that must be an int between bounds[0] and bounds[1].
 
     Parameters:
@@ -397,15 +463,16 @@ def int_in_range(bounds, inclusive=True):
             inclusive and the other exclusive by setting this to a tuple
             of 2 bools, e.g. (True,False) makes the lower bound inclusive
             while the upper bound is not.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return in_range(bounds, inclusive, type_constraint=int)
+    return in_range(bounds, inclusive, type_constraint=int, cache=cache)
 
 
-def not_in_range(bounds, inclusive=False, type_constraint=None):
+def not_in_range(bounds, inclusive=False, type_constraint=None, cache=None):
     """Creates property that must be outside bounds[0] and bounds[1].
 
     Parameters:
@@ -420,6 +487,7 @@ def not_in_range(bounds, inclusive=False, type_constraint=None):
             while the upper bound is not.
         type_constraint: If set to None, does not constrain. Can be set to int,
             float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
@@ -428,10 +496,11 @@ def not_in_range(bounds, inclusive=False, type_constraint=None):
     return property_factory(
         **_not_in_range_args(bounds, inclusive),
         **_convert_args(type_constraint),
+        cache=cache,
     )
 
 
-def float_not_in_range(bounds, inclusive=False):
+def float_not_in_range(bounds, inclusive=False, cache=None):
     """Creates property that must be a float outside bounds[0] and bounds[1].
 
     Parameters:
@@ -444,15 +513,16 @@ def float_not_in_range(bounds, inclusive=False):
             inclusive and the other exclusive by setting this to a tuple
             of 2 bools, e.g. (True,False) makes the lower bound inclusive
             while the upper bound is not.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return not_in_range(bounds, inclusive, type_constraint=float)
+    return not_in_range(bounds, inclusive, type_constraint=float, cache=cache)
 
 
-def int_not_in_range(bounds, inclusive=False):
+def int_not_in_range(bounds, inclusive=False, cache=None):
     """Creates property that must be an int outside bounds[0] and bounds[1].
 
     Parameters:
@@ -465,9 +535,42 @@ def int_not_in_range(bounds, inclusive=False):
             inclusive and the other exclusive by setting this to a tuple
             of 2 bools, e.g. (True,False) makes the lower bound inclusive
             while the upper bound is not.
+        cache: Optionally memoize validated inputs. See property_factory.
+
+    Returns:
+
+        property
+    """
+    return not_in_range(bounds, inclusive, type_constraint=int, cache=cache)
+
+
+def in_intervals(intervals, inclusive=True, type_constraint=None, cache=None):
+    """Creates property that must be within any one of several ranges.
+
+    Overlapping and adjacent ranges are merged, and each check takes
+    O(log n) time for n ranges, so this is suitable for hundreds or thousands
+    of ranges, such as allowed frequency bands.
+
+    Parameters:
+
+        intervals: Iterable of bounds, each of which is as for in_range.
+        inclusive (bool): If set to False, values falling on the upper and
+            lower bounds will not be accepted. Can set one bound to be
+            inclusive and the other exclusive by setting this to a tuple
+            of 2 bools, e.g. (True,False) makes the lower bound inclusive
+            while the upper bound is not. This applies to every interval,
+            unless a list with one bool or tuple per interval is given. A
+            list of exactly 2 bools is treated as a single tuple.
+        type_constraint: If set to None, does not constrain. Can be set to int,
+            float, etc to enforce the underlying type of the property.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returns:
 
         property
     """
-    return not_in_range(bounds, inclusive, type_constraint=int)
+    return property_factory(
+        **_in_intervals_args(intervals, inclusive),
+        **_convert_args(type_constraint),
+        cache=cache,
+    )
@@ -0,0 +1,493 @@
+"""constraints
+
+Defines condition objects which may be passed to property_factory in place of
+a function. As well as being callable, each can write itself out as a Python
+expression, allowing property_factory to inline the comparison into the
+setter it generates rather than calling out to another function.
+
+Contains:
+    - Constraint
+    - GreaterThan
+    - LessThan
+    - InRange
+    - NotInRange
+    - InSet
+    - InIntervals
+    - MembershipBackend
+    - And
+    - Or
+    - Not
+"""
+
+from bisect import bisect_right
+
+from ._codegen import Namespace, create_function
+
+
+class Constraint:
+    """Base class for conditions that can be compiled into a setter.
+
+    Subclasses must implement 'expression', and should set 'kind' to a short
+    name describing the constraint.
+
+    Constraints may be combined using '&', '|' and '~', giving a constraint
+    which compiles to a single flat expression. Where possible, the result is
+    simplified: intersecting or overlapping ranges are merged into a single
+    range, and a set is filtered by any other constraints it is combined with
+    using '&'.
+    """
+
+    kind = None
+
+    @property
+    def metadata(self) -> dict:
+        """Describes the constraint using its kind and public attributes."""
+        return {
+            "kind": self.kind,
+            **{k: v for k, v in vars(self).items() if not k.startswith("_")},
+        }
+
+    def expression(self, var: str, namespace: Namespace) -> str:
+        """Return Python source which tests the variable named 'var'.
+
+        Parameters:
+
+            var (str): Name of the variable holding the value to test.
+            namespace (Namespace): Used to bind any values the expression
+                depends upon, such as bounds.
+
+        Returns:
+
+            str
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        params = ", ".join(
+            f"{k}={v!r}" for k, v in vars(self).items() if not k.startswith("_")
+        )
+        return f"{type(self).__name__}({params})"
+
+    def __and__(self, other):
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return _all_of([self, other])
+
+    def __or__(self, other):
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return _any_of([self, other])
+
+    def __invert__(self):
+        return Not(self)
+
+    def __getstate__(self):
+        # The compiled check cannot be pickled, but is cheap to recreate
+        state = self.__dict__.copy()
+        state.pop("_check", None)
+        return state
+
+    def __call__(self, value) -> bool:
+        try:
+            check = self._check
+        except AttributeError:
+            namespace = Namespace()
+            expr = self.expression("value", namespace)
+            check = create_function("check", ["value"], [f"return {expr}"], namespace)
+            self._check = check
+        return check(value)
+
+
+class GreaterThan(Constraint):
+    """Requires values are greater than (or equal to) 'x'."""
+
+    kind = "greater_than"
+
+    def __init__(self, x, inclusive: bool = False):
+        self.x = x
+        self.inclusive = inclusive
+
+    def expression(self, var, namespace):
+        op = ">=" if self.inclusive else ">"
+        return f"{var} {op} {namespace.add(self.x)}"
+
+
+class LessThan(Constraint):
+    """Requires values are less than (or equal to) 'x'."""
+
+    kind = "less_than"
+
+    def __init__(self, x, inclusive: bool = False):
+        self.x = x
+        self.inclusive = inclusive
+
+    def expression(self, var, namespace):
+        op = "<=" if self.inclusive else "<"
+        return f"{var} {op} {namespace.add(self.x)}"
+
+
+class InRange(Constraint):
+    """Requires values lie between bounds[0] and bounds[1].
+
+    'inclusive' should be a tuple of 2 bools, referring to the lower and upper
+    bounds respectively.
+    """
+
+    kind = "in_range"
+
+    def __init__(self, bounds, inclusive=(True, True)):
+        self.bounds = tuple(bounds)
+        self.inclusive = tuple(inclusive)
+
+    def expression(self, var, namespace):
+        lower = namespace.add(self.bounds[0])
+        upper = namespace.add(self.bounds[1])
+        lower_op = ">=" if self.inclusive[0] else ">"
+        upper_op = "<=" if self.inclusive[1] else "<"
+        return f"({var} {lower_op} {lower} and {var} {upper_op} {upper})"
+
+
+class NotInRange(Constraint):
+    """Requires values lie outside bounds[0] and bounds[1].
+
+    'inclusive' should be a tuple of 2 bools, referring to the lower and upper
+    bounds respectively. If inclusive, values on the bound are accepted.
+    """
+
+    kind = "not_in_range"
+
+    def __init__(self, bounds, inclusive=(False, False)):
+        self.bounds = tuple(bounds)
+        self.inclusive = tuple(inclusive)
+
+    def expression(self, var, namespace):
+        lower = namespace.add(self.bounds[0])
+        upper = namespace.add(self.bounds[1])
+        lower_op = "<=" if self.inclusive[0] else "<"
+        upper_op = ">=" if self.inclusive[1] else ">"
+        return f"({var} {lower_op} {lower} or {var} {upper_op} {upper})"
+
+
+class MembershipBackend:
+    """Base class for custom membership tests used by InSet and in_set.
+
+    Backends allow very large sets of allowed values to be stored in a form
+    other than a Python set, such as a sorted array or a memory-mapped file.
+    Subclasses must implement __contains__ and __len__.
+    """
+
+    def __contains__(self, value) -> bool:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class InSet(Constraint):
+    """Requires values are members of a given collection.
+
+    Hashable members are frozen into a frozenset once, giving O(1) membership
+    tests. Any unhashable members are kept separately and are compared by
+    equality, in the same manner as a list. If 'members' is a
+    MembershipBackend, it is used as-is.
+    """
+
+    kind = "in_set"
+
+    def __init__(self, members):
+        if isinstance(members, MembershipBackend):
+            self.members = members
+            self.unhashable = ()
+            return
+        hashable, unhashable = [], []
+        for member in members:
+            try:
+                hash(member)
+            except TypeError:
+                unhashable.append(member)
+            else:
+                hashable.append(member)
+        self.members = frozenset(hashable)
+        self.unhashable = tuple(unhashable)
+
+    def _contains(self, value):
+        try:
+            if value in self.members:
+                return True
+        except TypeError:
+            # Unhashable values cannot be in the frozenset
+            pass
+        return value in self.unhashable
+
+    def expression(self, var, namespace):
+        if self.unhashable:
+            return f"{namespace.add(self._contains, 'condition')}({var})"
+        return f"{var} in {namespace.add(self.members)}"
+
+
+class InIntervals(Constraint):
+    """Requires values lie within any of a collection of ranges.
+
+    'intervals' should be an iterable of tuples (lower, upper,
+    lower_inclusive, upper_inclusive). Overlapping and adjacent ranges are
+    merged once, and are stored sorted so that each check is a binary search,
+    taking O(log n) time for n ranges.
+    """
+
+    kind = "in_intervals"
+
+    def __init__(self, intervals):
+        # Convert to the ordering used by _union
+        pending = sorted(
+            (
+                (lower, lower_inc, upper, upper_inc)
+                for lower, upper, lower_inc, upper_inc in intervals
+            ),
+            key=lambda interval: (interval[0], not interval[1]),
+        )
+        merged = []
+        for interval in pending:
+            combined = _union(merged[-1], interval) if merged else None
+            if combined is None:
+                merged.append(interval)
+            else:
+                merged[-1] = combined
+        self.intervals = tuple(
+            (lower, upper, lower_inc, upper_inc)
+            for lower, lower_inc, upper, upper_inc in merged
+        )
+        self._lowers = [interval[0] for interval in self.intervals]
+
+    def _contains(self, value):
+        idx = bisect_right(self._lowers, value) - 1
+        if idx < 0:
+            return False
+        lower, upper, lower_inc, upper_inc = self.intervals[idx]
+        if value == lower:
+            return lower_inc
+        return value < upper or (upper_inc and value == upper)
+
+    def expression(self, var, namespace):
+        return f"{namespace.add(self._contains, 'condition')}({var})"
+
+
+class And(Constraint):
+    """Requires values satisfy every one of 'operands'.
+
+    Usually created using '&', which also simplifies the result.
+    """
+
+    kind = "and"
+
+    def __init__(self, *operands):
+        self.operands = tuple(operands)
+
+    def expression(self, var, namespace):
+        exprs = [operand.expression(var, namespace) for operand in self.operands]
+        return f"({' and '.join(exprs)})"
+
+
+class Or(Constraint):
+    """Requires values satisfy at least one of 'operands'.
+
+    Usually created using '|', which also simplifies the result.
+    """
+
+    kind = "or"
+
+    def __init__(self, *operands):
+        self.operands = tuple(operands)
+
+    def expression(self, var, namespace):
+        exprs = [operand.expression(var, namespace) for operand in self.operands]
+        return f"({' or '.join(exprs)})"
+
+
+class Not(Constraint):
+    """Requires values do not satisfy 'operand'.
+
+    Usually created using '~'. Note that this is not the same as reversing a
+    comparison, as NaN fails every comparison: ~GreaterThan(0) accepts NaN,
+    while LessThan(0, inclusive=True) does not.
+    """
+
+    kind = "not"
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def __invert__(self):
+        return self.operand
+
+    def expression(self, var, namespace):
+        return f"(not {self.operand.expression(var, namespace)})"
+
+
+# Simplification of combined constraints. Ranges are represented as a tuple
+# (lower, lower_inclusive, upper, upper_inclusive), where None is unbounded.
+# Only rewrites which give the same result for every value, including NaN,
+# are applied.
+
+
+def _as_interval(constraint):
+    if isinstance(constraint, GreaterThan):
+        return (constraint.x, constraint.inclusive, None, False)
+    if isinstance(constraint, LessThan):
+        return (None, False, constraint.x, constraint.inclusive)
+    if isinstance(constraint, InRange):
+        (lower, upper), (lower_inclusive, upper_inclusive) = (
+            constraint.bounds,
+            constraint.inclusive,
+        )
+        return (lower, lower_inclusive, upper, upper_inclusive)
+    return None
+
+
+def _from_interval(interval):
+    lower, lower_inclusive, upper, upper_inclusive = interval
+    if upper is None:
+        return GreaterThan(lower, lower_inclusive)
+    if lower is None:
+        return LessThan(upper, upper_inclusive)
+    return InRange((lower, upper), (lower_inclusive, upper_inclusive))
+
+
+def _tighter(a, a_inclusive, b, b_inclusive, pick):
+    """Return the tighter of two bounds, where 'pick' is max or min."""
+    if a is None:
+        return b, b_inclusive
+    if b is None or a == b and a_inclusive == b_inclusive:
+        return a, a_inclusive
+    if a == b:
+        return a, False
+    return (a, a_inclusive) if pick(a, b) == a else (b, b_inclusive)
+
+
+def _is_empty(interval):
+    """Return True if no value lies within a range."""
+    lower, lower_inclusive, upper, upper_inclusive = interval
+    if lower is None or upper is None:
+        return False
+    return lower > upper or lower == upper and not (lower_inclusive and upper_inclusive)
+
+
+def _intersect(a, b):
+    """Intersection of two ranges, or None if it may be empty."""
+    combined = (
+        *_tighter(a[0], a[1], b[0], b[1], max),
+        *_tighter(a[2], a[3], b[2], b[3], min),
+    )
+    return None if _is_empty(combined) else combined
+
+
+def _union(a, b):
+    """Union of two ranges, or None if it is not a single bounded range."""
+    if a[0] is not None and (b[0] is None or b[0] < a[0]):
+        a, b = b, a
+    # Now a starts first. Check that b starts within or adjacent to a.
+    if a[2] is not None and b[0] is not None:
+        if b[0] > a[2] or b[0] == a[2] and not (a[3] or b[1]):
+            return None
+    if a[2] is None or b[2] is None:
+        upper = (None, False)
+    elif a[2] == b[2]:
+        upper = (a[2], a[3] or b[3])
+    else:
+        upper = (a[2], a[3]) if a[2] > b[2] else (b[2], b[3])
+    lower = (a[0], a[1] or (b[1] and a[0] == b[0]))
+    if lower[0] is None and upper[0] is None:
+        # Everything but NaN, which cannot be written as a single comparison
+        return None
+    return (*lower, *upper)
+
+
+def _merge(operands, kind, combine):
+    """Flatten nested operands of the same kind and merge their ranges."""
+    flat = []
+    for operand in operands:
+        if isinstance(operand, kind):
+            flat.extend(operand.operands)
+        else:
+            flat.append(operand)
+    merged = []
+    for operand in flat:
+        interval = _as_interval(operand)
+        if interval is not None:
+            for idx, other in enumerate(merged):
+                other_interval = _as_interval(other)
+                if other_interval is None:
+                    continue
+                combined = combine(interval, other_interval)
+                if combined is not None:
+                    merged[idx] = _from_interval(combined)
+                    break
+            else:
+                merged.append(operand)
+        else:
+            merged.append(operand)
+    return merged
+
+
+def _satisfies(constraint, value):
+    try:
+        return bool(constraint(value))
+    except Exception:
+        return False
+
+
+def _all_of(operands):
+    operands = _merge(operands, And, _intersect)
+    sets = [
+        operand
+        for operand in operands
+        if isinstance(operand, InSet)
+        and isinstance(operand.members, frozenset)
+        and not operand.unhashable
+    ]
+    if sets:
+        # Only members which satisfy every other constraint can pass, so the
+        # result is a single membership test.
+        members = frozenset.intersection(*(s.members for s in sets))
+        others = [operand for operand in operands if operand not in sets]
+        return InSet(
+            member
+            for member in members
+            if all(_satisfies(other, member) for other in others)
+        )
+    return operands[0] if len(operands) == 1 else And(*operands)
+
+
+# Beyond this many disjoint ranges, a binary search is faster than testing
+# each range in turn
+_MAX_INLINE_RANGES = 8
+
+
+def _any_of(operands):
+    expanded = []
+    for operand in operands:
+        if isinstance(operand, InIntervals):
+            expanded.extend(
+                InRange((lower, upper), (lower_inc, upper_inc))
+                for lower, upper, lower_inc, upper_inc in operand.intervals
+            )
+        else:
+            expanded.append(operand)
+    # Empty ranges add nothing to a union, but would widen a range they were
+    # merged with, e.g. [0, 0) | (0, 1) would become [0, 1)
+    non_empty = [
+        operand
+        for operand in expanded
+        if _as_interval(operand) is None or not _is_empty(_as_interval(operand))
+    ]
+    operands = _merge(non_empty or expanded[:1], Or, _union)
+    if len(operands) == 1:
+        return operands[0]
+    intervals = [_as_interval(operand) for operand in operands]
+    if len(intervals) > _MAX_INLINE_RANGES and all(
+        interval is not None and None not in interval[::2] for interval in intervals
+    ):
+        return InIntervals(
+            (lower, upper, lower_inc, upper_inc)
+            for lower, lower_inc, upper, upper_inc in intervals
+        )
+    return Or(*operands)
@@ -1,26 +1,54 @@
 """discrete_sets
 
-Defines specialised property_factory's that require properties may only be within a 
+Defines specialised property_factory's that require properties may only be within a
 user-defined set.
 """
 
 from .property_factory import property_factory
+from .constraints import InSet, MembershipBackend
 
 
-def in_set(discrete_set):
+def in_set(discrete_set, encode: bool = False, cache=None):
     """Creates property that must take its value from a given set
 
     Parameters:
 
         discrete_set (Iterable): Defines the set of values that the property may take.
+            Hashable values are stored in a frozenset, so membership tests
+            take constant time. Unhashable values are also permitted, but are
+            checked by comparing against each in turn. May also be a
+            MembershipBackend, such as those in proper_tea.numpy, which is
+            used without copying.
+        encode (bool): If True, store the matching member of 'discrete_set'
+            rather than the value that was assigned, so that every instance
+            shares a single canonical object. This can save a great deal of
+            memory when many equal but distinct objects are assigned, such as
+            strings read from a file. Requires all members to be hashable.
+        cache: Optionally memoize validated inputs. See property_factory.
 
     Returs:
 
         property
     """
-    condition = lambda x: x in set(discrete_set)
-    condition_err_msg = f"Must be one of {set(discrete_set)}"
+    condition = InSet(discrete_set)
+    if isinstance(discrete_set, MembershipBackend):
+        condition_err_msg = (
+            f"Must be one of the {len(discrete_set)} members of {discrete_set!r}"
+        )
+    elif condition.unhashable:
+        members = [*condition.members, *condition.unhashable]
+        condition_err_msg = f"Must be one of {members}"
+    else:
+        condition_err_msg = f"Must be one of {set(condition.members)}"
+    if not encode:
+        transform = None
+    elif condition.unhashable or isinstance(discrete_set, MembershipBackend):
+        raise TypeError("in_set with encode=True requires a set of hashable members")
+    else:
+        transform = {member: member for member in condition.members}.__getitem__
     return property_factory(
         condition=condition,
         condition_err_msg=condition_err_msg,
+        transform=transform,
+        cache=cache,
     )
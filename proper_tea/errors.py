@@ -0,0 +1,208 @@
+"""errors
+
+Defines the exceptions raised when a value fails validation. Each holds the
+property, the value and the class it was assigned to, and only formats its
+message when converted to a string, so that code which rejects many values
+does not pay for messages it never reads.
+
+Contains:
+    - ProperTeaValidationError
+    - ConditionError
+    - TransformError
+    - BatchError
+    - check
+    - CheckResult
+"""
+
+from collections import namedtuple
+
+
+class ProperTeaValidationError(ValueError):
+    """Base class for errors raised when assigning to a proper_tea property.
+
+    Subclasses ValueError, so existing code catching ValueError is unaffected.
+    The arguments are stored only in 'args', so that creating an error runs no
+    Python code.
+
+    Parameters:
+
+        descriptor (ProperTeaDescriptor): The property that was assigned to.
+        owner (type): The class of the object that was assigned to.
+        value: The value that failed validation.
+    """
+
+    _stage = ""
+
+    @property
+    def descriptor(self):
+        """The property that was assigned to."""
+        return self.args[0]
+
+    @property
+    def owner(self) -> type:
+        """The class of the object that was assigned to."""
+        return self.args[1]
+
+    @property
+    def value(self):
+        """The value that failed validation."""
+        return self.args[2]
+
+    @property
+    def field(self) -> str:
+        """Name of the property that was assigned to."""
+        return self.descriptor.name
+
+    @property
+    def constraint(self):
+        """The condition or transform which rejected the value."""
+        raise NotImplementedError
+
+    def _outcome(self) -> str:
+        return "raised exception. See traceback for more info."
+
+    def _detail(self) -> str:
+        raise NotImplementedError
+
+    def __str__(self):
+        err_msg = (
+            f"Setter {self._stage} for property '{self.field}' in class "
+            f"{self.owner.__name__} {self._outcome()}"
+        )
+        detail = self._detail()
+        if detail:
+            err_msg += f"\n{detail}"
+        return err_msg
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+
+class ConditionError(ProperTeaValidationError):
+    """Raised when a property's condition returns False or raises.
+
+    Parameters:
+
+        descriptor, owner, value: See ProperTeaValidationError.
+        raised (bool): True if the condition raised an exception, which is
+            then available as __cause__. Defaults to False.
+    """
+
+    _stage = "condition"
+
+    @property
+    def raised(self) -> bool:
+        """True if the condition raised rather than returning False."""
+        return len(self.args) > 3 and self.args[3]
+
+    @property
+    def constraint(self):
+        return self.descriptor.condition
+
+    def _outcome(self):
+        return super()._outcome() if self.raised else "returned False."
+
+    def _detail(self):
+        return self.descriptor.condition_err_msg
+
+
+class TransformError(ProperTeaValidationError):
+    """Raised when a property's transform raises an exception, which is then
+    available as __cause__."""
+
+    _stage = "transform"
+
+    @property
+    def constraint(self):
+        return self.descriptor.transform
+
+    def _detail(self):
+        return self.descriptor.transform_err_msg
+
+
+class BatchError(ProperTeaValidationError):
+    """Raised when many values are assigned to a property at once, such as a
+    column of a proper_tea.numpy.Table, and some of them fail validation.
+
+    Parameters:
+
+        descriptor, owner: See ProperTeaValidationError.
+        value: The values that were assigned.
+        indices (Sequence[int]): Indices of the values which failed.
+        count (int): The number of values that were validated.
+    """
+
+    @property
+    def indices(self):
+        """Indices of the values which failed validation."""
+        return self.args[3]
+
+    @property
+    def constraint(self):
+        return self.descriptor.condition
+
+    def __str__(self):
+        indices, count = self.args[3:5]
+        shown = ", ".join(str(idx) for idx in indices[:10])
+        if len(indices) > 10:
+            shown += ", ..."
+        err_msg = (
+            f"Setter for property '{self.field}' in class {self.owner.__name__} "
+            f"failed for {len(indices)} of {count} values, at indices [{shown}]."
+        )
+        if self.descriptor.condition_err_msg:
+            err_msg += f"\n{self.descriptor.condition_err_msg}"
+        return err_msg
+
+
+# collections.namedtuple rather than typing.NamedTuple, as this module is
+# imported with proper_tea and typing is slow to import
+class CheckResult(namedtuple("CheckResult", ["valid", "value", "error"])):
+    """Outcome of proper_tea.check.
+
+    Attributes:
+
+        valid (bool): True if the value passed validation.
+        value: The value after any transform, or the original value if it
+            failed.
+        error (ProperTeaValidationError): The error that assigning the value
+            would have raised, or None if it is valid.
+    """
+
+    __slots__ = ()
+
+
+def check(obj, field: str, value) -> CheckResult:
+    """Validate a value for a property without assigning it or raising.
+
+    For code which rejects many values, this avoids the cost of raising and
+    catching an exception for each one. The value is always fully validated,
+    even in trusted mode.
+
+    Parameters:
+
+        obj: An instance of a class with proper_tea properties, or the class
+            itself.
+        field (str): Name of the property.
+        value: The value to validate.
+
+    Returns:
+
+        CheckResult : Whether the value is valid, the transformed value, and
+            the error if it is not.
+    """
+    if isinstance(obj, type):
+        cls, instance = obj, None
+    else:
+        cls, instance = type(obj), obj
+    # Any proper_tea property has a '_check' method
+    descriptor = getattr(cls, field, None)
+    checker = getattr(descriptor, "_check", None)
+    if checker is None:
+        raise AttributeError(
+            f"Class {cls.__name__} has no proper_tea property '{field}'"
+        )
+    if descriptor.name is None:
+        # Attached after the class was created, so not yet named
+        descriptor._name_from(cls)
+    return checker(cls, value, instance)
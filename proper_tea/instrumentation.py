@@ -0,0 +1,131 @@
+"""instrumentation
+
+Defines optional counters recording how often each proper_tea property is set,
+how often its condition and transform fail, and how long validation takes.
+
+As with trusted mode, switching instrumentation on or off regenerates every
+setter. While it is off, setters are generated from exactly the same source as
+if this module did not exist, so there is no cost to leaving it available.
+
+Contains:
+    - PropertyStats
+    - stats
+    - reset_stats
+    - instrumented
+    - set_instrumented
+    - is_instrumented
+"""
+
+from contextlib import contextmanager
+
+from . import trusted_mode
+
+_enabled = False
+
+
+class PropertyStats:
+    """Counters for a single property, available as its 'stats' attribute.
+
+    Attributes:
+
+        sets (int): Number of values assigned, including those which failed.
+        condition_failures (int): Number of values rejected by the condition,
+            either by returning False or raising.
+        transform_failures (int): Number of values for which the transform
+            raised.
+        time (float): Total time spent validating, in seconds.
+    """
+
+    __slots__ = ("sets", "condition_failures", "transform_failures", "time")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Set all counters to zero."""
+        self.sets = 0
+        self.condition_failures = 0
+        self.transform_failures = 0
+        self.time = 0.0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        counters = ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())
+        return f"{type(self).__name__}({counters})"
+
+
+def is_instrumented() -> bool:
+    """Returns True if setters are currently recording statistics."""
+    return _enabled
+
+
+def set_instrumented(enabled: bool = True):
+    """Enable or disable instrumentation for the whole process.
+
+    While enabled, every proper_tea setter (and every __init__ generated by
+    proper_tea.model) updates the 'stats' of each property it sets. Switching
+    regenerates every setter, so should be done outside of hot loops.
+
+    Parameters:
+
+        enabled (bool): If True, record statistics. If False, return to the
+            uninstrumented setters.
+    """
+    global _enabled
+    enabled = bool(enabled)
+    if enabled != _enabled:
+        _enabled = enabled
+        # Setters are regenerated in the same manner as for trusted mode
+        for hook in trusted_mode._refresh_hooks:
+            hook()
+
+
+@contextmanager
+def instrumented():
+    """Context manager which enables instrumentation within its body.
+
+    The previous setting is restored on exit.
+    """
+    previous = _enabled
+    set_instrumented(True)
+    try:
+        yield
+    finally:
+        set_instrumented(previous)
+
+
+def _all_descriptors():
+    # Imported here, as property_factory depends upon this module
+    from .property_factory import _descriptors
+
+    return list(_descriptors)
+
+
+def stats() -> dict:
+    """Report the statistics recorded for every property which has been set.
+
+    Returns:
+
+        dict : Maps the qualified name of each owning class to a dict, which
+            maps attribute names to the counters described in PropertyStats.
+    """
+    report = {}
+    seen = set()
+    for descriptor in _all_descriptors():
+        counters = descriptor.stats
+        # Copies made by 'slotted' share their counters with the original
+        if not counters.sets or id(counters) in seen:
+            continue
+        seen.add(id(counters))
+        owner = descriptor.owner
+        owner_name = f"{owner.__module__}.{owner.__qualname__}"
+        report.setdefault(owner_name, {})[descriptor.name] = counters.as_dict()
+    return report
+
+
+def reset_stats():
+    """Set the counters of every property to zero."""
+    for descriptor in _all_descriptors():
+        descriptor.stats.reset()
@@ -1 +1,4 @@
-from .numpy_arrays import numpy_array
+from .numpy_arrays import numpy_array, mapped_array
+from .membership import SortedArraySet, MappedSortedSet, BloomFilter
+from .batch import validate_batch, BatchResult
+from .table import Table
@@ -0,0 +1,252 @@
+"""batch
+
+Defines vectorised validation of many candidate values for a single
+proper_tea property at once. Properties whose condition is a Constraint, such
+as those created by the factories in proper_tea.constrained_numbers, are
+evaluated as NumPy expressions using the constraint's metadata. Any other
+conditions or transforms are applied to each value in turn.
+
+Contains:
+    - validate_batch
+    - BatchResult
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ..constraints import (
+    Constraint,
+    GreaterThan,
+    LessThan,
+    InRange,
+    NotInRange,
+    InSet,
+    InIntervals,
+    And,
+    Or,
+    Not,
+)
+
+
+class BatchResult(NamedTuple):
+    """The result of validate_batch.
+
+    Attributes:
+
+        values (np.ndarray): The values after applying the property's
+            transform. Entries which failed validation are unspecified.
+        valid (np.ndarray): Boolean mask, True where the value passed.
+    """
+
+    values: np.ndarray
+    valid: np.ndarray
+
+    @property
+    def invalid_indices(self) -> np.ndarray:
+        """Indices of the values which failed validation."""
+        return np.flatnonzero(~self.valid)
+
+    @property
+    def valid_values(self) -> np.ndarray:
+        """Transformed values which passed validation."""
+        return self.values[self.valid]
+
+
+def _compare(op, values, x, inclusive):
+    if op == "greater":
+        return values >= x if inclusive else values > x
+    return values <= x if inclusive else values < x
+
+
+def constraint_mask(constraint: Constraint, values: np.ndarray):
+    """Evaluate a Constraint over a 1D array, returning a boolean mask.
+
+    Returns None if the constraint cannot be vectorised, in which case it
+    should be evaluated elementwise instead.
+    """
+    if isinstance(constraint, GreaterThan):
+        return _compare("greater", values, constraint.x, constraint.inclusive)
+    if isinstance(constraint, LessThan):
+        return _compare("less", values, constraint.x, constraint.inclusive)
+    if isinstance(constraint, (InRange, NotInRange)):
+        lower, upper = constraint.bounds
+        inclusive = constraint.inclusive
+        if isinstance(constraint, InRange):
+            return _compare("greater", values, lower, inclusive[0]) & _compare(
+                "less", values, upper, inclusive[1]
+            )
+        return _compare("less", values, lower, inclusive[0]) | _compare(
+            "greater", values, upper, inclusive[1]
+        )
+    if isinstance(constraint, InIntervals):
+        return _intervals_mask(constraint, values)
+    if isinstance(constraint, (And, Or)):
+        masks = [constraint_mask(operand, values) for operand in constraint.operands]
+        if any(mask is None for mask in masks):
+            return None
+        reduce = np.logical_and if isinstance(constraint, And) else np.logical_or
+        return reduce.reduce(masks)
+    if isinstance(constraint, Not):
+        mask = constraint_mask(constraint.operand, values)
+        return None if mask is None else ~np.asarray(mask, dtype=bool)
+    if isinstance(constraint, InSet) and not constraint.unhashable:
+        members = constraint.members
+        if hasattr(members, "contains_many"):
+            return members.contains_many(values)
+        if isinstance(members, frozenset) and values.dtype != object:
+            member_array = np.array(list(members))
+            # Otherwise NumPy converts both to a common type, so that e.g. 1
+            # would not be found in {1, "a"}
+            if member_array.dtype.kind == values.dtype.kind:
+                return np.isin(values, member_array)
+    return None
+
+
+def _intervals_mask(constraint, values):
+    lowers, uppers, lower_inc, upper_inc = (
+        np.array(column) for column in zip(*constraint.intervals)
+    )
+    idx = np.searchsorted(lowers, values, side="right") - 1
+    found = idx >= 0
+    idx = np.maximum(idx, 0)
+    lower, upper = lowers[idx], uppers[idx]
+    above_lower = (values > lower) | (lower_inc[idx] & (values == lower))
+    below_upper = (values < upper) | (upper_inc[idx] & (values == upper))
+    return found & above_lower & below_upper
+
+
+def _elementwise(func, values):
+    """Apply func to each value, returning results and a mask of successes."""
+    results = np.empty(len(values), dtype=object)
+    ok = np.ones(len(values), dtype=bool)
+    if values.dtype != object:
+        # Pass Python scalars, as the setter would receive
+        values = values.tolist()
+    for idx, value in enumerate(values):
+        try:
+            results[idx] = func(value)
+        except Exception:
+            ok[idx] = False
+    return results, ok
+
+
+def _condition_mask(condition, values):
+    if isinstance(condition, Constraint):
+        try:
+            mask = constraint_mask(condition, values)
+        except Exception:
+            # e.g. comparing strings to numbers. Fall back to reporting the
+            # result for each value individually.
+            mask = None
+        if mask is not None and np.shape(mask) == values.shape:
+            return np.asarray(mask, dtype=bool)
+    results, ok = _elementwise(condition, values)
+    # Elements for which the condition raised are invalid
+    return ok & np.array([bool(r) if o else False for r, o in zip(results, ok)])
+
+
+def _convert(type_constraint, values):
+    """Vectorised type conversion, returning converted values and a mask.
+
+    Only numeric inputs are converted, as NumPy's rules for converting other
+    inputs such as strings differ from Python's. Raises TypeError otherwise.
+    """
+    if values.dtype.kind not in "biuf":
+        raise TypeError
+    ok = np.ones(len(values), dtype=bool)
+    if type_constraint is int and values.dtype.kind == "f":
+        # int() raises for NaN and infinity, while NumPy silently converts
+        ok &= np.isfinite(values)
+        if np.any(np.abs(values[ok]) >= 2.0**63):
+            raise OverflowError
+        values = np.where(ok, values, 0)
+    if type_constraint is int and values.dtype == np.uint64:
+        # Would wrap around when converted to int64
+        if np.any(values >= 2**63):
+            raise OverflowError
+    with np.errstate(all="raise"):
+        return values.astype(type_constraint), ok
+
+
+def _object_array(values):
+    result = np.empty(len(values), dtype=object)
+    for idx, value in enumerate(values):
+        result[idx] = value
+    return result
+
+
+def _as_1d_array(values):
+    """Convert values to a 1D array, using dtype object where NumPy would
+    otherwise change the values, e.g. by converting numbers to strings."""
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            # e.g. sequences of differing lengths
+            return _object_array(values)
+        if array.dtype.kind in "US" and not all(
+            isinstance(value, (str, bytes)) for value in values
+        ):
+            return _object_array(values)
+        values = array
+    if values.ndim == 1:
+        return values
+    # e.g. a list of lists, which should be treated as a list of objects
+    return _object_array(list(values) if values.ndim else [values.item()])
+
+
+def validate_batch(field, values) -> BatchResult:
+    """Validate many candidate values for a proper_tea property at once.
+
+    Values which fail are reported by index, rather than raising on the first
+    failure. The condition is applied before the transform, as in the setter.
+    Where the property's condition is a Constraint and its transform is a
+    type such as int or float, both are evaluated as vectorised NumPy
+    expressions. Otherwise, they are applied to each value in turn.
+
+    Parameters:
+
+        field (ProperTeaDescriptor): The property to validate against. May be
+            obtained via the class, e.g. MyClass.my_property.
+        values (Iterable): 1D sequence of candidate values.
+
+    Returns:
+
+        BatchResult : Contains the transformed 'values' and a boolean mask
+            'valid'. Use 'invalid_indices' to find the values which failed.
+    """
+    values = _as_1d_array(values)
+
+    if field.condition is None:
+        valid = np.ones(len(values), dtype=bool)
+    else:
+        valid = _condition_mask(field.condition, values)
+
+    transform = field.transform
+    if transform is None:
+        return BatchResult(values, valid)
+
+    type_constraint = field.type_constraint
+    if type_constraint in (int, float, bool, complex):
+        try:
+            converted, ok = _convert(type_constraint, values)
+            return BatchResult(converted, valid & ok)
+        except (ValueError, TypeError, OverflowError, FloatingPointError):
+            pass
+
+    # Only transform values which passed the condition
+    converted = np.empty(len(values), dtype=object)
+    results, ok = _elementwise(transform, values[valid])
+    converted[valid] = results
+    valid[valid] = ok
+    try:
+        if type_constraint is not None:
+            converted = np.where(valid, converted, type_constraint()).astype(
+                type_constraint
+            )
+    except (ValueError, TypeError, OverflowError):
+        # e.g. ints too large for int64. Keep the object array.
+        pass
+    return BatchResult(converted, valid)
@@ -0,0 +1,185 @@
+"""membership
+
+Defines membership backends for proper_tea.in_set which are suited to very
+large sets of allowed values, such as allow-lists with tens of millions of
+identifiers. Holding these as a Python set can take gigabytes per process,
+whereas a sorted NumPy array stores each key in a fixed number of bytes, and a
+memory-mapped file is shared between processes via the page cache.
+
+Keys are compared exactly and are not converted, so the dtype of the backend
+should match the values being assigned: str values will not match a bytes
+('S') array, for example.
+
+Contains:
+    - SortedArraySet
+    - MappedSortedSet
+    - BloomFilter
+"""
+
+import math
+
+import numpy as np
+
+from ..constraints import MembershipBackend
+
+_MASK64 = (1 << 64) - 1
+
+
+class SortedArraySet(MembershipBackend):
+    """Membership backend storing keys in a sorted NumPy array.
+
+    Lookups use a binary search via np.searchsorted, taking O(log n) time.
+
+    Parameters:
+
+        values (Iterable): The allowed values. Duplicates are removed.
+        dtype: Optionally set the datatype of the stored keys, e.g. 'S16' to
+            store short ASCII identifiers in 16 bytes each.
+    """
+
+    def __init__(self, values, dtype=None):
+        self.keys = np.unique(np.asarray(values, dtype=dtype))
+
+    def __contains__(self, value) -> bool:
+        # np.searchsorted would search for each element of a sequence. Common
+        # scalars are skipped, as np.ndim converts its input to an array.
+        if not isinstance(value, (str, bytes, int, float)) and np.ndim(value) != 0:
+            return False
+        keys = self.keys
+        try:
+            idx = np.searchsorted(keys, value)
+            return bool(idx < len(keys) and keys[idx] == value)
+        except (TypeError, ValueError):
+            # Values which cannot be compared with the keys are not members
+            return False
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self):
+        dtype = self.keys.dtype
+        return f"{type(self).__name__}(<{len(self)} keys of dtype {dtype}>)"
+
+    def contains_many(self, values):
+        """Vectorised membership test, returning a boolean array."""
+        keys = self.keys
+        values = np.asarray(values)
+        if not len(keys):
+            return np.zeros(values.shape, dtype=bool)
+        idx = np.searchsorted(keys, values)
+        np.minimum(idx, len(keys) - 1, out=idx)
+        return keys[idx] == values
+
+
+class MappedSortedSet(SortedArraySet):
+    """Membership backend reading sorted keys from a memory-mapped .npy file.
+
+    Keys are paged in from disk lazily, and the pages are shared between all
+    processes mapping the same file. Files may be created using 'write'. When
+    pickled, only the path is stored, so the file is mapped again rather than
+    copied when passed to worker processes.
+
+    Parameters:
+
+        path: Path to a .npy file containing a sorted 1D array with no
+            duplicates.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.keys = np.load(path, mmap_mode="r")
+        if self.keys.ndim != 1:
+            raise ValueError(f"{path} should contain a 1D array of keys")
+
+    def __reduce__(self):
+        return (type(self), (self.path,))
+
+    @staticmethod
+    def write(path, values, dtype=None):
+        """Write the sorted, unique 'values' to a .npy file at 'path'.
+
+        Parameters:
+
+            path: Location of the file to write.
+            values (Iterable): The allowed values.
+            dtype: Optionally set the datatype of the stored keys.
+        """
+        np.save(path, np.unique(np.asarray(values, dtype=dtype)))
+
+
+class BloomFilter(MembershipBackend):
+    """Bloom filter used as a fast prefilter in front of another backend.
+
+    Values which are definitely not allowed are rejected using a compact bit
+    array, without consulting 'backend'. This is most useful in front of a
+    MappedSortedSet when most lookups fail, as it avoids paging in keys from
+    disk. Values which pass the filter are always checked by 'backend', so
+    false positives do not affect the result.
+
+    Values are hashed with Python's hash(), which may differ between
+    processes, so when pickled the filter is rebuilt from 'backend.keys' in
+    the receiving process rather than copied.
+
+    Parameters:
+
+        backend (MembershipBackend): The backend to fall back on.
+        values (Iterable): The allowed values. Defaults to 'backend.keys'.
+        false_positive_rate (float): Target probability that a value which is
+            not allowed passes the filter.
+    """
+
+    def __init__(self, backend, values=None, false_positive_rate: float = 0.01):
+        self.backend = backend
+        self.false_positive_rate = false_positive_rate
+        if values is None:
+            values = backend.keys
+        elif not hasattr(values, "__getitem__"):
+            values = list(values)
+        n = max(len(values), 1)
+        n_bits = max(int(-n * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        self.n_bits = n_bits
+        self.n_hashes = max(int(round(n_bits / n * math.log(2))), 1)
+
+        flags = np.zeros(n_bits, dtype=bool)
+        chunk_size = 1 << 20
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start : start + chunk_size]
+            h1, h2 = self._hashes(chunk)
+            for i in range(self.n_hashes):
+                flags[(h1 + np.uint64(i) * h2) % np.uint64(n_bits)] = True
+        self.bits = np.packbits(flags, bitorder="little").tobytes()
+
+    def __reduce__(self):
+        return (type(self), (self.backend, None, self.false_positive_rate))
+
+    @staticmethod
+    def _hash_pair(value):
+        return hash(value) & _MASK64, hash((value, 0x9E3779B9)) & _MASK64 | 1
+
+    @classmethod
+    def _hashes(cls, values):
+        pairs = [cls._hash_pair(value) for value in values]
+        hashes = np.array(pairs, dtype=np.uint64).reshape(-1, 2)
+        return hashes[:, 0], hashes[:, 1]
+
+    def might_contain(self, value) -> bool:
+        """Returns False if 'value' is definitely not allowed."""
+        try:
+            h1, h2 = self._hash_pair(value)
+        except TypeError:
+            return False
+        bits, n_bits = self.bits, self.n_bits
+        for i in range(self.n_hashes):
+            pos = ((h1 + i * h2) & _MASK64) % n_bits
+            if not (bits[pos >> 3] >> (pos & 7)) & 1:
+                return False
+        return True
+
+    def __contains__(self, value) -> bool:
+        return self.might_contain(value) and value in self.backend
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.backend!r})"
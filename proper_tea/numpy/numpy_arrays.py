@@ -3,53 +3,481 @@
 Defines specialised property_factory's that convert inputs to numpy arrays. Numpy is
 not a dependency of proper_tea, so users must have installed numpy separately in
 order for these features to work.
+
+The conditions and transforms used by these properties are defined as classes
+rather than closures, so that the properties may be pickled.
+
+Contains:
+    - numpy_array
+    - mapped_array
+    - HasShape
+    - SharedDimensions
+    - AsArray
+    - MapArray
 """
 
+import numbers
+import operator
+import os
+import weakref
+
 from ..property_factory import property_factory
+from ..class_decorators import fields
 import numpy as np
 
 
-def numpy_array(shape=None, dtype=None, sort: bool = False):
+def _shape_of(x):
+    # Reading the shape of an array allocates nothing, unlike np.shape, which
+    # converts other inputs to arrays
+    return x.shape if isinstance(x, np.ndarray) else np.shape(x)
+
+
+def _as_shape(shape):
+    """Convert 'shape' to a tuple of dimensions, each an int, None or str."""
+    if shape is None:
+        return None
+    # if a single size or name is given as shape, convert to 1-tuple
+    if isinstance(shape, (numbers.Integral, str)):
+        shape = (shape,)
+    dims = []
+    for dim in shape:
+        if dim is None or isinstance(dim, str):
+            dims.append(dim)
+            continue
+        try:
+            # Accepts any integer, such as np.int64, but not e.g. floats
+            dims.append(operator.index(dim))
+        except TypeError:
+            raise TypeError(
+                f"Shape dimensions must be int, None or str, not {type(dim).__name__}"
+            ) from None
+    return tuple(dims)
+
+
+class HasShape:
+    """Condition requiring inputs have a given shape.
+
+    Each dimension of the shape may be an integer, requiring that size, or
+    None or a str, which accept any size. Named dimensions are matched between
+    properties by SharedDimensions. Dimensions of any other type raise
+    TypeError.
+    """
+
+    def __init__(self, shape):
+        self.shape = _as_shape(shape)
+        # (index, size) for each dimension with a fixed size
+        self.sizes = tuple(
+            (idx, size) for idx, size in enumerate(self.shape) if isinstance(size, int)
+        )
+        self.fixed = len(self.sizes) == len(self.shape)
+
+    def __call__(self, x) -> bool:
+        return self.matches(_shape_of(x))
+
+    def matches(self, shape) -> bool:
+        """Return True if the tuple 'shape' satisfies this condition."""
+        if self.fixed:
+            return shape == self.shape
+        if len(shape) != len(self.shape):
+            return False
+        for idx, size in self.sizes:
+            if shape[idx] != size:
+                return False
+        return True
+
+
+class SharedDimensions:
+    """Instance condition requiring that named dimensions have the same size
+    in every property of an instance which uses them.
+
+    Sizes are not stored, but are read from the other properties which have
+    already been set, so reassigning all of them with a new size is allowed.
+    A name used twice within one shape requires both dimensions to match.
+    """
+
+    def __init__(self, shape):
+        self.shape = tuple(shape)
+        # Pairs of dimensions within this shape which must match
+        self.repeated = tuple(
+            (first, idx)
+            for idx, name in enumerate(self.shape)
+            if isinstance(name, str)
+            for first in [self.shape.index(name)]
+            if first != idx
+        )
+        # Maps each owner class to its '_related' dimensions
+        self._related = weakref.WeakKeyDictionary()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_related"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._related = weakref.WeakKeyDictionary()
+
+    def _find_related(self, cls):
+        """Return (index, field, field index) for each dimension of another
+        property of 'cls' which shares a name with one in this shape."""
+        related = []
+        for name, descriptor in fields(cls).items():
+            other = descriptor.instance_condition
+            if other is self or not isinstance(other, SharedDimensions):
+                continue
+            for idx, dim in enumerate(self.shape):
+                if not isinstance(dim, str):
+                    continue
+                for other_idx, other_dim in enumerate(other.shape):
+                    if other_dim == dim:
+                        related.append((idx, name, other_idx))
+        return tuple(related)
+
+    def __call__(self, cls, instance, value, siblings) -> bool:
+        shape = _shape_of(value)
+        for first, idx in self.repeated:
+            if shape[first] != shape[idx]:
+                return False
+        try:
+            related = self._related[cls]
+        except KeyError:
+            related = self._related[cls] = self._find_related(cls)
+        for idx, name, other_idx in related:
+            if name in siblings:
+                other = siblings[name]
+            else:
+                other = getattr(instance, name, None)
+            # Properties which have not been set are ignored
+            other_shape = getattr(other, "shape", None)
+            if other_shape is not None and other_shape[other_idx] != shape[idx]:
+                return False
+        return True
+
+
+# NumPy 2 can refuse to copy during conversion, rather than checking afterwards
+_NUMPY_2 = np.lib.NumpyVersion(np.__version__) >= "2.0.0"
+
+_COPY_POLICIES = ("never", "if_needed", "always")
+
+_ORDERS = (None, "C", "F")
+
+_SORT_KINDS = (None, "quicksort", "mergesort", "heapsort", "stable")
+
+# Number of elements compared at a time when checking whether a 1D array is
+# sorted, which bounds the size of the temporary boolean array
+_SORTED_CHUNK = 1 << 16
+
+
+def _is_sorted(a) -> bool:
+    """Return True if 'a' is sorted along its last axis, in O(n) time."""
+    if a.ndim != 1:
+        return bool(np.all(a[..., :-1] <= a[..., 1:]))
+    # Compare in chunks, so that unsorted input is rejected early
+    last = len(a) - 1
+    for start in range(0, last, _SORTED_CHUNK):
+        stop = min(start + _SORTED_CHUNK, last)
+        if not np.all(a[start:stop] <= a[start + 1 : stop + 1]):
+            return False
+    return True
+
+
+class AsArray:
+    """Transform converting inputs to NumPy arrays, optionally sorting them.
+
+    Inputs which are already sorted are not sorted again. Memory layout
+    requirements follow the semantics of np.require, so inputs are only
+    copied if they do not already meet them.
+
+    Attributes:
+
+        copies (int): Number of inputs which were copied rather than stored
+            as they were, including those copied to be sorted or to meet the
+            memory layout requirements.
+    """
+
+    def __init__(
+        self,
+        dtype=None,
+        sort: bool = False,
+        copy: str = "if_needed",
+        kind=None,
+        in_place: bool = False,
+        order=None,
+        aligned: bool = False,
+        writeable=None,
+    ):
+        if copy not in _COPY_POLICIES:
+            raise ValueError(f"copy must be one of {_COPY_POLICIES}, not {copy!r}")
+        if kind not in _SORT_KINDS:
+            raise ValueError(f"kind must be one of {_SORT_KINDS}, not {kind!r}")
+        if not sort and (kind is not None or in_place):
+            raise ValueError("kind and in_place may only be used with sort=True")
+        if sort and copy == "never" and not in_place:
+            raise ValueError(
+                "Sorting requires a copy, so cannot use copy='never' unless "
+                "in_place=True"
+            )
+        if order not in _ORDERS:
+            raise ValueError(f"order must be one of {_ORDERS}, not {order!r}")
+        self.dtype = dtype
+        self.sort = sort
+        self.copy = copy
+        self.kind = kind
+        self.in_place = in_place
+        self.order = order
+        self.aligned = aligned
+        self.writeable = writeable
+        self.copies = 0
+
+    def __call__(self, x):
+        # Conversion also ensures the array has the required order
+        if self.copy == "always":
+            y = np.array(x, dtype=self.dtype, copy=True, order=self.order)
+            copied = owned = True
+        elif self.copy == "never" and _NUMPY_2:
+            # Raises ValueError if a copy cannot be avoided
+            y = np.asarray(x, dtype=self.dtype, order=self.order, copy=False)
+            copied = owned = False
+        else:
+            y = np.asarray(x, dtype=self.dtype, order=self.order)
+            # A new array owns its data. Views of the input, including the
+            # input itself, do not.
+            copied = y is not x and y.base is None
+            if copied and self.copy == "never":
+                raise ValueError("Unable to avoid copy while creating an array")
+            # Other array-likes may return an array they still own, so only
+            # treat the result as ours if it is certainly new
+            owned = copied and isinstance(x, (np.ndarray, list, tuple))
+        if self.sort and not _is_sorted(y):
+            if owned or self.in_place:
+                y.sort(kind=self.kind)
+            else:
+                y = np.sort(y, kind=self.kind)
+                copied = owned = True
+        if (self.aligned and not y.flags.aligned) or (
+            self.writeable and not y.flags.writeable
+        ):
+            if self.copy == "never":
+                raise ValueError("Unable to avoid copy while meeting requirements")
+            # New arrays are always aligned and writeable
+            y = np.array(y, copy=True, order="K")
+            copied = owned = True
+        if self.writeable is False and y.flags.writeable:
+            # Freeze a view, rather than changing the flags of the input
+            if not owned:
+                y = y.view()
+            y.flags.writeable = False
+        self.copies += copied
+        return y
+
+
+def numpy_array(
+    shape=None,
+    dtype=None,
+    sort: bool = False,
+    copy: str = "if_needed",
+    kind=None,
+    in_place: bool = False,
+    order=None,
+    aligned: bool = False,
+    writeable=None,
+):
     """Creates property that converts to numpy array.
 
-    Uses np.asarray, so does not copy when passed a valid array.
+    By default uses np.asarray, so does not copy when passed a valid array.
+    The number of copies made is available as the 'copies' attribute of the
+    property's transform, e.g. ``MyClass.x.transform.copies``.
 
     Parameters:
 
-        shape: Optionally require a given shape.
+        shape: Optionally require a given shape. Each dimension may be an
+            int, None, which accepts any size, or a str naming the dimension.
+            Dimensions with the same name must have the same size in every
+            property of an instance that uses it, e.g. to require fields 'x'
+            and 'y' have shape ("N",), and 'grid' has shape ("N", "M").
         dtype: Optionally require the property to convert to given datatype.
-        sort: Optionally sort any input arrays
+        sort: Optionally sort any input arrays along their last axis. Arrays
+            which are already sorted are stored unchanged.
+        copy (str): One of "if_needed", which copies only if the input is not
+            an array of the given datatype, "never", which raises ValueError
+            rather than copying, or "always", which always stores a copy.
+            Sorting requires a copy unless 'in_place' is set, so otherwise
+            cannot be used with "never".
+        kind (str): Sorting algorithm, as for np.sort. "stable" is usually
+            fastest for data which is already partially sorted, and uses
+            radix sort for integers of 16 bits or fewer.
+        in_place (bool): If True, sort input arrays in place rather than
+            copying them. This modifies the caller's array, so should only be
+            used for arrays which the caller owns.
+        order (str): Optionally require arrays be C contiguous with "C", or
+            Fortran contiguous with "F", copying those which are not.
+        aligned (bool): If True, copy arrays whose data is not aligned for
+            their datatype.
+        writeable: If True, copy read-only arrays. If False, store a read-only
+            view, so that the array cannot be modified through the property
+            and may be shared between instances without defensive copies.
+            Note the input itself is not made read-only. By default, either
+            is accepted.
 
     Returns:
 
         property
     """
-    # if a single int is given as shape, convert to 1-tuple
-    if isinstance(shape, int):
-        shape = (shape,)
-
-    def condition(x):
-        if shape is not None:
-            # Ensure shape of x is same as that provided by user
-            return np.array_equal(np.shape(x), shape)
-        # If shape is None, don't perform checks
-        return True
+    shape = _as_shape(shape)
 
+    condition = None if shape is None else HasShape(shape)
     condition_err_msg = f"Must have shape {shape}"
+    instance_condition = None
+    if shape is not None and any(isinstance(dim, str) for dim in shape):
+        instance_condition = SharedDimensions(shape)
+        condition_err_msg += (
+            ", with named dimensions matching those of other properties"
+        )
 
-    asarray = lambda x: np.asarray(x, dtype=dtype)
-    if sort:
-        transform = lambda x: np.sort(asarray(x))
-    else:
-        transform = asarray
+    transform = AsArray(
+        dtype=dtype,
+        sort=sort,
+        copy=copy,
+        kind=kind,
+        in_place=in_place,
+        order=order,
+        aligned=aligned,
+        writeable=writeable,
+    )
 
     transform_err_msg = "Must be convertable to NumPy array"
     if dtype is not None:
         transform_err_msg += f" with datatype {dtype.__name__}"
+    if copy == "never":
+        transform_err_msg += " without copying"
 
     return property_factory(
         condition=condition,
         condition_err_msg=condition_err_msg,
         transform=transform,
         transform_err_msg=transform_err_msg,
+        instance_condition=instance_condition,
+    )
+
+
+_MAPPED_MODES = ("r", "r+", "c")
+
+_NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+class MapArray:
+    """Transform memory-mapping arrays stored in files.
+
+    Accepts paths to, or open binary files containing, .npy files or raw
+    data, which are mapped using np.memmap. The datatype and shape of .npy
+    files are checked using only the header, before the file is mapped, and
+    no data is read until it is accessed. Arrays, including existing memory
+    maps, are accepted without copying if they have the right datatype and
+    shape.
+    """
+
+    def __init__(self, mode: str = "r", dtype=None, shape=None):
+        if mode not in _MAPPED_MODES:
+            raise ValueError(f"mode must be one of {_MAPPED_MODES}, not {mode!r}")
+        self.mode = mode
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.shape = _as_shape(shape)
+        self.has_shape = None if shape is None else HasShape(shape)
+
+    def _check(self, dtype, shape):
+        if self.dtype is not None and dtype != self.dtype:
+            raise ValueError(f"Datatype {dtype} does not match {self.dtype}")
+        if self.has_shape is not None and not self.has_shape.matches(shape):
+            raise ValueError(f"Shape {shape} does not match {self.shape}")
+
+    def _map(self, f):
+        """Check the header of the file 'f' and return a memory map of it."""
+        offset = f.tell()
+        if f.read(len(np.lib.format.MAGIC_PREFIX)) == np.lib.format.MAGIC_PREFIX:
+            f.seek(offset)
+            version = np.lib.format.read_magic(f)
+            if version not in _NPY_HEADER_READERS:
+                raise ValueError(f".npy format version {version} is not supported")
+            shape, fortran_order, dtype = _NPY_HEADER_READERS[version](f)
+            if dtype.hasobject:
+                raise ValueError("Arrays of objects cannot be memory-mapped")
+            self._check(dtype, shape)
+            order = "F" if fortran_order else "C"
+            return np.memmap(f, dtype, self.mode, f.tell(), shape, order)
+        # Raw data has no header, so its datatype and shape must be given
+        if self.dtype is None:
+            raise ValueError("A datatype is required to map raw files")
+        shape = None
+        if self.has_shape is not None and self.has_shape.fixed:
+            shape = self.shape
+        elif self.shape is not None and len(self.shape) != 1:
+            raise ValueError("A fixed shape is required to map raw files")
+        mapped = np.memmap(f, self.dtype, self.mode, offset, shape)
+        self._check(mapped.dtype, mapped.shape)
+        return mapped
+
+    def __call__(self, x):
+        if isinstance(x, np.ndarray):
+            self._check(x.dtype, x.shape)
+            return x
+        if isinstance(x, (str, os.PathLike)):
+            # The map holds its own reference to the file
+            # Copy-on-write maps only need read access, as for np.memmap
+            with open(x, "r+b" if self.mode == "r+" else "rb") as f:
+                return self._map(f)
+        return self._map(x)
+
+
+def mapped_array(mode: str = "r", shape=None, dtype=None):
+    """Creates property that memory-maps arrays stored in files.
+
+    The property may be assigned a path or open binary file, which is mapped
+    using np.memmap rather than being read into memory. Data is paged in as it
+    is accessed, and pages are shared through the operating system's page
+    cache between all processes which map the same file. Files may be in
+    .npy format, in which case the datatype and shape are checked using only
+    the header, or contain raw data, in which case 'dtype' is required, along
+    with a fixed 'shape' if it has more than one dimension. Existing arrays
+    are also accepted without copying if they match 'dtype' and 'shape'.
+
+    Parameters:
+
+        mode (str): "r" for read-only, "r+" to write changes back to the file,
+            or "c" for copy-on-write, as for np.memmap.
+        shape: Optionally require a given shape, as for numpy_array, which may
+            include wildcards and named dimensions.
+        dtype: Optionally require the given datatype. Unlike numpy_array, data
+            is never converted.
+
+    Returns:
+
+        property
+    """
+    shape = _as_shape(shape)
+
+    transform = MapArray(mode=mode, dtype=dtype, shape=shape)
+
+    transform_err_msg = "Must be a path, file or NumPy array"
+    if dtype is not None:
+        transform_err_msg += f" with datatype {transform.dtype}"
+    if shape is not None:
+        transform_err_msg += f"{' and' if dtype is not None else ' with'} shape {shape}"
+
+    condition_err_msg = ""
+    instance_condition = None
+    if shape is not None and any(isinstance(dim, str) for dim in shape):
+        instance_condition = SharedDimensions(shape)
+        condition_err_msg = (
+            f"Must have shape {shape}, with named dimensions matching those of "
+            "other properties"
+        )
+
+    return property_factory(
+        transform=transform,
+        transform_err_msg=transform_err_msg,
+        condition_err_msg=condition_err_msg,
+        instance_condition=instance_condition,
     )
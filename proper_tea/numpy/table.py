@@ -0,0 +1,222 @@
+"""table
+
+Defines a columnar container for many records of a class with proper_tea
+properties. Rather than creating one Python object per record, each property
+is stored in its own NumPy array, which uses far less memory and allows whole
+columns to be validated and updated at once.
+
+Contains:
+    - Table
+"""
+
+import weakref
+
+import numpy as np
+
+from .._codegen import Namespace, create_function
+from ..class_decorators import fields
+from ..constraints import GreaterThan, LessThan, InRange, NotInRange, InIntervals
+from .. import trusted_mode, instrumentation
+from ..errors import BatchError
+from .batch import validate_batch
+
+# All tables, so their row setters can be regenerated on a mode change
+_tables = weakref.WeakSet()
+
+
+def _recompile_tables():
+    for table in list(_tables):
+        table._compile_rows()
+
+
+trusted_mode._refresh_hooks.append(_recompile_tables)
+
+_type_dtypes = {
+    int: np.int64,
+    float: np.float64,
+    bool: np.bool_,
+    complex: np.complex128,
+}
+
+_numeric_constraints = (GreaterThan, LessThan, InRange, NotInRange, InIntervals)
+
+
+def _column_dtype(descriptor):
+    """Choose the dtype of the column storing a property."""
+    dtype = _type_dtypes.get(descriptor.type_constraint)
+    if dtype is not None:
+        return dtype
+    if descriptor.transform is None and isinstance(
+        descriptor.constraint, _numeric_constraints
+    ):
+        return np.float64
+    return object
+
+
+class Table:
+    """Columnar store for records of a class with proper_tea properties.
+
+    One NumPy array is allocated for each property returned by
+    proper_tea.fields. Properties which convert to int, float, bool or complex
+    are stored using the corresponding NumPy dtype, and properties with a
+    numeric constraint but no type conversion, such as those created by
+    proper_tea.in_range, are stored as float64. All others are stored in
+    columns of dtype object.
+
+    Indexing with an int returns a row proxy, which exposes each property as
+    an attribute and validates assignments exactly as an instance of 'cls'
+    would. Indexing with a property name returns a read-only view of that
+    column. Assigning to a property name, optionally with rows, validates all
+    of the new values at once using proper_tea.numpy.validate_batch::
+
+        table = pt.numpy.Table(Item, 1000)
+        table["price"] = prices
+        table["price", 10:20] = 0
+        table[5].price = 12
+
+    Columns are initialised to zero (or None for object columns), and these
+    initial values are not validated.
+
+    Parameters:
+
+        cls: A class with proper_tea properties. Its __init__ is not called.
+        n (int): Number of rows.
+        dtypes (dict): Optionally override the dtype used for the column of
+            each named property.
+    """
+
+    def __init__(self, cls, n: int, dtypes=None):
+        self.cls = cls
+        self.fields = fields(cls)
+        dtypes = dtypes or {}
+        unknown = set(dtypes) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Class {cls.__name__} has no properties {unknown}")
+        self._columns = {}
+        for name, descriptor in self.fields.items():
+            dtype = dtypes.get(name, _column_dtype(descriptor))
+            fill = None if np.dtype(dtype) == object else 0
+            self._columns[name] = np.full(n, fill, dtype=dtype)
+        self._n = n
+        # Row proxies share a class unique to this table, which holds one
+        # property per column. It shares the name of 'cls' so that error
+        # messages match those raised by its instances.
+        self._row_cls = type(
+            cls.__name__,
+            (_Row,),
+            {
+                "__slots__": (),
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+            },
+        )
+        self._compile_rows()
+        _tables.add(self)
+
+    def _compile_rows(self):
+        """Generate the properties of the row proxy class."""
+        mode = trusted_mode._mode
+        instrument = instrumentation._enabled
+        for name, descriptor in self.fields.items():
+            column = self._columns[name]
+            namespace = Namespace()
+            col = namespace.add(column, "column")
+            body = [
+                *descriptor._validation_lines(
+                    "value", "row", namespace, mode, instrument=instrument
+                ),
+                f"{col}[row._index] = value",
+            ]
+            setter = create_function(name, ["row", "value"], body, namespace)
+            setattr(self._row_cls, name, property(_getter(column), setter))
+
+    @property
+    def columns(self):
+        """Names of the columns, in the order given by proper_tea.fields."""
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self):
+        for idx in range(self._n):
+            yield self._row(idx)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.cls.__name__}, {self._n})"
+
+    def _row(self, idx):
+        row = object.__new__(self._row_cls)
+        row._table = self
+        row._index = idx
+        return row
+
+    def _key(self, key):
+        if isinstance(key, tuple):
+            name, rows = key
+        else:
+            name, rows = key, slice(None)
+        if name not in self._columns:
+            raise KeyError(f"Class {self.cls.__name__} has no property '{name}'")
+        return name, rows
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            idx = int(key)
+            if idx < 0:
+                idx += self._n
+            if not 0 <= idx < self._n:
+                raise IndexError(f"Row {key} out of range for table of {self._n}")
+            return self._row(idx)
+        name, rows = self._key(key)
+        view = self._columns[name][rows]
+        if isinstance(view, np.ndarray):
+            view = view.view()
+            view.flags.writeable = False
+        return view
+
+    def __setitem__(self, key, values):
+        """Validate and assign values to a column, or part of a column.
+
+        No values are assigned unless all of them pass validation. Otherwise,
+        raises proper_tea.BatchError, whose 'indices' are those of the values
+        which failed.
+        """
+        name, rows = self._key(key)
+        column = self._columns[name]
+        if trusted_mode._mode is not None:
+            column[rows] = values
+            return
+        descriptor = self.fields[name]
+        scalar = np.ndim(values) == 0
+        # A single value is validated once and broadcast to every row
+        result = validate_batch(descriptor, [values] if scalar else values)
+        if not np.all(result.valid):
+            raise BatchError(
+                descriptor,
+                self.cls,
+                values,
+                result.invalid_indices,
+                len(result.valid),
+            )
+        column[rows] = result.values[0] if scalar else result.values
+
+
+def _getter(column):
+    def getter(row):
+        # item() returns Python scalars rather than NumPy scalars
+        return column.item(row._index)
+
+    return getter
+
+
+class _Row:
+    """Proxy for a single row of a Table."""
+
+    __slots__ = ("_table", "_index")
+
+    def __repr__(self):
+        values = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self._table.columns
+        )
+        return f"{type(self).__name__}({values})"
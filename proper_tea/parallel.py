@@ -0,0 +1,80 @@
+"""parallel
+
+Defines bulk validation of records across a pool of worker processes, for
+batches large enough that validating them on a single core is a bottleneck.
+
+Contains:
+    - parallel_validate
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+from .streaming import Reject, stream
+
+
+def _validate_chunk(cls, indexed_chunk):
+    """Validate one chunk of records within a worker process."""
+    start, chunk = indexed_chunk
+    rejects = []
+    instances = list(stream(cls, chunk, len(chunk), rejects.append))
+    # Number rejects by their position in the full input
+    rejects = [Reject(start + r.index, r.record, r.errors) for r in rejects]
+    return instances, rejects
+
+
+def _chunks(records, chunk_size):
+    records = iter(records)
+    start = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def parallel_validate(cls, records, workers=None, chunk_size: int = 10000):
+    """Validate records across several processes, as with proper_tea.stream.
+
+    Records are split into chunks, which are validated by a pool of worker
+    processes. The results are merged in input order. Both 'cls' and the
+    records are pickled to be sent to the workers, so 'cls' must be defined
+    at the top level of a module, and its properties must be picklable. All
+    conditions and transforms defined by proper_tea are picklable.
+
+    Valid instances are pickled on the way back, which bypasses their setters
+    for ordinary classes, but not for classes decorated with
+    proper_tea.slotted, which are validated again as they are unpickled.
+
+    Parameters:
+
+        cls: The class to create instances of. See proper_tea.stream.
+        records (Iterable[Mapping]): Records mapping field names to values.
+        workers (int): Number of worker processes. Defaults to the number of
+            CPUs. If 1, records are validated in the current process.
+        chunk_size (int): Number of records sent to a worker at a time.
+
+    Returns:
+
+        Tuple[List, List[Reject]] : Valid instances of 'cls', and a Reject for
+            each record that failed, both in input order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunks(records, chunk_size)
+    if workers == 1:
+        return _merge(map(_validate_chunk, repeat(cls), chunks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _merge(executor.map(_validate_chunk, repeat(cls), chunks))
+
+
+def _merge(results):
+    instances, rejects = [], []
+    for chunk_instances, chunk_rejects in results:
+        instances += chunk_instances
+        rejects += chunk_rejects
+    return instances, rejects
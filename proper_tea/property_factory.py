@@ -4,12 +4,586 @@ Defines a generic property factory which allows the user to set a transform
 and a condition that must be met by any inputs to a property.
 """
 
+import functools
+import time
+import types
+import weakref
+
+from ._codegen import Namespace, create_function, indent
+from .constraints import Constraint
+from . import errors, trusted_mode, instrumentation
+
+# Passed to instance conditions by setters, which have no sibling values
+_NO_SIBLINGS = types.MappingProxyType({})
+
+# All named descriptors, so their setters can be regenerated on a mode change
+_descriptors = weakref.WeakSet()
+
+
+def _recompile_descriptors():
+    for descriptor in list(_descriptors):
+        descriptor._compile()
+
+
+trusted_mode._refresh_hooks.append(_recompile_descriptors)
+
+
+def _unnamed_set(self, instance, value):
+    if self._name_from(type(instance)):
+        # The generated setter has now replaced this function
+        return setattr(instance, self.name, value)
+    raise TypeError(
+        f"{type(self).__name__} has not been assigned a name. It should be "
+        "created in the body of a class, or have __set_name__ called on it."
+    )
+
+
+def _fail_lines(error: str, returns: str = None, cause: str = None):
+    """Source, indented by one level, which raises an error, or if 'returns'
+    is given, returns it formatted with the error in place of '{}'."""
+    if returns is None:
+        return [f"    raise {error}" + (f" from {cause}" if cause else "")]
+    lines = [f"    _pt_err = {error}"]
+    if cause:
+        lines.append(f"    _pt_err.__cause__ = {cause}")
+    return [*lines, f"    return {returns.format('_pt_err')}"]
+
+
+def _indent(msg: str) -> str:
+    # As textwrap.indent(msg, "  "), without the cost of importing textwrap
+    return "".join(
+        f"  {line}" if line.strip() else line for line in msg.splitlines(True)
+    )
+
+
+def _join_err_msgs(a: str, b: str) -> str:
+    return "\n".join(msg for msg in (a, b) if msg)
+
+
+class ProperTeaDescriptor:
+    """Descriptor underlying all properties created by proper_tea.
+
+    Values are stored in the instance ``__dict__`` under the same name as the
+    descriptor. As the class only defines ``__set__``, reads are resolved by
+    the interpreter straight from the instance ``__dict__`` at the same speed
+    as a plain attribute, while writes are routed through the condition and
+    transform.
+
+    The setter is generated and compiled once the descriptor is given a name,
+    and is specialised to the given condition and transform. If the condition
+    is a Constraint, its comparisons are inlined into the setter. In trusted
+    mode (see trusted_mode) the setter may be removed entirely.
+
+    Note that reading the attribute before it has been assigned returns the
+    descriptor itself, as is the case for any attribute looked up on the
+    class.
+
+    Parameters:
+
+        condition : See property_factory.
+        transform : See property_factory.
+        condition_err_msg (str): See property_factory.
+        transform_err_msg (str): See property_factory.
+        cache: See property_factory.
+        instance_condition: See property_factory.
+    """
+
+    def __init__(
+        self,
+        condition=None,
+        transform=None,
+        condition_err_msg: str = "",
+        transform_err_msg: str = "",
+        cache=None,
+        instance_condition=None,
+    ):
+        self.condition = condition
+        self.transform = transform
+        self.condition_err_msg = condition_err_msg
+        self.transform_err_msg = transform_err_msg
+        self.cache = cache
+        self.instance_condition = instance_condition
+        if cache:
+            maxsize = 128 if cache is True else cache
+            # typed=True, so that e.g. 1 and 1.0 are cached separately
+            self._cache = functools.lru_cache(maxsize=maxsize, typed=True)(
+                self._validate_uncached
+            )
+        else:
+            self._cache = None
+        self.stats = instrumentation.PropertyStats()
+        self.name = None
+        self.owner = None
+        self._slot = None
+        # __set__ is replaced by a generated setter once the descriptor is named
+        self._install("__set__", _unnamed_set)
+
+    def __set_name__(self, owner, name):
+        if self.name is not None and name != self.name:
+            # Values are stored under the descriptor's name, so two names
+            # would write to one key and read from another
+            raise TypeError(
+                f"Cannot assign the same {type(self).__name__} to two different "
+                f"names ({self.name!r} and {name!r})."
+            )
+        self.owner = owner
+        self.name = name
+        self._compile()
+
+    def _name_from(self, cls) -> bool:
+        """Name a descriptor which was attached to 'cls', or one of its bases,
+        after the class was created, as __set_name__ is not called for these.
+
+        Returns:
+
+            bool : True if the descriptor was found and named.
+        """
+        for klass in cls.__mro__:
+            for name, attr in vars(klass).items():
+                if attr is self:
+                    self.__set_name__(klass, name)
+                    return True
+        return False
+
+    def __reduce__(self):
+        # Descriptors belonging to a class are pickled by reference, in the
+        # same manner as the class itself. Others are recreated from their
+        # arguments, as the private subclass and generated setter cannot be
+        # pickled.
+        owner, name = self.owner, self.name
+        if owner is not None and owner.__dict__.get(name) is self:
+            return getattr, (owner, name)
+        base = type(self).__dict__.get("_pt_base", type(self))
+        args = (
+            self.condition,
+            self.transform,
+            self.condition_err_msg,
+            self.transform_err_msg,
+            self.cache,
+            self.instance_condition,
+        )
+        return base, args
+
+    @property
+    def constraint(self):
+        """The condition, if it is a Constraint, otherwise None."""
+        condition = self.condition
+        return condition if isinstance(condition, Constraint) else None
+
+    @property
+    def type_constraint(self):
+        """The transform, if it is a type such as int or float, otherwise None."""
+        transform = self.transform
+        return transform if isinstance(transform, type) else None
+
+    @property
+    def metadata(self) -> dict:
+        """Describes the property's constraint and type in a form that may be
+        inspected by other tools, such as proper_tea.numpy.validate_batch.
+
+        Returns:
+
+            dict : Contains the 'kind' of constraint, or None if there is no
+                condition or it is not a Constraint, any attributes of the
+                constraint such as 'bounds' and 'inclusive', and the 'type'
+                the property converts to, or None.
+        """
+        constraint = self.constraint
+        metadata = {"kind": None} if constraint is None else constraint.metadata
+        metadata["type"] = self.type_constraint
+        return metadata
+
+    def _combine(self, other, combine, err_msg):
+        """Combine the conditions of two properties using 'combine'."""
+        if not isinstance(other, ProperTeaDescriptor):
+            return NotImplemented
+        for descriptor in (self, other):
+            if not isinstance(descriptor.condition, (Constraint, type(None))):
+                raise TypeError(
+                    "Only properties whose condition is a Constraint, such as "
+                    "those created by proper_tea.constrained_numbers and "
+                    "proper_tea.in_set, may be combined"
+                )
+        transforms = {self.transform, other.transform} - {None}
+        if len(transforms) > 1:
+            raise ValueError("Cannot combine properties with different transforms")
+        instance_conditions = {self.instance_condition, other.instance_condition}
+        instance_conditions.discard(None)
+        if len(instance_conditions) > 1:
+            raise ValueError(
+                "Cannot combine properties with different instance conditions"
+            )
+        base = type(self).__dict__.get("_pt_base", type(self))
+        return base(
+            condition=combine(self.condition, other.condition),
+            transform=next(iter(transforms), None),
+            condition_err_msg=err_msg(self.condition_err_msg, other.condition_err_msg),
+            transform_err_msg=self.transform_err_msg or other.transform_err_msg,
+            cache=self.cache or other.cache,
+            instance_condition=next(iter(instance_conditions), None),
+        )
+
+    def __and__(self, other):
+        """Combine with another property, requiring both conditions pass."""
+
+        def combine(a, b):
+            return b if a is None else a if b is None else a & b
+
+        return self._combine(other, combine, _join_err_msgs)
+
+    def __or__(self, other):
+        """Combine with another property, requiring either condition passes."""
+
+        def combine(a, b):
+            return None if a is None or b is None else a | b
+
+        def err_msg(a, b):
+            msg = _join_err_msgs(a, b)
+            if not (a and b):
+                return ""
+            return f"One of the following must hold:\n{_indent(msg)}"
+
+        return self._combine(other, combine, err_msg)
+
+    def __invert__(self):
+        """Return a property with the same transform but inverted condition."""
+        if not isinstance(self.condition, Constraint):
+            raise TypeError("Only a condition which is a Constraint may be inverted")
+        if self.instance_condition is not None:
+            raise TypeError("A property with an instance condition cannot be inverted")
+        base = type(self).__dict__.get("_pt_base", type(self))
+        err_msg = self.condition_err_msg
+        if err_msg:
+            err_msg = f"The following must not hold:\n{_indent(err_msg)}"
+        return base(
+            condition=~self.condition,
+            transform=self.transform,
+            condition_err_msg=err_msg,
+            transform_err_msg=self.transform_err_msg,
+            cache=self.cache,
+        )
+
+    def cache_info(self):
+        """Return hit and miss statistics for the cache of validated inputs.
+
+        Returns:
+
+            functools._CacheInfo : A named tuple with fields hits, misses,
+                maxsize and currsize, or None if caching is disabled.
+        """
+        if self._cache is None:
+            return None
+        return self._cache.cache_info()
+
+    def cache_clear(self):
+        """Clear the cache of validated inputs, if there is one."""
+        if self._cache is not None:
+            self._cache.cache_clear()
+
+    def _validate_uncached(self, value):
+        return self._validate(value)
+
+    def _check(self, owner, value, instance=None):
+        """Validate and transform a value without assigning or raising.
+
+        Parameters:
+
+            owner (type): The class reported in any error.
+            value: The value to validate.
+            instance: The instance the value would be assigned to, if any,
+                which is passed to the instance condition.
+
+        Returns:
+
+            CheckResult : See proper_tea.check.
+        """
+        # Trusted mode and instrumentation do not apply, so the checker is
+        # generated once, and replaces this method on the instance
+        namespace = Namespace()
+        result = namespace.add(errors.CheckResult, "CheckResult")
+        new = namespace.add(tuple.__new__, "new")
+        body = [
+            *self._validation_lines(
+                "value", "instance", namespace, owner="owner", on_fail="return"
+            ),
+            f"return {new}({result}, (True, value, None))",
+        ]
+        self._check = create_function(
+            "check", ["owner", "value", "instance=None"], body, namespace
+        )
+        return self._check(owner, value, instance)
+
+    def _validation_lines(
+        self,
+        var: str,
+        instance: str,
+        namespace: Namespace,
+        mode=None,
+        use_cache: bool = True,
+        instrument: bool = False,
+        owner: str = None,
+        on_fail: str = "raise",
+        siblings=None,
+    ):
+        """Generate source which validates and transforms a value in place.
+
+        Parameters:
+
+            var (str): Name of the variable holding the value.
+            instance (str): Name of the variable holding the class instance.
+            namespace (Namespace): Binds any values the source depends upon.
+            mode: A trusted mode. If "store", no source is generated. If
+                "transform", only the transform is applied.
+            use_cache (bool): If False, ignore the cache of validated inputs.
+            instrument (bool): If True, update the counters in 'stats'.
+            owner (str): Source for the class reported in errors. Defaults to
+                the class of 'instance'.
+            on_fail (str): If "raise", failures raise a ConditionError or
+                TransformError. If "return", the source returns a CheckResult
+                holding the error instead.
+            siblings (Dict[str, str]): Maps the names of other properties of
+                the class to variables holding values which have been
+                validated but not yet stored, as in a generated __init__.
+                These are passed to the instance condition.
+
+        Returns:
+
+            List[str] : Lines of source code, without indentation.
+        """
+        lines = []
+        if instrument:
+            stats = namespace.add(self.stats, "stats")
+            count_condition = [f"    {stats}.condition_failures += 1"]
+            count_transform = [f"    {stats}.transform_failures += 1"]
+        else:
+            count_condition = count_transform = []
+        descriptor = namespace.add(self, "descriptor")
+        if owner is None:
+            owner = f"{instance}.__class__"
+        # Errors are created from the descriptor, owner and value alone, and
+        # only format their message if it is read
+        instance_condition = None
+        if mode not in ("store", "transform"):
+            instance_condition = self.instance_condition
+        # The instance condition runs after the transform, so keep the input
+        # to report in errors
+        value = var if instance_condition is None else "_pt_input"
+        args = f"{descriptor}, {owner}, {value}"
+        returns = None
+        if on_fail == "return":
+            # tuple.__new__ skips the Python-level __new__ of the named tuple
+            result = namespace.add(errors.CheckResult, "CheckResult")
+            new = namespace.add(tuple.__new__, "new")
+            returns = f"{new}({result}, (False, {value}, {{}}))"
+        condition = None if mode in ("store", "transform") else self.condition
+        if condition is not None:
+            if isinstance(condition, Constraint):
+                # Inline comparisons rather than calling the condition
+                expr = condition.expression(var, namespace)
+            else:
+                expr = f"{namespace.add(condition, 'condition')}({var})"
+            error = namespace.add(errors.ConditionError, "ConditionError")
+            lines += [
+                "try:",
+                f"    _pt_valid = {expr}",
+                "except Exception as _pt_e:",
+                *count_condition,
+                *_fail_lines(f"{error}({args}, True)", returns, "_pt_e"),
+                "if not _pt_valid:",
+                *count_condition,
+                *_fail_lines(f"{error}({args})", returns),
+            ]
+
+        if self.transform is not None and mode != "store":
+            transform = namespace.add(self.transform, "transform")
+            error = namespace.add(errors.TransformError, "TransformError")
+            lines += [
+                "try:",
+                f"    {var} = {transform}({var})",
+                "except Exception as _pt_e:",
+                *count_transform,
+                *_fail_lines(f"{error}({args})", returns, "_pt_e"),
+            ]
+
+        if lines and use_cache and mode is None and self._cache is not None:
+            # Validate as normal only if the input is unhashable. Errors from
+            # the cached validator are recreated to refer to the instance's
+            # class, which is cheap as their message is formatted lazily.
+            cache = namespace.add(self._cache, "cache")
+            base_error = namespace.add(errors.ProperTeaValidationError, "Error")
+            if instrument:
+                error = namespace.add(errors.ConditionError, "ConditionError")
+                count_cached = [
+                    f"    if _pt_e.__class__ is {error}:",
+                    *indent(count_condition),
+                    "    else:",
+                    *indent(count_transform),
+                ]
+            else:
+                count_cached = []
+            rebuilt = f"_pt_e.__class__({args}, *_pt_e.args[3:])"
+            lines = [
+                "try:",
+                f"    {var} = {cache}({var})",
+                "    _pt_hit = True",
+                f"except {base_error} as _pt_e:",
+                *count_cached,
+                *_fail_lines(rebuilt, returns, "_pt_e.__cause__"),
+                "except TypeError:",
+                "    _pt_hit = False",
+                "if not _pt_hit:",
+                *indent(lines),
+            ]
+
+        if instance_condition is not None:
+            # Never cached, as the result depends upon the instance
+            check = namespace.add(instance_condition, "instance_condition")
+            if siblings:
+                items = ", ".join(f"{name!r}: {v}" for name, v in siblings.items())
+                values = f"{{{items}}}"
+            else:
+                values = namespace.add(_NO_SIBLINGS, "siblings")
+            error = namespace.add(errors.ConditionError, "ConditionError")
+            lines = [
+                f"{value} = {var}",
+                *lines,
+                "try:",
+                f"    _pt_valid = {check}({owner}, {instance}, {var}, {values})",
+                "except Exception as _pt_e:",
+                *count_condition,
+                *_fail_lines(f"{error}({args}, True)", returns, "_pt_e"),
+                "if not _pt_valid:",
+                *count_condition,
+                *_fail_lines(f"{error}({args})", returns),
+            ]
+
+        if instrument:
+            perf_counter = namespace.add(time.perf_counter, "time")
+            lines = [
+                f"{stats}.sets += 1",
+                f"_pt_start = {perf_counter}()",
+                "try:",
+                *indent(lines or ["pass"]),
+                "finally:",
+                f"    {stats}.time += {perf_counter}() - _pt_start",
+            ]
+        return lines
+
+    def _store_lines(self, var: str, instance: str, namespace: Namespace):
+        """Generate source which stores a value in the given class instance.
+
+        Parameters are as for '_validation_lines'.
+        """
+        if self._slot is None:
+            name = namespace.add(self.name, "name")
+            return [f"{instance}.__dict__[{name}] = {var}"]
+        slot_set = namespace.add(self._slot.__set__, "slot")
+        return [f"{slot_set}({instance}, {var})"]
+
+    def _install(self, name: str, method):
+        """Set a method on a class unique to this descriptor.
+
+        Special methods such as __set__ are looked up on the type rather than
+        the instance, so to avoid an extra function call per assignment each
+        descriptor is moved to a private subclass of its original class.
+        """
+        cls = type(self)
+        if "_pt_base" not in cls.__dict__:
+            cls = type(
+                cls.__name__,
+                (cls,),
+                {
+                    "__slots__": (),
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__,
+                    "_pt_base": cls,
+                },
+            )
+            self.__class__ = cls
+        setattr(cls, name, method)
+
+    def _uninstall(self, name: str):
+        """Remove a method set by '_install'."""
+        cls = type(self)
+        if "_pt_base" in cls.__dict__ and name in cls.__dict__:
+            delattr(cls, name)
+
+    def _compile(self):
+        """Generate the setter specialised to this descriptor."""
+        mode = trusted_mode._mode
+        instrument = instrumentation._enabled
+        if mode == "store" and self._slot is None and not instrument:
+            # The setter would only store to the instance __dict__, which the
+            # interpreter does itself for attributes which are not data
+            # descriptors. Removing __set__ makes reads and writes run at the
+            # same speed as a plain attribute.
+            self._uninstall("__set__")
+        else:
+            namespace = Namespace()
+            body = [
+                *self._validation_lines(
+                    "value", "instance", namespace, mode, instrument=instrument
+                ),
+                *self._store_lines("value", "instance", namespace),
+            ]
+            setter = create_function(
+                "__set__", ["self", "instance", "value"], body, namespace
+            )
+            self._install("__set__", setter)
+        if self._cache is not None:
+            namespace = Namespace()
+            body = [
+                *self._validation_lines("value", "None", namespace, use_cache=False),
+                "return value",
+            ]
+            self._validate = create_function("validate", ["value"], body, namespace)
+        _descriptors.add(self)
+        # The interpreter caches attribute lookups per class, so reassign the
+        # descriptor to the owner to ensure the new setter is picked up.
+        owner = self.owner
+        if owner is not None and owner.__dict__.get(self.name) is self:
+            setattr(owner, self.name, self)
+
+    def _bind_slot(self, slot):
+        """Return a copy of this descriptor which stores values in 'slot'.
+
+        Parameters:
+
+            slot: The member descriptor created by Python for an entry in
+                ``__slots__``.
+
+        Returns:
+
+            SlottedProperTeaDescriptor
+        """
+        slotted = object.__new__(SlottedProperTeaDescriptor)
+        slotted.__dict__.update(self.__dict__)
+        slotted._slot = slot
+        slotted._compile()
+        return slotted
+
+
+class SlottedProperTeaDescriptor(ProperTeaDescriptor):
+    """Variant of ProperTeaDescriptor which stores values in a slot.
+
+    Instances are created by the 'slotted' class decorator, and should not
+    usually be created directly. As there is no instance ``__dict__`` to read
+    from, reads are forwarded to the slot's member descriptor.
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self._slot.__get__(instance, owner)
+
 
 def property_factory(
     condition=None,
     transform=None,
     condition_err_msg: str = "",
     transform_err_msg: str = "",
+    cache=None,
+    instance_condition=None,
 ):
     """A generic function for creating class properties.
 
@@ -29,64 +603,33 @@ def property_factory(
         condition_err_msg (str): Message to print if 'condition' returns False.
         transform_err_msg (str): Message to print if casting to 'transform'
             fails.
+        cache : If True or a positive int, memoize the result of validating
+            hashable inputs in an LRU cache, avoiding repeat calls to expensive
+            conditions and transforms. An int sets the maximum size of the
+            cache, which otherwise holds 128 entries. Unhashable inputs are
+            validated as normal. Statistics are available via the cache_info
+            method of the returned descriptor. The cached transform result is
+            shared between all instances, so should not be mutated.
+        instance_condition : Should either be None, or a function relating
+            the transformed value to other properties of the same instance.
+            It is called with the class, the instance, the transformed value,
+            and a mapping of other properties' values which have been
+            validated but not yet stored, such as in the __init__ generated
+            by proper_tea.model. It should return a bool. Failures raise
+            ConditionError with 'condition_err_msg'. The instance may be None
+            if the value is validated without one, e.g. by proper_tea.schema.
 
     Returns:
 
-        property : A property decorator. For details on properties, see
+        ProperTeaDescriptor : A data descriptor which behaves like a property.
+            For details on properties, see
             https://realpython.com/python-property/
     """
-
-    # Use counter for unique underlying names
-    try:
-        property_factory.counter += 1
-    except AttributeError:
-        property_factory.counter = 0
-
-    internal_name = f"_proper_tea:attr{property_factory.counter}"
-
-    def getter(instance):
-        """Retrieve the property from the given class instance."""
-        return getattr(instance, internal_name)
-
-    def setter(instance, value):
-        """Assign 'value' to the property within the given class instance."""
-
-        if condition is not None:
-            try:
-                valid = condition(value)
-            except Exception as e:
-                err_msg = (
-                    f"Setter condition for property in class "
-                    f"{instance.__class__.__name__}"
-                    f"raised exception. See traceback for more info."
-                )
-                if condition_err_msg:
-                    err_msg += f"\n{condition_err_msg}"
-                raise ValueError(err_msg) from e
-
-            if not valid:
-                err_msg = (
-                    f"Setter condition for property in class "
-                    f"{instance.__class__.__name__} "
-                    f"returned False."
-                )
-                if condition_err_msg:
-                    err_msg += f"\n{condition_err_msg}"
-                raise ValueError(err_msg)
-
-        if transform is not None:
-            try:
-                value = transform(value)
-            except Exception as e:
-                err_msg = (
-                    f"Setter transform for property in class "
-                    f"{instance.__class__.__name__} "
-                    f"raised exception. See traceback for more info."
-                )
-                if transform_err_msg:
-                    err_msg += f"\n{transform_err_msg}"
-                raise ValueError(err_msg) from e
-
-        setattr(instance, internal_name, value)
-
-    return property(getter, setter)
+    return ProperTeaDescriptor(
+        condition=condition,
+        transform=transform,
+        condition_err_msg=condition_err_msg,
+        transform_err_msg=transform_err_msg,
+        cache=cache,
+        instance_condition=instance_condition,
+    )
@@ -0,0 +1,104 @@
+"""schemas
+
+Defines validators compiled from the proper_tea properties of a class, which
+check a record such as a parsed JSON payload against every property without
+creating an instance.
+
+Contains:
+    - schema
+"""
+
+from ._codegen import Namespace, create_function, indent
+from .class_decorators import fields
+
+# Attribute of each class holding its compiled validators, keyed by 'as_tuple'.
+# The validators refer to the class, so storing them elsewhere would keep the
+# class alive.
+_SCHEMAS = "_pt_schemas"
+
+
+def _field_mismatch(cls, cls_fields):
+    """Return a function which explains why a record has the wrong fields."""
+
+    def mismatch(record):
+        for name in cls_fields:
+            if name not in record:
+                return TypeError(f"Missing field '{name}'")
+        for name in record:
+            if name not in cls_fields:
+                return TypeError(f"Class {cls.__name__} has no field '{name}'")
+        return TypeError("Record does not match fields")
+
+    return mismatch
+
+
+def _create_schema(cls, as_tuple):
+    cls_fields = fields(cls)
+    namespace = Namespace()
+    owner = namespace.add(cls, "cls")
+    mismatch = namespace.add(_field_mismatch(cls, cls_fields), "mismatch")
+    variables = [f"_pt_v{idx}" for idx in range(len(cls_fields))]
+    reads = [
+        f"{var} = _pt_record[{name!r}]" for var, name in zip(variables, cls_fields)
+    ]
+    body = [
+        f"if len(_pt_record) != {len(cls_fields)}:",
+        f"    raise {mismatch}(_pt_record)",
+        "try:",
+        *indent(reads or ["pass"]),
+        "except KeyError:",
+        f"    raise {mismatch}(_pt_record) from None",
+    ]
+    for idx, (var, descriptor) in enumerate(zip(variables, cls_fields.values())):
+        siblings = dict(zip(cls_fields, variables[:idx]))
+        # As with proper_tea.check, trusted mode does not apply
+        body += descriptor._validation_lines(
+            var, "None", namespace.child(f"{idx}_"), owner=owner, siblings=siblings
+        )
+    if as_tuple:
+        body.append(f"return ({''.join(f'{var}, ' for var in variables)})")
+    else:
+        items = ", ".join(
+            f"{name!r}: {var}" for var, name in zip(variables, cls_fields)
+        )
+        body.append(f"return {{{items}}}")
+    validator = create_function("schema", ["_pt_record"], body, namespace)
+    validator.__qualname__ = f"{cls.__qualname__}.schema"
+    validator.__module__ = cls.__module__
+    return validator
+
+
+def schema(cls, as_tuple: bool = False):
+    """Return a function which validates records against the fields of a class.
+
+    The validator takes a mapping from field names to values, such as a parsed
+    JSON payload, and validates every field as its property's setter would,
+    without creating an instance. The record must contain every field
+    returned by proper_tea.fields, and no others, otherwise TypeError is
+    raised. As with proper_tea.check, values are always fully validated, even
+    in trusted mode.
+
+    The validator is generated from the source of each property's setter as a
+    single function, and is created once for each class.
+
+    Parameters:
+
+        cls: The class whose proper_tea properties make up the schema.
+        as_tuple (bool): If True, the validator returns the transformed values
+            as a tuple in the order given by proper_tea.fields. Otherwise, it
+            returns a dict mapping field names to transformed values.
+
+    Returns:
+
+        Callable[[Mapping], Union[dict, tuple]] : The validator.
+    """
+    # Not inherited, as subclasses may have other fields
+    validators = vars(cls).get(_SCHEMAS)
+    if validators is None:
+        validators = {}
+        setattr(cls, _SCHEMAS, validators)
+    as_tuple = bool(as_tuple)
+    validator = validators.get(as_tuple)
+    if validator is None:
+        validator = validators[as_tuple] = _create_schema(cls, as_tuple)
+    return validator
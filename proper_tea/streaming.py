@@ -0,0 +1,133 @@
+"""streaming
+
+Defines a generator pipeline which turns an iterable of records, such as rows
+read from a JSON or CSV file, into validated instances of a class with
+proper_tea properties. Records which fail validation are passed to a separate
+sink along with the errors raised by every failing property, rather than
+stopping the pipeline.
+
+Contains:
+    - stream
+    - Reject
+"""
+
+from itertools import islice
+from typing import Any, Dict, Mapping, NamedTuple
+
+from .class_decorators import fields
+
+
+class Reject(NamedTuple):
+    """A record which failed validation, as passed to the 'rejects' sink.
+
+    Attributes:
+
+        index (int): Position of the record in the input.
+        record (Mapping): The record itself.
+        errors (Dict[str, Exception]): Maps the name of each field that could
+            not be set to the exception it raised. Missing fields raise
+            TypeError, and all others raise ValueError. If no single field is
+            at fault, the error is stored under the key None.
+    """
+
+    index: int
+    record: Mapping
+    errors: Dict[Any, Exception]
+
+
+def _builder(cls, cls_fields):
+    """Return a function which creates an instance of cls from a record."""
+    if getattr(cls.__dict__.get("__init__"), "_pt_generated", False):
+        # The __init__ generated by 'model' validates all fields in one call
+        def build(record):
+            return cls(**record)
+
+    else:
+        new = cls.__new__
+        names = tuple(cls_fields)
+        n_fields = len(names)
+
+        def build(record):
+            if len(record) != n_fields:
+                raise TypeError("Record does not match fields")
+            instance = new(cls)
+            for name in names:
+                setattr(instance, name, record[name])
+            return instance
+
+    return build
+
+
+def _diagnose(cls, cls_fields, record, exc):
+    """Find the error raised by every field of a record that failed."""
+    errors = {}
+    scratch = cls.__new__(cls)
+    for name in cls_fields:
+        if name not in record:
+            errors[name] = TypeError(f"Missing field '{name}'")
+            continue
+        try:
+            setattr(scratch, name, record[name])
+        except Exception as field_exc:
+            errors[name] = field_exc
+    for name in record:
+        if name not in cls_fields:
+            errors[name] = TypeError(f"Class {cls.__name__} has no field '{name}'")
+    if not errors:
+        errors[None] = exc
+    return errors
+
+
+def stream(cls, records, chunk_size: int = 1024, rejects=None):
+    """Lazily create validated instances of 'cls' from an iterable of records.
+
+    Classes decorated with proper_tea.model are created by calling them with
+    each record as keyword arguments. Otherwise, instances are created
+    without calling __init__, and each item of the record is assigned as an
+    attribute. In either case, records must contain every field returned by
+    proper_tea.fields, and no others.
+
+    Records are read from 'records' in chunks of 'chunk_size', so at most one
+    chunk is held in memory at a time, and the input may be unbounded. When a
+    record fails, every field is checked so that all of its errors are
+    reported together.
+
+    Parameters:
+
+        cls: The class to create instances of.
+        records (Iterable[Mapping]): Records mapping field names to values,
+            such as those produced by csv.DictReader.
+        chunk_size (int): Number of records to process at a time.
+        rejects (Callable): Called with a Reject for each record that fails
+            validation. If None, failed records are discarded. A list's
+            'append' method may be used to collect them.
+
+    Returns:
+
+        Generator : Yields valid instances of 'cls' in input order.
+    """
+    # Check arguments here rather than when the generator first runs
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return _stream(cls, iter(records), chunk_size, rejects)
+
+
+def _stream(cls, records, chunk_size, rejects):
+    cls_fields = fields(cls)
+    build = _builder(cls, cls_fields)
+    index = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        built = []
+        for record in chunk:
+            try:
+                built.append(build(record))
+            except Exception as exc:
+                if rejects is not None:
+                    errors = _diagnose(cls, cls_fields, record, exc)
+                    rejects(Reject(index, record, errors))
+            index += 1
+        del chunk
+        yield from built
@@ -0,0 +1,125 @@
+"""trusted_mode
+
+Defines a process-wide switch which disables validation in all proper_tea
+setters, intended for hot paths operating on data that has already been
+validated.
+
+Rather than checking a flag on every assignment, switching mode regenerates
+the setters of all existing properties (and the __init__ of all classes
+decorated with proper_tea.model), so each mode runs at full speed and there
+is nothing to check at runtime.
+
+Contains:
+    - trusted
+    - set_trusted
+    - is_trusted
+"""
+
+import warnings
+from contextlib import contextmanager
+
+# None: Validate as normal
+# "store": Skip both conditions and transforms
+# "transform": Skip conditions, but still apply transforms
+_mode = None
+
+# Functions to call whenever the mode changes
+_refresh_hooks = []
+
+# Mode chosen by set_trusted, which applies while no trusted() block is active
+_default = None
+
+# (entry, mode) for each active trusted() block, in the order they were entered.
+# Blocks in different tasks or threads may exit in any order, so the mode is
+# only restored once the last of them exits.
+_active = []
+
+
+def _set_mode(mode):
+    global _mode
+    if mode != _mode:
+        _mode = mode
+        for hook in _refresh_hooks:
+            hook()
+
+
+def _update_mode():
+    # The most recently entered block which is still active takes precedence
+    _set_mode(_active[-1][1] if _active else _default)
+
+
+def _warn_off_main_thread(stacklevel: int):
+    # threading is not otherwise imported with proper_tea
+    import threading
+
+    if threading.current_thread() is not threading.main_thread():
+        warnings.warn(
+            "Trusted mode was enabled outside of the main thread, but applies to "
+            "the whole process. Validation is disabled in every thread until "
+            "trusted mode is left.",
+            RuntimeWarning,
+            stacklevel=stacklevel + 1,
+        )
+
+
+def is_trusted() -> bool:
+    """Returns True if validation is currently disabled."""
+    return _mode is not None
+
+
+def set_trusted(enabled: bool = True, transforms: bool = False):
+    """Enable or disable trusted mode for the whole process.
+
+    In trusted mode, setters skip their condition and simply store the value.
+    Switching mode regenerates every setter, so this should be done around hot
+    loops rather than within them. As every thread is affected, enabling
+    trusted mode from a thread other than the main thread emits a
+    RuntimeWarning. While any block of proper_tea.trusted is active, its mode
+    takes precedence, and the mode set here applies once they have all exited.
+
+    Parameters:
+
+        enabled (bool): If True, enter trusted mode. If False, return to
+            validating as normal.
+        transforms (bool): If True, continue to apply transforms such as type
+            conversions while in trusted mode.
+    """
+    global _default
+    if not enabled:
+        _default = None
+    else:
+        _warn_off_main_thread(stacklevel=2)
+        _default = "transform" if transforms else "store"
+    _update_mode()
+
+
+@contextmanager
+def trusted(transforms: bool = False):
+    """Context manager which enables trusted mode for the whole process while
+    its body runs.
+
+    The switch is not scoped to the calling thread: setters in every thread
+    skip validation until the body exits. Blocks may overlap, e.g. in
+    concurrent tasks, and exit in any order. While several are active, the
+    most recently entered applies, and the previous mode is restored only once
+    all of them have exited. As with set_trusted, entering it from a thread
+    other than the main thread emits a RuntimeWarning.
+
+    Parameters:
+
+        transforms (bool): If True, continue to apply transforms such as type
+            conversions while in trusted mode.
+    """
+    # Called via the generator and contextlib's __enter__
+    _warn_off_main_thread(stacklevel=3)
+    entry = object()
+    _active.append((entry, "transform" if transforms else "store"))
+    _update_mode()
+    try:
+        yield
+    finally:
+        for idx, (active_entry, _) in enumerate(_active):
+            if active_entry is entry:
+                del _active[idx]
+                break
+        _update_mode()
@@ -0,0 +1,147 @@
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+
+@pytest.fixture
+def test_class():
+    class MyClass:
+        positive = pt.positive()
+        percent = pt.int_in_range((0, 100), inclusive=(True, False))
+        outside = pt.float_not_in_range((-1, 1))
+        colour = pt.in_set({"red", "green", "blue"})
+        plain = pt.property_factory()
+        odd = pt.property_factory(
+            condition=lambda x: x % 2 == 1,
+            transform=lambda x: x * 10,
+        )
+        bands = pt.in_intervals([(0, 1), (2, 3), (5, 10)], [True, (False, True), False])
+        combined = pt.in_range((0, 4)) & ~pt.in_range((1, 2)) | pt.less_than(-0.5)
+
+    return MyClass
+
+
+def check_against_setter(cls, name, values, result):
+    """Compare a BatchResult with assigning each value individually."""
+    obj = cls()
+    for value, transformed, valid in zip(values, result.values, result.valid):
+        try:
+            setattr(obj, name, value)
+        except ValueError:
+            assert not valid
+        else:
+            assert valid
+            assert getattr(obj, name) == transformed
+
+
+def test_metadata(test_class):
+    assert test_class.positive.metadata == {
+        "kind": "greater_than",
+        "x": 0,
+        "inclusive": True,
+        "type": None,
+    }
+    assert test_class.percent.metadata == {
+        "kind": "in_range",
+        "bounds": (0, 100),
+        "inclusive": (True, False),
+        "type": int,
+    }
+    assert test_class.outside.metadata["kind"] == "not_in_range"
+    assert test_class.outside.metadata["type"] is float
+    assert test_class.colour.metadata["kind"] == "in_set"
+    assert test_class.plain.metadata == {"kind": None, "type": None}
+    assert test_class.odd.metadata == {"kind": None, "type": None}
+    assert test_class.odd.constraint is None
+    assert test_class.percent.type_constraint is int
+
+
+@pytest.mark.parametrize(
+    "name,values",
+    [
+        ("positive", [1, -1, 0, 0.5, 1e10]),
+        ("positive", np.array([1.0, -1.0, np.nan, np.inf])),
+        ("percent", [0, 5, 5.7, 99.9, 100, -1, np.nan, np.inf]),
+        ("percent", np.arange(-50, 150)),
+        ("outside", [-2, -1, 0, 1, 2, np.nan]),
+        ("colour", ["red", "green", "purple", ""]),
+        ("plain", [1, "a", None]),
+        ("odd", [1, 2, 3, 4]),
+        ("combined", [-1, 0, 1, 2, 3, 4, 5, np.nan]),
+        ("bands", [-1, 0, 0.5, 1, 1.5, 2, 2.5, 3, 5, 10, 11, np.nan]),
+    ],
+)
+def test_matches_setter(test_class, name, values):
+    result = pt.numpy.validate_batch(getattr(test_class, name), values)
+    assert len(result.values) == len(result.valid) == len(values)
+    check_against_setter(test_class, name, values, result)
+
+
+def test_invalid_indices(test_class):
+    result = pt.numpy.validate_batch(test_class.percent, [50, -1, 20, 100])
+    np.testing.assert_array_equal(result.invalid_indices, [1, 3])
+    np.testing.assert_array_equal(result.valid_values, [50, 20])
+    assert result.values.dtype == np.int_
+
+
+def test_mixed_types(test_class):
+    # Strings must not be compared with numbers, and numbers must not be
+    # converted to strings
+    values = [1, "2", None, 3.5]
+    result = pt.numpy.validate_batch(test_class.positive, values)
+    np.testing.assert_array_equal(result.valid, [True, False, False, True])
+    result = pt.numpy.validate_batch(test_class.colour, ["red", 1, "blue"])
+    np.testing.assert_array_equal(result.valid, [True, False, True])
+
+
+def test_set_of_mixed_types():
+    class MyClass:
+        s = pt.in_set({1, "a"})
+
+    values = [1, 2]
+    result = pt.numpy.validate_batch(MyClass.s, values)
+    np.testing.assert_array_equal(result.valid, [True, False])
+    check_against_setter(MyClass, "s", values, result)
+
+
+def test_large_uint64():
+    class MyClass:
+        x = pt.integer()
+
+    values = np.array([2**64 - 1, 1], dtype=np.uint64)
+    result = pt.numpy.validate_batch(MyClass.x, values)
+    assert list(result.values) == [2**64 - 1, 1]
+    np.testing.assert_array_equal(result.valid, [True, True])
+
+
+def test_float_too_large_for_int64():
+    class MyClass:
+        x = pt.integer()
+
+    result = pt.numpy.validate_batch(MyClass.x, [1e300, 2.0])
+    np.testing.assert_array_equal(result.valid, [True, True])
+    assert list(result.values) == [int(1e300), 2]
+
+
+def test_lambda_fallback(test_class):
+    result = pt.numpy.validate_batch(test_class.odd, [1, 2, 3, "a"])
+    np.testing.assert_array_equal(result.valid, [True, False, True, False])
+    assert list(result.valid_values) == [10, 30]
+
+
+def test_arrays_as_values():
+    class MyClass:
+        x = pt.numpy.numpy_array(shape=(2,))
+
+    result = pt.numpy.validate_batch(MyClass.x, [[1, 2], [1, 2, 3], [3, 4]])
+    np.testing.assert_array_equal(result.valid, [True, False, True])
+    np.testing.assert_array_equal(result.valid_values[1], [3, 4])
+
+
+def test_backend(test_class):
+    class MyClass:
+        code = pt.in_set(pt.numpy.SortedArraySet(["a", "c", "e"]))
+
+    result = pt.numpy.validate_batch(MyClass.code, ["a", "b", "e", "z"])
+    np.testing.assert_array_equal(result.valid, [True, False, True, False])
@@ -0,0 +1,197 @@
+import proper_tea as pt
+import pytest
+import tracemalloc
+
+
+def make_item_class():
+    class Item:
+        weight = pt.positive()
+        price = pt.positive_int()
+        format = pt.in_set({"jpeg", "png"})
+
+        def __init__(self, weight, price, format):
+            self.weight = weight
+            self.price = price
+            self.format = format
+
+    return Item
+
+
+@pytest.fixture
+def slotted_class():
+    @pt.slotted
+    class SlottedItem:
+        __slots__ = ("comment",)
+
+        weight = pt.positive()
+        price = pt.positive_int()
+        format = pt.in_set({"jpeg", "png"})
+
+        def __init__(self, weight, price, format):
+            self.weight = weight
+            self.price = price
+            self.format = format
+            self.comment = "hello"
+
+        def describe(self):
+            return super().__repr__()
+
+    return SlottedItem
+
+
+def test_slotted_assignment(slotted_class):
+    item = slotted_class(2.5, 3.0, "png")
+    assert not hasattr(item, "__dict__")
+    assert slotted_class.__slots__ == ("comment", "weight", "price", "format")
+    assert isinstance(slotted_class.weight, pt.SlottedProperTeaDescriptor)
+    assert item.weight == 2.5
+    assert item.price == 3
+    assert isinstance(item.price, int)
+    assert item.format == "png"
+    assert item.comment == "hello"
+    # Validation should still take place
+    with pytest.raises(ValueError) as excinfo:
+        item.weight = -1.0
+    assert "weight" in str(excinfo.value)
+    assert item.weight == 2.5
+    with pytest.raises(ValueError):
+        item.format = "gif"
+    # Unset slots should raise AttributeError
+    empty = slotted_class.__new__(slotted_class)
+    with pytest.raises(AttributeError):
+        empty.weight
+    # Zero-argument super() should refer to the rebuilt class
+    assert item.describe()
+
+
+def test_slotted_memory(slotted_class):
+    def measure(cls, n=1000):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        items = [cls(2.5, 3, "png") for _ in range(n)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del items
+        return (after - before) / n
+
+    unslotted_size = measure(make_item_class())
+    slotted_size = measure(slotted_class)
+    # The slotted class also stores an extra 'comment' slot, but should
+    # still save the cost of the per-instance __dict__
+    assert (
+        slotted_size < unslotted_size
+    ), f"Bytes per instance: {unslotted_size} -> {slotted_size}"
+
+
+@pytest.fixture
+def model_class():
+    @pt.model
+    class Item:
+        weight = pt.positive()
+        price = pt.positive_int()
+        temperature = pt.float_greater_than(-273.15)
+        rating = pt.int_in_range((1, 10))
+        format = pt.in_set({"jpeg", "png"})
+
+    return Item
+
+
+def test_model_init(model_class):
+    item = model_class(2.5, 300.0, 20, rating=5, format="png")
+    assert vars(item) == {
+        "weight": 2.5,
+        "price": 300,
+        "temperature": 20.0,
+        "rating": 5,
+        "format": "png",
+    }
+    assert isinstance(item.price, int)
+    assert isinstance(item.temperature, float)
+    assert list(pt.fields(model_class)) == list(vars(item))
+    # Errors should name the failing property
+    with pytest.raises(ValueError) as excinfo:
+        model_class(2.5, 300, -300.0, 5, "png")
+    assert "temperature" in str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        model_class(2.5, "hello world", 20, 5, "png")
+    assert "price" in str(excinfo.value)
+    with pytest.raises(TypeError):
+        model_class(2.5, 300, 20)
+    # Setters should still work after initialisation
+    with pytest.raises(ValueError) as excinfo:
+        item.format = "gif"
+    assert "format" in str(excinfo.value)
+
+
+def test_model_inheritance(model_class):
+    @pt.model
+    class SubItem(model_class):
+        stock = pt.integer()
+
+    item = SubItem(2.5, 300, 20, 5, "png", stock=4.0)
+    assert list(vars(item)) == [*pt.fields(model_class), "stock"]
+    assert isinstance(item.stock, int)
+
+
+def test_late_attached_field():
+    class Item:
+        pass
+
+    # __set_name__ is not called for properties attached after class creation
+    Item.weight = pt.positive()
+    assert list(pt.fields(Item)) == ["weight"]
+    assert Item.weight.name == "weight"
+    Model = pt.model(Item)
+    item = Model(3)
+    assert vars(item) == {"weight": 3}
+    assert item.weight == 3
+    with pytest.raises(pt.ConditionError) as excinfo:
+        Model(-1)
+    assert excinfo.value.field == "weight"
+    assert pt.schema(Item)({"weight": 2}) == {"weight": 2}
+    with pytest.raises(pt.ConditionError) as excinfo:
+        pt.schema(Item)({"weight": -2})
+    assert "'weight'" in str(excinfo.value)
+
+
+def test_late_attached_check():
+    class Item:
+        pass
+
+    Item.weight = pt.positive()
+    result = pt.check(Item, "weight", -1)
+    assert not result.valid
+    assert result.error.field == "weight"
+
+
+def test_model_rejects_explicit_init():
+    with pytest.raises(TypeError):
+
+        @pt.model
+        class MyClass:
+            x = pt.integer()
+
+            def __init__(self, x):
+                self.x = x
+
+
+@pytest.mark.parametrize("order", ["model_first", "slotted_first"])
+def test_model_slotted(order):
+    class Item:
+        __slots__ = ()
+        weight = pt.positive()
+        price = pt.positive_int()
+
+    if order == "model_first":
+        Item = pt.slotted(pt.model(Item))
+    else:
+        Item = pt.model(pt.slotted(Item))
+
+    item = Item(2.5, 300.0)
+    assert list(pt.fields(Item)) == ["weight", "price"]
+    assert not hasattr(item, "__dict__")
+    assert item.weight == 2.5
+    assert item.price == 300
+    with pytest.raises(ValueError) as excinfo:
+        Item(-2.5, 300)
+    assert "weight" in str(excinfo.value)
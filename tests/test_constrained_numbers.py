@@ -794,3 +794,84 @@ class TestRanged:
         # Ensure it won't allow non-numbers
         with pytest.raises(ValueError) as excinfo:
             ranged_test.int_not_in_range = "hello world"
+
+
+def test_cached_property():
+    class MyClass:
+        pos_int = pt.positive_int(cache=True)
+        ranged = pt.float_in_range((0, 10), cache=16)
+
+    test_class = MyClass()
+    for _ in range(3):
+        test_class.pos_int = 10.0
+        test_class.ranged = 5
+    assert test_class.pos_int == 10
+    assert isinstance(test_class.ranged, float)
+    assert MyClass.pos_int.cache_info().hits == 2
+    assert MyClass.ranged.cache_info().maxsize == 16
+    with pytest.raises(ValueError) as excinfo:
+        test_class.ranged = 11
+    assert "range" in str(excinfo.value)
+    assert test_class.ranged == 5
+
+
+class TestInIntervals:
+    def test_in_intervals(self):
+        class MyClass:
+            bands = pt.in_intervals([(10, 20), (0, 5), (18, 25), (25, 30)])
+            exclusive = pt.in_intervals([(0, 5), (5, 10)], inclusive=False)
+            mixed = pt.in_intervals(
+                [(0, 5), (5, 10)], inclusive=[(True, False), (False, True)]
+            )
+            ints = pt.in_intervals([(0, 5)], type_constraint=int)
+
+        # Overlapping and adjacent intervals are merged
+        assert MyClass.bands.condition.intervals == (
+            (0, 5, True, True),
+            (10, 30, True, True),
+        )
+        test_class = MyClass()
+        for value in [0, 2.5, 5, 10, 19, 25, 30]:
+            test_class.bands = value
+            assert test_class.bands == value
+        for value in [-1, 5.5, 9.9, 30.1, float("nan")]:
+            with pytest.raises(ValueError) as excinfo:
+                test_class.bands = value
+            assert "[0,5], [10,30]" in str(excinfo.value)
+        with pytest.raises(ValueError):
+            test_class.bands = "hello world"
+
+        test_class.exclusive = 7
+        for value in [0, 5, 10]:
+            with pytest.raises(ValueError):
+                test_class.exclusive = value
+
+        assert MyClass.mixed.condition.intervals == (
+            (0, 5, True, False),
+            (5, 10, False, True),
+        )
+        test_class.mixed = 10
+        with pytest.raises(ValueError):
+            test_class.mixed = 5
+
+        test_class.ints = 2.5
+        assert test_class.ints == 2
+
+    def test_in_intervals_many(self):
+        bands = [(i, i + 0.5) for i in range(1000)]
+        bands_property = pt.in_intervals(bands, inclusive=(True, False))
+        condition = bands_property.condition
+        assert len(condition.intervals) == 1000
+        assert condition(999.25)
+        assert condition(0)
+        assert not condition(999.5)
+        assert not condition(500.75)
+        assert "(1000 ranges in total)" in bands_property.condition_err_msg
+
+    def test_in_intervals_errors(self):
+        with pytest.raises(ValueError):
+            pt.in_intervals([])
+        with pytest.raises(ValueError):
+            pt.in_intervals([(5, 0)])
+        with pytest.raises(ValueError):
+            pt.in_intervals([(0, 1), (2, 3)], inclusive=[True, False, True])
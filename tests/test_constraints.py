@@ -0,0 +1,212 @@
+import proper_tea as pt
+from proper_tea._codegen import Namespace
+from proper_tea.constraints import (
+    GreaterThan,
+    LessThan,
+    InRange,
+    NotInRange,
+    InSet,
+    InIntervals,
+    And,
+    Or,
+    Not,
+)
+import pickle
+import pytest
+
+
+@pytest.mark.parametrize(
+    "constraint, passes, fails",
+    [
+        (GreaterThan(5), [6, 5.5], [5, 4]),
+        (GreaterThan(5, inclusive=True), [5, 6], [4.9]),
+        (LessThan(5), [4, 4.5], [5, 6]),
+        (LessThan(5, inclusive=True), [5, 4], [5.1]),
+        (InRange((0, 10)), [0, 5, 10], [-1, 11]),
+        (InRange((0, 10), (False, True)), [10, 0.1], [0, 11]),
+        (NotInRange((0, 10)), [-1, 11], [0, 5, 10]),
+        (NotInRange((0, 10), (True, False)), [-1, 0, 11], [5, 10]),
+    ],
+)
+def test_constraint_call(constraint, passes, fails):
+    for value in passes:
+        assert constraint(value)
+    for value in fails:
+        assert not constraint(value)
+
+
+def test_constraint_pickle():
+    constraint = InRange((0, 10), (False, True))
+    assert constraint(5)
+    restored = pickle.loads(pickle.dumps(constraint))
+    assert "_check" not in vars(restored)
+    assert restored.metadata == constraint.metadata
+    assert restored(10) and not restored(0)
+
+
+def test_constraint_inlined_into_setter():
+    class MyClass:
+        a = pt.greater_than(0)
+        b = pt.greater_than(5)
+        c = pt.int_in_range((0, 10))
+
+    # Properties with the same structure should share generated code, while
+    # their bounds are bound separately
+    setter_a = type(MyClass.a).__set__
+    setter_b = type(MyClass.b).__set__
+    setter_c = type(MyClass.c).__set__
+    assert setter_a.__code__ is setter_b.__code__
+    assert setter_a.__code__ is not setter_c.__code__
+    # Comparisons are inlined, so the condition is not referenced
+    free_vars = setter_a.__code__.co_freevars
+    assert not any(name.startswith("_pt_condition") for name in free_vars)
+
+    my_class = MyClass()
+    my_class.a = 1
+    my_class.b = 6
+    with pytest.raises(ValueError) as excinfo:
+        my_class.b = 1
+    assert "greater than 5" in str(excinfo.value)
+    assert my_class.b == 6
+    # Descriptors should be unaffected by one another
+    assert isinstance(MyClass.a, pt.ProperTeaDescriptor)
+    assert type(MyClass.a) is not type(MyClass.b)
+
+
+@pytest.mark.parametrize(
+    "combined, expected",
+    [
+        (InRange((0, 10)) & GreaterThan(5), InRange((5, 10), (False, True))),
+        (
+            InRange((0, 10)) & GreaterThan(5, True) & LessThan(8),
+            InRange((5, 8), (True, False)),
+        ),
+        (GreaterThan(0) & GreaterThan(5), GreaterThan(5)),
+        (LessThan(5, True) & LessThan(5), LessThan(5)),
+        (GreaterThan(0) | GreaterThan(5), GreaterThan(0)),
+        (
+            InRange((0, 5)) | InRange((5, 10), (False, True)),
+            InRange((0, 10)),
+        ),
+        (InRange((0, 5)) | GreaterThan(3), GreaterThan(0, True)),
+    ],
+)
+def test_simplify_ranges(combined, expected):
+    assert type(combined) is type(expected)
+    assert combined.metadata == expected.metadata
+
+
+def test_no_simplification():
+    # Disjoint ranges
+    assert isinstance(GreaterThan(5) & LessThan(5), And)
+    assert isinstance(
+        InRange((0, 5), (True, False)) | InRange((5, 10), (False, True)), Or
+    )
+    # Would accept everything but NaN
+    assert isinstance(GreaterThan(0) | LessThan(5), Or)
+    # Negation is not rewritten as a comparison, as NaN fails all comparisons
+    assert isinstance(~GreaterThan(0), Not)
+    assert (~GreaterThan(0))(float("nan"))
+    constraint = GreaterThan(0)
+    assert ~~constraint is constraint
+
+
+def test_many_ranges():
+    combined = InRange((0, 1))
+    for i in range(1, 20):
+        combined = combined | InRange((2 * i, 2 * i + 1))
+    assert isinstance(combined, InIntervals)
+    assert len(combined.intervals) == 20
+    assert combined(38.5) and not combined(37.5)
+    # Adjacent ranges are merged
+    combined = combined | InRange((1, 2))
+    assert len(combined.intervals) == 19
+
+
+def test_filter_set():
+    combined = GreaterThan(0) & NotInRange((10, 20)) & InSet({1, 15, 25, -3, "a"})
+    assert isinstance(combined, InSet)
+    assert combined.members == {1, 25}
+    assert (InSet({1, 2, 3}) & InSet({2, 3, 4}) & LessThan(3)).members == {2}
+
+
+@pytest.mark.parametrize(
+    "combined, reference",
+    [
+        (
+            InRange((0, 10)) & ~InRange((2, 4)) | InSet({3}),
+            lambda x: (0 <= x <= 10 and not 2 <= x <= 4) or x == 3,
+        ),
+        (
+            (GreaterThan(0) | LessThan(-10)) & NotInRange((5, 6)),
+            lambda x: (x > 0 or x < -10) and (x < 5 or x > 6),
+        ),
+        (
+            ~(GreaterThan(1) & LessThan(2)),
+            lambda x: not (1 < x < 2),
+        ),
+        # Empty ranges must not widen those they are merged with
+        (
+            InRange((0, 0), (True, False)) | InRange((0, 1), (False, False)),
+            lambda x: 0 < x < 1,
+        ),
+        (
+            InRange((0, -5)) | InRange((0, 2), (False, False)),
+            lambda x: 0 < x < 2,
+        ),
+        (
+            InRange((5, 5), (False, False))
+            | InRange((5, 6), (False, True))
+            | LessThan(-10),
+            lambda x: 5 < x <= 6 or x < -10,
+        ),
+        (
+            InRange((0, 0), (True, False)) | InRange((3, 1)),
+            lambda x: False,
+        ),
+    ],
+)
+def test_combined_matches_reference(combined, reference):
+    namespace = Namespace()
+    assert "lambda" not in combined.expression("x", namespace)
+    for value in [-20, -10, -5, 0, 1, 1.5, 2, 3, 4, 5, 5.5, 6, 8, 10, 11]:
+        assert combined(value) == reference(value)
+    assert combined(float("nan")) == reference(float("nan"))
+
+
+def test_combine_properties():
+    class MyClass:
+        x = pt.positive_int() & pt.not_in_range((10, 20)) & pt.in_set({1, 15, 25})
+        y = pt.in_range((0, 10)) & pt.greater_than(5)
+        z = ~pt.in_range((0, 1)) | pt.in_set({0.5})
+        w = pt.floating_point() & pt.positive()
+
+    assert MyClass.x.condition.members == {1, 25}
+    assert MyClass.x.transform is int
+    assert MyClass.y.metadata["bounds"] == (5, 10)
+    assert MyClass.w.transform is float
+
+    obj = MyClass()
+    obj.x = 25.0
+    assert obj.x == 25
+    obj.z = 0.5
+    obj.z = 3
+    obj.w = 2
+    assert obj.w == 2.0
+    with pytest.raises(ValueError) as excinfo:
+        obj.x = 15
+    assert "Must be outside range (10,20)" in str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        obj.z = 0.7
+    assert "One of the following must hold" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        obj.y = 5
+
+
+def test_combine_properties_errors():
+    with pytest.raises(ValueError):
+        pt.integer() & pt.floating_point()
+    with pytest.raises(TypeError):
+        pt.positive() & pt.property_factory(condition=lambda x: True)
+    with pytest.raises(TypeError):
+        ~pt.integer()
@@ -1,5 +1,7 @@
 import proper_tea as pt
 import pytest
+import sys
+import tracemalloc
 
 
 @pytest.fixture
@@ -57,3 +59,84 @@ def test_in_set(in_set_test_class):
     for fail_case in strings_fail_cases:
         with pytest.raises(ValueError) as excinfo:
             in_set_test_class.strings = fail_case
+
+
+def test_in_set_large():
+    codes = [f"P{i:06d}" for i in range(100000)]
+
+    class MyClass:
+        code = pt.in_set(codes)
+
+    test_class = MyClass()
+    for code in codes[::997]:
+        test_class.code = code
+        assert test_class.code == code
+    for fail_case in ["P100000", "p000001", 1, None]:
+        with pytest.raises(ValueError):
+            test_class.code = fail_case
+    # The set should be frozen when the property is created
+    codes.append("P100000")
+    with pytest.raises(ValueError):
+        test_class.code = "P100000"
+
+
+def test_in_set_unhashable():
+    class MyClass:
+        mixed = pt.in_set(["A", [1, 2], {"key": "value"}])
+
+    test_class = MyClass()
+    test_class.mixed = "A"
+    assert test_class.mixed == "A"
+    test_class.mixed = [1, 2]
+    assert test_class.mixed == [1, 2]
+    test_class.mixed = {"key": "value"}
+    assert test_class.mixed == {"key": "value"}
+    for fail_case in ["B", [1, 2, 3], {"key": "other"}, None]:
+        with pytest.raises(ValueError) as excinfo:
+            test_class.mixed = fail_case
+        assert "Must be one of" in str(excinfo.value)
+
+
+def test_in_set_encode():
+    class MyClass:
+        encoded = pt.in_set({"jpeg", "png", 1}, encode=True)
+
+    def parse(text):
+        # Build a new string object equal to 'text', as parsing a file would
+        return "".join(list(text))
+
+    test_class = MyClass()
+    other = MyClass()
+    test_class.encoded = parse("png")
+    other.encoded = parse("png")
+    assert test_class.encoded == "png"
+    assert test_class.encoded is other.encoded
+    # The canonical member is stored, rather than the assigned value
+    test_class.encoded = 1.0
+    assert isinstance(test_class.encoded, int)
+    with pytest.raises(ValueError) as excinfo:
+        test_class.encoded = "gif"
+    assert "Must be one of" in str(excinfo.value)
+    with pytest.raises(TypeError):
+        pt.in_set(["A", ["B"]], encode=True)
+
+
+def test_in_set_encode_memory():
+    def measure(encode, n=10000):
+        class MyClass:
+            format = pt.in_set({"jpeg", "png"}, encode=encode)
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        items = []
+        for _ in range(n):
+            item = MyClass()
+            item.format = "".join(["pn", "g"])
+            items.append(item)
+        per_instance = (tracemalloc.get_traced_memory()[0] - before) / n
+        tracemalloc.stop()
+        return per_instance
+
+    # Without encoding, each instance keeps its own copy of the string
+    saving = measure(encode=False) - measure(encode=True)
+    assert saving > sys.getsizeof("png") / 2
@@ -0,0 +1,173 @@
+import pickle
+
+import pytest
+import proper_tea as pt
+
+
+def must_be_upper(value):
+    if not value.isupper():
+        raise ValueError("not upper case")
+    return True
+
+
+class Item:
+    weight = pt.positive()
+    price = pt.positive_int()
+    code = pt.property_factory(
+        condition=must_be_upper,
+        transform=str.lower,
+        condition_err_msg="Must be upper case",
+    )
+    size = pt.property_factory(transform=int, transform_err_msg="Must be a number")
+
+
+@pt.slotted
+class SlottedItem:
+    weight = pt.positive()
+
+
+def raised(obj, name, value):
+    with pytest.raises(pt.ProperTeaValidationError) as info:
+        setattr(obj, name, value)
+    return info.value
+
+
+class TestErrors:
+    def test_condition_failed(self):
+        err = raised(Item(), "weight", -1.0)
+        assert isinstance(err, pt.ConditionError)
+        assert isinstance(err, ValueError)
+        assert not err.raised
+        assert err.field == "weight"
+        assert err.value == -1.0
+        assert err.owner is Item
+        assert err.descriptor is Item.weight
+        assert err.constraint is Item.weight.condition
+        assert str(err) == (
+            "Setter condition for property 'weight' in class Item returned "
+            "False.\nMust be greater than or equal to 0"
+        )
+
+    def test_condition_raised(self):
+        err = raised(Item(), "code", "abc")
+        assert isinstance(err, pt.ConditionError)
+        assert err.raised
+        assert isinstance(err.__cause__, ValueError)
+        assert str(err) == (
+            "Setter condition for property 'code' in class Item raised "
+            "exception. See traceback for more info.\nMust be upper case"
+        )
+
+    def test_transform_raised(self):
+        err = raised(Item(), "size", "large")
+        assert isinstance(err, pt.TransformError)
+        assert err.constraint is int
+        assert isinstance(err.__cause__, ValueError)
+        assert str(err) == (
+            "Setter transform for property 'size' in class Item raised "
+            "exception. See traceback for more info.\nMust be a number"
+        )
+
+    def test_no_err_msg(self):
+        class NoMessage:
+            x = pt.property_factory(condition=lambda x: x > 0)
+
+        err = raised(NoMessage(), "x", 0)
+        assert str(err) == (
+            "Setter condition for property 'x' in class NoMessage returned False."
+        )
+
+    def test_subclass_owner(self):
+        class Derived(Item):
+            pass
+
+        err = raised(Derived(), "weight", -1.0)
+        assert err.owner is Derived
+        assert "in class Derived" in str(err)
+
+    def test_slotted(self):
+        err = raised(SlottedItem(), "weight", -1.0)
+        assert err.owner is SlottedItem
+        assert err.field == "weight"
+
+    def test_cached(self):
+        class Cached:
+            x = pt.positive(cache=True)
+
+        obj = Cached()
+        obj.x = 1.0
+        err = raised(obj, "x", -1.0)
+        assert err.owner is Cached
+
+    def test_model_init(self):
+        @pt.model
+        class Model:
+            weight = pt.positive()
+
+        with pytest.raises(pt.ConditionError) as info:
+            Model(weight=-1.0)
+        assert info.value.owner is Model
+
+    def test_repr(self):
+        err = raised(Item(), "weight", -1.0)
+        assert repr(err) == f"ConditionError({str(err)!r})"
+
+    def test_pickle(self):
+        for name, value in [("weight", -1.0), ("code", "abc"), ("size", "large")]:
+            err = raised(Item(), name, value)
+            copy = pickle.loads(pickle.dumps(err))
+            assert type(copy) is type(err)
+            assert copy.descriptor is err.descriptor
+            assert copy.owner is Item
+            assert copy.value == value
+            assert str(copy) == str(err)
+
+
+class TestCheck:
+    def test_valid(self):
+        obj = Item()
+        assert pt.check(obj, "price", 3.0) == (True, 3, None)
+        assert pt.check(obj, "code", "ABC") == (True, "abc", None)
+        # Nothing is assigned
+        assert "price" not in vars(obj)
+
+    def test_class(self):
+        assert pt.check(Item, "weight", 1.0).valid
+        assert pt.check(SlottedItem, "weight", 1.0).valid
+
+    @pytest.mark.parametrize(
+        "name, value, error",
+        [
+            ("weight", -1.0, pt.ConditionError),
+            ("code", "abc", pt.ConditionError),
+            ("size", "large", pt.TransformError),
+        ],
+    )
+    def test_invalid(self, name, value, error):
+        result = pt.check(Item(), name, value)
+        assert not result.valid
+        assert result.value == value
+        assert type(result.error) is error
+        assert result.error.owner is Item
+        assert str(result.error) == str(raised(Item(), name, value))
+
+    def test_cause(self):
+        result = pt.check(Item, "code", "abc")
+        assert result.error.raised
+        assert isinstance(result.error.__cause__, ValueError)
+
+    def test_cached(self):
+        class Cached:
+            x = pt.positive_int(cache=True)
+
+        assert pt.check(Cached, "x", 2.0) == (True, 2, None)
+        assert pt.check(Cached, "x", 2.0) == (True, 2, None)
+        assert not pt.check(Cached, "x", -2.0).valid
+
+    def test_trusted(self):
+        with pt.trusted():
+            assert not pt.check(Item, "weight", -1.0).valid
+
+    def test_not_a_property(self):
+        with pytest.raises(AttributeError):
+            pt.check(Item, "colour", "red")
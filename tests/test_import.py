@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+import pytest
+import proper_tea as pt
+
+# Maximum cumulative time in milliseconds for 'import proper_tea', as reported
+# by 'python -X importtime' once bytecode has been cached
+IMPORT_BUDGET_MS = 15
+
+# Modules which are slow to import and should only be loaded on demand
+SLOW_MODULES = [
+    "numpy",
+    "typing",
+    "textwrap",
+    "importlib.metadata",
+    "concurrent.futures",
+    "proper_tea.constrained_numbers",
+    "proper_tea.discrete_sets",
+    "proper_tea.streaming",
+    "proper_tea.parallel",
+    "proper_tea.schemas",
+    "proper_tea.numpy",
+]
+
+
+def run_python(code, tmp_path, *options):
+    # Cache bytecode outside of the source tree, even if the environment
+    # disables writing it
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_ms(tmp_path):
+    stderr = run_python("import proper_tea", tmp_path, "-X", "importtime").stderr
+    for line in stderr.splitlines():
+        # Lines are formatted 'import time: self | cumulative | name'
+        _, cumulative, name = line.split("|")
+        if name.strip() == "proper_tea":
+            return int(cumulative) / 1000
+    raise AssertionError(f"proper_tea not found in:\n{stderr}")
+
+
+def test_import_time(tmp_path):
+    # The first import writes the bytecode cache
+    run_python("import proper_tea", tmp_path)
+    best = min(import_time_ms(tmp_path) for _ in range(5))
+    assert best < IMPORT_BUDGET_MS
+
+
+def test_slow_modules_not_imported(tmp_path):
+    code = (
+        "import sys, proper_tea\n"
+        f"print(*(m for m in {SLOW_MODULES!r} if m in sys.modules))"
+    )
+    assert run_python(code, tmp_path).stdout.split() == []
+
+
+def test_lazy_attributes():
+    assert pt.in_set is pt.discrete_sets.in_set
+    assert pt.positive is pt.constrained_numbers.positive
+    assert pt.parallel_validate is pt.parallel.parallel_validate
+    assert pt.stream is pt.streaming.stream
+    assert pt.schema is pt.schemas.schema
+    assert pt.numpy.numpy_array is not None
+    for name in pt.__all__:
+        assert hasattr(pt, name)
+    assert {"in_set", "positive", "numpy", "stream"} <= set(dir(pt))
+
+
+def test_missing_attribute():
+    with pytest.raises(AttributeError, match="no attribute 'not_a_name'"):
+        pt.not_a_name
+
+
+def test_version():
+    assert isinstance(pt.__version__, str)
+    assert pt.__version__
@@ -0,0 +1,124 @@
+import pytest
+import proper_tea as pt
+import proper_tea.numpy
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    yield
+    pt.set_instrumented(False)
+    pt.set_trusted(False)
+    pt.reset_stats()
+
+
+class Item:
+    weight = pt.positive()
+    price = pt.positive_int()
+    colour = pt.in_set({"red", "green"})
+
+
+def set_values(obj):
+    obj.weight = 1.0
+    obj.weight = 2.0
+    obj.price = 3.0
+    for name, value in [("weight", -1), ("price", "a"), ("price", -2)]:
+        with pytest.raises(ValueError):
+            setattr(obj, name, value)
+
+
+def test_disabled_is_uninstrumented():
+    setter = type(Item.weight).__set__
+    with pt.instrumented():
+        assert pt.is_instrumented()
+        assert type(Item.weight).__set__.__code__ is not setter.__code__
+    assert not pt.is_instrumented()
+    # Exactly the same generated code as before
+    assert type(Item.weight).__set__.__code__ is setter.__code__
+    set_values(Item())
+    assert Item.weight.stats.sets == 0
+    assert pt.stats() == {}
+
+
+def test_counters():
+    with pt.instrumented():
+        set_values(Item())
+    assert Item.weight.stats.sets == 3
+    assert Item.weight.stats.condition_failures == 1
+    assert Item.weight.stats.transform_failures == 0
+    assert Item.weight.stats.time > 0
+    # 'a' raises in the condition, as it cannot be compared with 0
+    assert Item.price.stats.sets == 3
+    assert Item.price.stats.condition_failures == 2
+    assert Item.colour.stats.sets == 0
+
+
+def test_transform_failure():
+    class MyClass:
+        x = pt.property_factory(transform=int)
+
+    with pt.instrumented():
+        obj = MyClass()
+        obj.x = "1"
+        with pytest.raises(ValueError):
+            obj.x = "a"
+    assert MyClass.x.stats.transform_failures == 1
+    assert MyClass.x.stats.condition_failures == 0
+
+
+def test_report():
+    with pt.instrumented():
+        set_values(Item())
+    report = pt.stats()
+    owner = f"{__name__}.Item"
+    assert list(report) == [owner]
+    assert set(report[owner]) == {"weight", "price"}
+    assert report[owner]["weight"]["sets"] == 3
+    assert set(report[owner]["weight"]) == {
+        "sets",
+        "condition_failures",
+        "transform_failures",
+        "time",
+    }
+    pt.reset_stats()
+    assert pt.stats() == {}
+
+
+def test_model_and_slotted():
+    @pt.model
+    class Model:
+        x = pt.positive()
+
+    @pt.slotted
+    class Slotted:
+        __slots__ = ()
+        x = pt.positive()
+
+    with pt.instrumented():
+        Model(1)
+        with pytest.raises(ValueError):
+            Model(-1)
+        Slotted().x = 1
+    assert Model.x.stats.sets == 2
+    assert Model.x.stats.condition_failures == 1
+    assert Slotted.x.stats.sets == 1
+    report = pt.stats()
+    assert report[f"{__name__}.{Slotted.__qualname__}"]["x"]["sets"] == 1
+
+
+def test_trusted():
+    with pt.instrumented(), pt.trusted():
+        obj = Item()
+        obj.weight = -1
+        assert obj.weight == -1
+    assert Item.weight.stats.sets == 1
+    assert Item.weight.stats.condition_failures == 0
+
+
+def test_table():
+    table = pt.numpy.Table(Item, 3)
+    with pt.instrumented():
+        table[0].weight = 1.0
+        with pytest.raises(ValueError):
+            table[1].weight = -1
+    assert Item.weight.stats.sets == 2
+    assert Item.weight.stats.condition_failures == 1
@@ -0,0 +1,103 @@
+import pickle
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+
+@pytest.fixture
+def codes():
+    return [f"P{i:07d}" for i in range(0, 200000, 2)]
+
+
+@pytest.fixture
+def mapped_path(tmp_path, codes):
+    path = tmp_path / "codes.npy"
+    pt.numpy.MappedSortedSet.write(path, codes)
+    return path
+
+
+@pytest.fixture(params=["sorted", "mapped", "bloom"])
+def backend(request, codes, mapped_path):
+    if request.param == "sorted":
+        return pt.numpy.SortedArraySet(codes)
+    mapped = pt.numpy.MappedSortedSet(mapped_path)
+    if request.param == "mapped":
+        return mapped
+    return pt.numpy.BloomFilter(mapped)
+
+
+def test_backend_membership(backend, codes):
+    assert len(backend) == len(codes)
+    for code in codes[::101]:
+        assert code in backend
+    for code in ["P0000001", "P0199999", "P9999999", "", 5, None]:
+        assert code not in backend
+    # Sequences containing a member are not members themselves
+    for value in [[codes[0]], (codes[0],), np.array([[codes[1]]])]:
+        assert value not in backend
+
+
+def test_backend_in_set(backend, codes):
+    class MyClass:
+        code = pt.in_set(backend)
+
+    test_class = MyClass()
+    test_class.code = codes[0]
+    assert test_class.code == codes[0]
+    test_class.code = codes[-1]
+    assert test_class.code == codes[-1]
+    with pytest.raises(ValueError) as excinfo:
+        test_class.code = "P0000001"
+    assert f"{len(codes)} members" in str(excinfo.value)
+    assert test_class.code == codes[-1]
+    with pytest.raises(ValueError):
+        test_class.code = [codes[0]]
+    with pytest.raises(TypeError):
+        pt.in_set(backend, encode=True)
+
+
+def test_sorted_array_contains_many(codes, mapped_path):
+    for backend in [
+        pt.numpy.SortedArraySet(codes),
+        pt.numpy.MappedSortedSet(mapped_path),
+    ]:
+        mask = backend.contains_many(["P0000000", "P0000001", "P0199998", "Z"])
+        assert np.array_equal(mask, [True, False, True, False])
+
+
+def test_sorted_array_dtype():
+    backend = pt.numpy.SortedArraySet([3, 1, 2, 2], dtype=np.int32)
+    assert backend.keys.dtype == np.int32
+    assert np.array_equal(backend.keys, [1, 2, 3])
+    assert 2 in backend
+    assert 4 not in backend
+
+
+def test_mapped_set_is_memory_mapped(mapped_path):
+    backend = pt.numpy.MappedSortedSet(mapped_path)
+    assert isinstance(backend.keys, np.memmap)
+    # Pickling should store the path rather than the keys
+    data = pickle.dumps(backend)
+    assert len(data) < 1000
+    restored = pickle.loads(data)
+    assert "P0000000" in restored
+
+
+def test_bloom_filter_pickle(mapped_path):
+    bloom = pt.numpy.BloomFilter(pt.numpy.MappedSortedSet(mapped_path))
+    data = pickle.dumps(bloom)
+    assert len(data) < 1000
+    restored = pickle.loads(data)
+    assert restored.bits == bloom.bits
+    assert "P0000000" in restored and "P0000001" not in restored
+
+
+def test_bloom_filter_false_positive_rate(codes):
+    bloom = pt.numpy.BloomFilter(pt.numpy.SortedArraySet(codes), codes)
+    assert all(bloom.might_contain(code) for code in codes)
+    # Odd codes are not in the set
+    misses = [f"P{i:07d}" for i in range(1, 20001, 2)]
+    false_positives = sum(bloom.might_contain(code) for code in misses)
+    assert false_positives / len(misses) < 0.03
+    assert not any(code in bloom for code in misses)
@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 import proper_tea as pt
 import proper_tea.numpy
+from proper_tea.numpy import numpy_arrays
 
 
 @pytest.fixture
@@ -183,3 +184,534 @@ def test_sorted_numpy_array(numpy_array_test_class):
     test_class.sort_array = [2, 1]
     assert test_class.sort_array[0] == 1
     assert test_class.sort_array[1] == 2
+
+
+class TestCopyPolicy:
+    @pytest.fixture
+    def cls(self):
+        class MyClass:
+            never = pt.numpy.numpy_array(copy="never")
+            never_float = pt.numpy.numpy_array(dtype=float, copy="never")
+            if_needed = pt.numpy.numpy_array(dtype=float)
+            always = pt.numpy.numpy_array(copy="always")
+            always_sorted = pt.numpy.numpy_array(copy="always", sort=True)
+            sort = pt.numpy.numpy_array(sort=True)
+
+        return MyClass
+
+    def test_never(self, cls):
+        obj = cls()
+        x = np.linspace(0.0, 1.0, 11)
+        obj.never = x
+        assert obj.never is x
+        obj.never_float = x
+        assert obj.never_float is x
+        # Views are stored without copying
+        obj.never = x[::2]
+        assert np.shares_memory(obj.never, x)
+        assert cls.never.transform.copies == 0
+
+    @pytest.mark.parametrize(
+        "value", [[1.0, 2.0], np.arange(3, dtype=np.float32), np.arange(3)]
+    )
+    def test_never_raises(self, cls, value):
+        obj = cls()
+        with pytest.raises(pt.TransformError) as excinfo:
+            obj.never_float = value
+        assert "without copying" in str(excinfo.value)
+        assert "never_float" not in vars(obj)
+        assert cls.never_float.transform.copies == 0
+
+    def test_if_needed(self, cls):
+        obj = cls()
+        x = np.linspace(0.0, 1.0, 11)
+        obj.if_needed = x
+        assert obj.if_needed is x
+        obj.if_needed = x[::2]
+        assert np.shares_memory(obj.if_needed, x)
+        assert cls.if_needed.transform.copies == 0
+        obj.if_needed = x.astype(np.float32)
+        assert not np.shares_memory(obj.if_needed, x)
+        obj.if_needed = [1, 2, 3]
+        assert cls.if_needed.transform.copies == 2
+
+    def test_always(self, cls):
+        obj = cls()
+        x = np.linspace(1.0, 0.0, 11)
+        obj.always = x
+        assert obj.always is not x
+        assert not np.shares_memory(obj.always, x)
+        assert np.array_equal(obj.always, x)
+        obj.always_sorted = x
+        assert not np.shares_memory(obj.always_sorted, x)
+        assert np.array_equal(obj.always_sorted, x[::-1])
+        # The input is unchanged
+        assert x[0] == 1.0
+        assert cls.always.transform.copies == 1
+        assert cls.always_sorted.transform.copies == 1
+
+    def test_sort_counts_copies(self, cls):
+        obj = cls()
+        x = np.array([3, 1, 2])
+        obj.sort = x
+        assert not np.shares_memory(obj.sort, x)
+        assert list(x) == [3, 1, 2]
+        obj.sort = [3, 1, 2]
+        assert list(obj.sort) == [1, 2, 3]
+        assert cls.sort.transform.copies == 2
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError, match="copy must be one of"):
+            pt.numpy.numpy_array(copy="sometimes")
+        with pytest.raises(ValueError, match="Sorting requires a copy"):
+            pt.numpy.numpy_array(sort=True, copy="never")
+
+
+class TestSort:
+    @pytest.fixture
+    def cls(self):
+        class MyClass:
+            sort = pt.numpy.numpy_array(sort=True)
+            stable = pt.numpy.numpy_array(sort=True, kind="stable")
+            in_place = pt.numpy.numpy_array(sort=True, in_place=True, copy="never")
+
+        return MyClass
+
+    def test_sorted_input_unchanged(self, cls):
+        obj = cls()
+        x = np.arange(10.0)
+        obj.sort = x
+        assert obj.sort is x
+        obj.sort = x[::2]
+        assert np.shares_memory(obj.sort, x)
+        assert cls.sort.transform.copies == 0
+
+    def test_unsorted_input_copied(self, cls):
+        obj = cls()
+        x = np.array([2.0, 1.0, 3.0])
+        obj.sort = x
+        assert list(obj.sort) == [1.0, 2.0, 3.0]
+        assert not np.shares_memory(obj.sort, x)
+        assert list(x) == [2.0, 1.0, 3.0]
+        assert cls.sort.transform.copies == 1
+
+    def test_stable(self, cls):
+        obj = cls()
+        obj.stable = [3, 1, 2, 1]
+        assert list(obj.stable) == [1, 1, 2, 3]
+
+    def test_in_place(self, cls):
+        obj = cls()
+        x = np.array([2.0, 1.0, 3.0])
+        obj.in_place = x
+        assert obj.in_place is x
+        assert list(x) == [1.0, 2.0, 3.0]
+        assert cls.in_place.transform.copies == 0
+
+    def test_in_place_read_only(self, cls):
+        obj = cls()
+        x = np.array([2.0, 1.0, 3.0])
+        x.flags.writeable = False
+        with pytest.raises(pt.TransformError):
+            obj.in_place = x
+        assert list(x) == [2.0, 1.0, 3.0]
+
+    def test_2D(self, cls):
+        obj = cls()
+        x = np.array([[1, 2, 3], [4, 5, 6]])
+        obj.sort = x
+        assert obj.sort is x
+        obj.sort = x[::-1, ::-1]
+        assert obj.sort.tolist() == [[4, 5, 6], [1, 2, 3]]
+
+    @pytest.mark.parametrize("size", [0, 1, 2, 7, 8, 9, 33])
+    def test_is_sorted_chunks(self, monkeypatch, size):
+        from proper_tea.numpy import numpy_arrays
+
+        monkeypatch.setattr(numpy_arrays, "_SORTED_CHUNK", 4)
+        x = np.arange(size)
+        assert numpy_arrays._is_sorted(x)
+        for idx in range(1, size):
+            y = x.copy()
+            y[idx - 1], y[idx] = y[idx], y[idx - 1]
+            assert not numpy_arrays._is_sorted(y)
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError, match="kind must be one of"):
+            pt.numpy.numpy_array(sort=True, kind="bubble")
+        with pytest.raises(ValueError, match="only be used with sort=True"):
+            pt.numpy.numpy_array(kind="stable")
+        with pytest.raises(ValueError, match="only be used with sort=True"):
+            pt.numpy.numpy_array(in_place=True)
+
+
+class Mesh:
+    x = pt.numpy.numpy_array(shape="N")
+    y = pt.numpy.numpy_array(shape=("N",))
+    grid = pt.numpy.numpy_array(shape=("N", "M"))
+    weights = pt.numpy.numpy_array(shape=(None, 3))
+    square = pt.numpy.numpy_array(shape=("K", "K"))
+
+
+class TestSymbolicShapes:
+    def test_wildcard(self):
+        mesh = Mesh()
+        mesh.weights = np.zeros((5, 3))
+        mesh.weights = [[1, 2, 3]]
+        for value in [np.zeros((5, 2)), np.zeros(3), np.zeros((1, 1, 3))]:
+            with pytest.raises(pt.ConditionError):
+                mesh.weights = value
+
+    def test_numpy_integer_sizes(self):
+        class MyClass:
+            x = pt.numpy.numpy_array(shape=(np.int64(3),))
+            y = pt.numpy.numpy_array(shape=np.int64(3))
+            z = pt.numpy.mapped_array(shape=np.int64(3))
+
+        obj = MyClass()
+        obj.x = obj.y = obj.z = np.zeros(3)
+        for name in ["x", "y", "z"]:
+            with pytest.raises(ValueError):
+                setattr(obj, name, np.zeros(5))
+
+    def test_invalid_dimension(self):
+        with pytest.raises(TypeError):
+            pt.numpy.numpy_array(shape=(3.0,))
+        with pytest.raises(TypeError):
+            pt.numpy.mapped_array(shape=(None, [2]))
+
+    def test_shared_dimensions(self):
+        mesh = Mesh()
+        mesh.x = np.zeros(4)
+        mesh.y = np.ones(4)
+        mesh.grid = np.zeros((4, 7))
+        with pytest.raises(pt.ConditionError) as excinfo:
+            mesh.y = np.ones(5)
+        assert "named dimensions" in str(excinfo.value)
+        assert excinfo.value.field == "y"
+        with pytest.raises(pt.ConditionError):
+            mesh.grid = np.zeros((5, 7))
+        # M is not shared, so may change
+        mesh.grid = np.zeros((4, 2))
+        assert mesh.y.shape == (4,)
+
+    def test_unset_siblings_ignored(self):
+        mesh = Mesh()
+        mesh.grid = np.zeros((3, 2))
+        mesh.grid = np.zeros((4, 2))
+        mesh.x = np.zeros(4)
+        with pytest.raises(pt.ConditionError):
+            mesh.y = np.zeros(3)
+
+    def test_repeated_dimension(self):
+        mesh = Mesh()
+        mesh.square = np.eye(3)
+        with pytest.raises(pt.ConditionError):
+            mesh.square = np.zeros((3, 4))
+
+    def test_error_reports_input(self):
+        mesh = Mesh()
+        mesh.x = np.zeros(4)
+        value = [1.0, 2.0]
+        with pytest.raises(pt.ConditionError) as excinfo:
+            mesh.y = value
+        assert excinfo.value.value is value
+
+    def test_check(self):
+        mesh = Mesh()
+        mesh.x = np.zeros(4)
+        assert pt.check(mesh, "y", np.zeros(4)).valid
+        result = pt.check(mesh, "y", [1.0, 2.0])
+        assert not result.valid
+        assert result.value == [1.0, 2.0]
+        # Without an instance, only the rank and fixed sizes are checked
+        assert pt.check(Mesh, "y", [1.0, 2.0]).valid
+
+    def test_model(self):
+        @pt.model
+        class Points:
+            x = pt.numpy.numpy_array(shape="N")
+            y = pt.numpy.numpy_array(shape="N")
+
+        points = Points(np.zeros(3), [1, 2, 3])
+        assert points.y.shape == (3,)
+        with pytest.raises(pt.ConditionError) as excinfo:
+            Points(np.zeros(3), np.zeros(4))
+        assert excinfo.value.field == "y"
+        points.x = np.zeros(3)
+        with pytest.raises(pt.ConditionError):
+            points.x = np.zeros(4)
+
+    def test_slotted(self):
+        @pt.slotted
+        class Points:
+            x = pt.numpy.numpy_array(shape="N")
+            y = pt.numpy.numpy_array(shape="N")
+
+        points = Points()
+        points.y = np.zeros(2)
+        with pytest.raises(pt.ConditionError):
+            points.x = np.zeros(3)
+
+    def test_schema(self):
+        class Points:
+            x = pt.numpy.numpy_array(shape="N")
+            y = pt.numpy.numpy_array(shape="N")
+
+        validate = pt.schema(Points, as_tuple=True)
+        x, y = validate({"x": [1, 2], "y": [3, 4]})
+        assert isinstance(y, np.ndarray)
+        with pytest.raises(pt.ConditionError):
+            validate({"x": [1, 2], "y": [3, 4, 5]})
+
+    def test_subclass(self):
+        class Extended(Mesh):
+            z = pt.numpy.numpy_array(shape="N")
+
+        mesh = Extended()
+        mesh.x = np.zeros(2)
+        with pytest.raises(pt.ConditionError):
+            mesh.z = np.zeros(3)
+
+    def test_trusted(self):
+        mesh = Mesh()
+        mesh.x = np.zeros(4)
+        with pt.trusted():
+            mesh.y = np.zeros(5)
+
+    def test_pickle(self):
+        import pickle
+
+        prop = pt.numpy.numpy_array(shape=("N", "M"))
+        copy = pickle.loads(pickle.dumps(prop))
+        assert copy.instance_condition.shape == ("N", "M")
+        assert pickle.loads(pickle.dumps(Mesh.grid)) is Mesh.grid
+
+
+class TestMappedArray:
+    @pytest.fixture
+    def cls(self):
+        class Coefficients:
+            table = pt.numpy.mapped_array(shape=("N", 3), dtype=float)
+            index = pt.numpy.mapped_array(shape="N", dtype=np.int64)
+            raw = pt.numpy.mapped_array(dtype=np.int32)
+            raw_2D = pt.numpy.mapped_array(shape=(2, 3), dtype=np.int32)
+            writable = pt.numpy.mapped_array(mode="r+")
+            copy_on_write = pt.numpy.mapped_array(mode="c")
+
+        return Coefficients
+
+    @pytest.fixture
+    def npy(self, tmp_path):
+        path = tmp_path / "table.npy"
+        np.save(path, np.arange(12.0).reshape(4, 3))
+        return path
+
+    @pytest.fixture
+    def raw(self, tmp_path):
+        path = tmp_path / "raw.bin"
+        np.arange(6, dtype=np.int32).tofile(path)
+        return path
+
+    def test_npy_path(self, cls, npy):
+        obj = cls()
+        obj.table = npy
+        assert isinstance(obj.table, np.memmap)
+        assert np.array_equal(obj.table, np.arange(12.0).reshape(4, 3))
+        obj.table = str(npy)
+        assert isinstance(obj.table, np.memmap)
+        with pytest.raises(ValueError):
+            obj.table[0, 0] = 1.0
+
+    def test_open_file(self, cls, npy):
+        obj = cls()
+        with open(npy, "rb") as f:
+            obj.table = f
+        assert obj.table.shape == (4, 3)
+        assert obj.table[3, 2] == 11.0
+
+    def test_fortran_order(self, cls, tmp_path):
+        path = tmp_path / "fortran.npy"
+        data = np.asfortranarray(np.arange(6.0).reshape(2, 3))
+        np.save(path, data)
+        obj = cls()
+        obj.table = path
+        assert obj.table.flags.f_contiguous
+        assert np.array_equal(obj.table, data)
+
+    def test_header_mismatch(self, cls, npy, tmp_path):
+        obj = cls()
+        with pytest.raises(pt.TransformError) as excinfo:
+            obj.index = npy
+        assert "Datatype float64" in str(excinfo.value.__cause__)
+        path = tmp_path / "wrong_shape.npy"
+        np.save(path, np.zeros((4, 2)))
+        with pytest.raises(pt.TransformError) as excinfo:
+            obj.table = path
+        assert "Shape (4, 2)" in str(excinfo.value.__cause__)
+
+    def test_shared_dimensions(self, cls, npy):
+        obj = cls()
+        obj.table = npy
+        obj.index = np.arange(4)
+        with pytest.raises(pt.ConditionError):
+            obj.index = np.arange(5)
+
+    def test_array(self, cls):
+        obj = cls()
+        x = np.zeros((2, 3))
+        obj.table = x
+        assert obj.table is x
+        with pytest.raises(pt.TransformError):
+            obj.table = np.zeros((2, 3), dtype=np.float32)
+        with pytest.raises(pt.TransformError):
+            obj.table = [[1.0, 2.0, 3.0]]
+
+    def test_raw(self, cls, raw):
+        obj = cls()
+        obj.raw = raw
+        assert list(obj.raw) == [0, 1, 2, 3, 4, 5]
+        obj.raw_2D = raw
+        assert obj.raw_2D.tolist() == [[0, 1, 2], [3, 4, 5]]
+        with pytest.raises(pt.TransformError) as excinfo:
+            obj.table = raw
+        assert "fixed shape" in str(excinfo.value.__cause__)
+        with pytest.raises(pt.TransformError) as excinfo:
+            obj.writable = raw
+        assert "datatype is required" in str(excinfo.value.__cause__)
+
+    def test_modes(self, cls, npy):
+        obj = cls()
+        obj.copy_on_write = npy
+        obj.copy_on_write[0, 0] = 100.0
+        assert np.load(npy)[0, 0] == 0.0
+        obj.writable = npy
+        obj.writable[0, 0] = 100.0
+        obj.writable.flush()
+        assert np.load(npy)[0, 0] == 100.0
+
+    def test_copy_on_write_read_only_file(self, cls, npy, monkeypatch):
+        # Copy-on-write maps must not need write access to the file. Permission
+        # bits do not apply to root, so check the mode the file is opened with.
+        opened = []
+
+        def spy_open(file, mode="r", *args, **kwargs):
+            opened.append(mode)
+            return open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr(numpy_arrays, "open", spy_open, raising=False)
+        npy.chmod(0o444)
+        obj = cls()
+        obj.copy_on_write = npy
+        obj.copy_on_write[0, 0] = 100.0
+        obj.table = npy
+        obj.writable = npy
+        assert opened == ["rb", "rb", "r+b"]
+        assert np.load(npy)[0, 0] == 0.0
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match="mode must be one of"):
+            pt.numpy.mapped_array(mode="w+")
+
+    def test_object_arrays(self, cls, tmp_path):
+        path = tmp_path / "objects.npy"
+        np.save(path, np.array([1, "a"], dtype=object))
+        with pytest.raises(pt.TransformError) as excinfo:
+            cls().writable = path
+        assert "objects" in str(excinfo.value.__cause__)
+
+
+def misaligned(n):
+    # Float64 data starting one byte into a buffer
+    buffer = np.zeros(n * 8 + 1, dtype=np.uint8)
+    x = buffer[1:].view(np.float64)
+    assert not x.flags.aligned
+    return x
+
+
+class TestMemoryLayout:
+    @pytest.fixture
+    def cls(self):
+        class MyClass:
+            c_order = pt.numpy.numpy_array(order="C")
+            f_order = pt.numpy.numpy_array(order="F")
+            f_order_never = pt.numpy.numpy_array(order="F", copy="never")
+            aligned = pt.numpy.numpy_array(aligned=True)
+            writeable = pt.numpy.numpy_array(writeable=True)
+            frozen = pt.numpy.numpy_array(writeable=False)
+            frozen_float = pt.numpy.numpy_array(dtype=float, writeable=False)
+
+        return MyClass
+
+    def test_order(self, cls):
+        obj = cls()
+        x = np.zeros((3, 4))
+        obj.c_order = x
+        assert obj.c_order is x
+        obj.f_order = x
+        assert obj.f_order.flags.f_contiguous
+        assert not np.shares_memory(obj.f_order, x)
+        obj.f_order = x.T
+        assert np.shares_memory(obj.f_order, x)
+        obj.c_order = x[:, ::2]
+        assert obj.c_order.flags.c_contiguous
+        obj.f_order = [[1, 2], [3, 4]]
+        assert obj.f_order.flags.f_contiguous
+        assert cls.c_order.transform.copies == 1
+        assert cls.f_order.transform.copies == 2
+
+    def test_order_never(self, cls):
+        obj = cls()
+        x = np.zeros((3, 4), order="F")
+        obj.f_order_never = x
+        assert obj.f_order_never is x
+        with pytest.raises(pt.TransformError):
+            obj.f_order_never = np.zeros((3, 4))
+
+    def test_aligned(self, cls):
+        obj = cls()
+        x = np.zeros(4)
+        obj.aligned = x
+        assert obj.aligned is x
+        y = misaligned(4)
+        obj.aligned = y
+        assert obj.aligned.flags.aligned
+        assert not np.shares_memory(obj.aligned, y)
+        assert cls.aligned.transform.copies == 1
+
+    def test_writeable(self, cls):
+        obj = cls()
+        x = np.zeros(4)
+        obj.writeable = x
+        assert obj.writeable is x
+        x.flags.writeable = False
+        obj.writeable = x
+        assert obj.writeable.flags.writeable
+        assert not np.shares_memory(obj.writeable, x)
+        assert cls.writeable.transform.copies == 1
+
+    def test_frozen(self, cls):
+        first, second = cls(), cls()
+        x = np.zeros(4)
+        first.frozen = x
+        # A read-only view is stored, and the input is unchanged
+        assert np.shares_memory(first.frozen, x)
+        assert not first.frozen.flags.writeable
+        assert x.flags.writeable
+        with pytest.raises(ValueError):
+            first.frozen[0] = 1.0
+        # Frozen arrays can be shared without copying
+        second.frozen = first.frozen
+        assert second.frozen is first.frozen
+        assert cls.frozen.transform.copies == 0
+
+    def test_frozen_copy(self, cls):
+        obj = cls()
+        obj.frozen_float = [1, 2, 3]
+        assert not obj.frozen_float.flags.writeable
+        assert obj.frozen_float.base is None
+        assert cls.frozen_float.transform.copies == 1
+
+    def test_invalid_order(self):
+        with pytest.raises(ValueError, match="order must be one of"):
+            pt.numpy.numpy_array(order="K")
@@ -0,0 +1,93 @@
+import pickle
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+
+@pt.model
+class Item:
+    weight = pt.positive()
+    price = pt.int_in_range((0, 100))
+    colour = pt.in_set({"red", "green"})
+
+
+class Unattached:
+    pass
+
+
+def outcome(descriptor, value):
+    class MyClass:
+        pass
+
+    descriptor.__set_name__(MyClass, "x")
+    obj = MyClass()
+    try:
+        descriptor.__set__(obj, value)
+    except ValueError:
+        return ValueError
+    return obj.x
+
+
+@pytest.mark.parametrize(
+    "descriptor",
+    [
+        pt.positive(),
+        pt.int_in_range((0, 10), inclusive=(True, False)),
+        pt.float_not_in_range((-1, 1)),
+        pt.in_set({"a", "b", (1, 2)}),
+        pt.in_set([[1], [2], "a"]),
+        pt.in_set({"a", "b"}, encode=True),
+        pt.in_set(pt.numpy.SortedArraySet(["a", "b"])),
+        pt.numpy.numpy_array(shape=(2,), dtype=float, sort=True),
+        pt.positive(cache=True),
+    ],
+)
+def test_pickle_unnamed(descriptor):
+    # Compiled checks should be dropped when pickling
+    if descriptor.condition is not None:
+        descriptor.condition(1)
+    copied = pickle.loads(pickle.dumps(descriptor))
+    assert type(copied).__name__ == type(descriptor).__name__
+    assert copied.metadata["kind"] == descriptor.metadata["kind"]
+    assert copied.metadata["type"] == descriptor.metadata["type"]
+    for value in ["a", 1, -1, 5.5, [2, 1], [1]]:
+        expected = outcome(descriptor, value)
+        result = outcome(copied, value)
+        assert type(result) is type(expected)
+        assert np.all(result == expected)
+
+
+def test_pickle_by_reference():
+    assert pickle.loads(pickle.dumps(Item.__dict__["weight"])) is Item.weight
+    assert pickle.loads(pickle.dumps(Item.weight.condition)) is not None
+    item = pickle.loads(pickle.dumps(Item(1.0, 5, "red")))
+    assert (item.weight, item.price, item.colour) == (1.0, 5, "red")
+
+
+def records(n):
+    for i in range(n):
+        price = 200 if i % 7 == 0 else i % 100
+        yield {"weight": float(i), "price": price, "colour": "red"}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_validate(workers):
+    expected_rejects = []
+    expected = list(pt.stream(Item, records(1000), rejects=expected_rejects.append))
+    instances, rejects = pt.parallel_validate(
+        Item, records(1000), workers=workers, chunk_size=64
+    )
+    assert [(i.weight, i.price) for i in instances] == [
+        (i.weight, i.price) for i in expected
+    ]
+    assert [r.index for r in rejects] == [r.index for r in expected_rejects]
+    assert rejects[1].index == 7
+    assert set(rejects[1].errors) == {"price"}
+    assert isinstance(rejects[1].errors["price"], ValueError)
+
+
+def test_parallel_validate_empty():
+    assert pt.parallel_validate(Item, [], workers=2) == ([], [])
+    with pytest.raises(ValueError):
+        pt.parallel_validate(Item, [], chunk_size=0)
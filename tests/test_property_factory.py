@@ -1,4 +1,4 @@
-from proper_tea import property_factory
+from proper_tea import property_factory, ProperTeaDescriptor, ConditionError, check
 
 import pytest
 
@@ -70,3 +70,185 @@ def test_property_factory_condition(property_class):
     with pytest.raises(ValueError) as execinfo:
         property_class.less_than_5 = "hello world."
     assert "raise" in str(execinfo.value)
+
+
+def test_property_factory_descriptor(property_class):
+    # Accessing from the class should return the descriptor itself
+    descriptor = type(property_class).equal_to_5
+    assert isinstance(descriptor, ProperTeaDescriptor)
+    assert descriptor.name == "equal_to_5"
+    assert descriptor.owner is type(property_class)
+    # Values should be stored under the public name in the instance __dict__
+    assert vars(property_class) == {
+        "ends_in_dot": "string.",
+        "equal_to_5": 5,
+        "less_than_5": 3,
+    }
+    # Writes should still be validated, even though reads bypass the descriptor
+    with pytest.raises(ValueError) as execinfo:
+        property_class.equal_to_5 = 4
+    assert "equal_to_5" in str(execinfo.value)
+    assert vars(property_class)["equal_to_5"] == 5
+
+
+def test_property_factory_unnamed():
+    # Descriptors attached after the class is created are named on first use
+    descriptor = property_factory(condition=lambda z: z == 5)
+
+    class MyClass:
+        pass
+
+    class SubClass(MyClass):
+        pass
+
+    MyClass.equal_to_5 = descriptor
+    my_class = SubClass()
+    my_class.equal_to_5 = 5
+    assert my_class.equal_to_5 == 5
+    assert descriptor.name == "equal_to_5"
+    assert descriptor.owner is MyClass
+    with pytest.raises(ValueError):
+        my_class.equal_to_5 = 4
+    # Descriptors which are not attached to the class cannot be used
+    with pytest.raises(TypeError):
+        property_factory().__set__(MyClass(), 5)
+
+
+def test_property_factory_two_names():
+    descriptor = property_factory()
+    with pytest.raises((TypeError, RuntimeError)) as excinfo:
+
+        class MyClass:
+            a = b = descriptor
+
+    # Before Python 3.12, errors in __set_name__ are wrapped in RuntimeError
+    error = excinfo.value
+    assert isinstance(error, TypeError) or isinstance(error.__cause__, TypeError)
+    # Reusing the same name in another class is allowed
+    descriptor = property_factory()
+
+    class First:
+        x = descriptor
+
+    class Second:
+        x = descriptor
+
+    with pytest.raises(TypeError):
+        descriptor.__set_name__(Second, "y")
+
+
+def test_property_factory_cache():
+    calls = []
+
+    def expensive_transform(z):
+        calls.append(z)
+        return float(z)
+
+    class MyClass:
+        cached = property_factory(
+            condition=lambda z: z != "0",
+            transform=expensive_transform,
+            cache=2,
+        )
+
+    my_class = MyClass()
+    descriptor = MyClass.cached
+    for _ in range(10):
+        my_class.cached = "3.5"
+    assert my_class.cached == 3.5
+    assert calls == ["3.5"]
+    info = descriptor.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (9, 1, 2, 1)
+    # Inputs of different types should be cached separately
+    my_class.cached = 3
+    assert isinstance(my_class.cached, float)
+    assert calls == ["3.5", 3]
+    my_class.cached = 4.5
+    # Unhashable inputs should bypass the cache
+    with pytest.raises(ValueError) as execinfo:
+        my_class.cached = [1.0]
+    assert "MyClass" in str(execinfo.value)
+    assert descriptor.cache_info().currsize == 2
+    # Invalid inputs should raise as normal and not be cached
+    with pytest.raises(ValueError) as execinfo:
+        my_class.cached = "0"
+    assert "MyClass" in str(execinfo.value)
+    assert "False" in str(execinfo.value)
+    assert my_class.cached == 4.5
+    descriptor.cache_clear()
+    assert descriptor.cache_info().currsize == 0
+
+
+def test_property_factory_cache_invalid():
+    calls = []
+
+    def condition(z):
+        calls.append(z)
+        if z == "raise":
+            raise KeyError(z)
+        return z > 0
+
+    class MyClass:
+        cached = property_factory(condition=condition, cache=True)
+
+    my_class = MyClass()
+    # Invalid inputs are validated once per assignment, not twice
+    for _ in range(3):
+        with pytest.raises(ConditionError) as excinfo:
+            my_class.cached = -1
+        assert excinfo.value.owner is MyClass
+        assert excinfo.value.value == -1
+        assert not excinfo.value.raised
+    assert calls == [-1, -1, -1]
+    with pytest.raises(ConditionError) as excinfo:
+        my_class.cached = "raise"
+    assert excinfo.value.raised
+    assert isinstance(excinfo.value.__cause__, KeyError)
+    result = check(my_class, "cached", -1)
+    assert not result.valid and result.error.owner is MyClass
+    assert calls == [-1, -1, -1, "raise", -1]
+
+
+def test_property_factory_no_cache(property_class):
+    assert type(property_class).equal_to_5.cache_info() is None
+
+
+def test_property_factory_instance_condition():
+    calls = []
+
+    def below_upper(cls, instance, value, siblings):
+        calls.append((cls, instance, value, dict(siblings)))
+        upper = siblings.get("upper", getattr(instance, "upper", None))
+        return not isinstance(upper, int) or value < upper
+
+    class Bounds:
+        upper = property_factory(transform=int)
+        lower = property_factory(
+            transform=int,
+            instance_condition=below_upper,
+            condition_err_msg="Must be below upper",
+        )
+
+    bounds = Bounds()
+    bounds.lower = "5"
+    assert calls == [(Bounds, bounds, 5, {})]
+    bounds.upper = 3
+    with pytest.raises(ValueError) as excinfo:
+        bounds.lower = "4"
+    assert "Must be below upper" in str(excinfo.value)
+    # The error reports the value before the transform
+    assert excinfo.value.value == "4"
+    assert bounds.lower == 5
+    bounds.lower = 2.0
+    assert bounds.lower == 2
+
+
+def test_property_factory_instance_condition_combine():
+    def always(cls, instance, value, siblings):
+        return True
+
+    a = ProperTeaDescriptor(instance_condition=always)
+    b = ProperTeaDescriptor()
+    assert (a & b).instance_condition is always
+    with pytest.raises(ValueError):
+        a & ProperTeaDescriptor(instance_condition=lambda *args: True)
@@ -0,0 +1,123 @@
+import gc
+import weakref
+
+import pytest
+import proper_tea as pt
+
+
+@pt.model
+class Item:
+    weight = pt.positive()
+    price = pt.positive_int()
+    colour = pt.in_set({"red", "green"})
+
+
+class PlainItem:
+    weight = pt.positive()
+    price = pt.positive_int(cache=True)
+
+
+class Derived(PlainItem):
+    size = pt.property_factory(transform=int)
+
+
+@pytest.fixture
+def record():
+    return {"weight": 1.5, "price": 3.0, "colour": "red"}
+
+
+def test_dict(record):
+    validator = pt.schema(Item)
+    assert validator(record) == {"weight": 1.5, "price": 3, "colour": "red"}
+    # The input is not modified
+    assert record["price"] == 3.0
+
+
+def test_tuple(record):
+    assert pt.schema(Item, as_tuple=True)(record) == (1.5, 3, "red")
+
+
+def test_cached():
+    assert pt.schema(Item) is pt.schema(Item)
+    assert pt.schema(Item, as_tuple=True) is pt.schema(Item, as_tuple=True)
+    assert pt.schema(Item) is not pt.schema(Item, as_tuple=True)
+
+
+def test_cache_does_not_keep_class_alive():
+    class Temporary:
+        x = pt.positive()
+
+    pt.schema(Temporary)({"x": 1})
+    ref = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert ref() is None
+
+
+def test_matches_instance(record):
+    item = Item(**record)
+    assert pt.schema(Item)(record) == {name: getattr(item, name) for name in record}
+
+
+def test_inherited_fields():
+    validator = pt.schema(Derived, as_tuple=True)
+    assert validator({"weight": 1, "price": 2.0, "size": "3"}) == (1, 2, 3)
+    assert validator({"weight": 1, "price": 2.0, "size": "3"}) == (1, 2, 3)
+    # Validators of the base class are not inherited
+    pt.schema(Item)
+    assert pt.schema(Derived) is not pt.schema(Item)
+
+
+@pytest.mark.parametrize(
+    "name, value, error",
+    [
+        ("weight", -1.0, pt.ConditionError),
+        ("price", "a", pt.ConditionError),
+        ("colour", "blue", pt.ConditionError),
+    ],
+)
+def test_invalid(record, name, value, error):
+    record[name] = value
+    with pytest.raises(error) as info:
+        pt.schema(Item)(record)
+    assert info.value.field == name
+    assert info.value.owner is Item
+    assert info.value.value == value
+    with pytest.raises(ValueError) as expected:
+        Item(**record)
+    assert str(info.value) == str(expected.value)
+
+
+def test_transform_error():
+    with pytest.raises(pt.TransformError):
+        pt.schema(Derived)({"weight": 1, "price": 2, "size": "large"})
+
+
+def test_missing_field(record):
+    del record["price"]
+    with pytest.raises(TypeError, match="Missing field 'price'"):
+        pt.schema(Item)(record)
+    record["size"] = 1
+    with pytest.raises(TypeError, match="Missing field 'price'"):
+        pt.schema(Item)(record)
+
+
+def test_extra_field(record):
+    record["size"] = 1
+    with pytest.raises(TypeError, match="Class Item has no field 'size'"):
+        pt.schema(Item)(record)
+
+
+def test_trusted(record):
+    record["weight"] = -1.0
+    with pt.trusted():
+        with pytest.raises(pt.ConditionError):
+            pt.schema(Item)(record)
+
+
+def test_no_fields():
+    class Empty:
+        pass
+
+    assert pt.schema(Empty)({}) == {}
+    assert pt.schema(Empty, as_tuple=True)({}) == ()
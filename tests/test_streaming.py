@@ -0,0 +1,73 @@
+import itertools
+import pytest
+import proper_tea as pt
+
+
+@pt.model
+class Item:
+    weight = pt.positive()
+    price = pt.positive_int()
+
+
+class PlainItem:
+    weight = pt.positive()
+    price = pt.positive_int()
+
+    def __init__(self, *args):
+        raise AssertionError("Should not be called")
+
+
+@pytest.fixture(params=[Item, PlainItem])
+def cls(request):
+    return request.param
+
+
+@pytest.fixture
+def records():
+    return [
+        {"weight": 1.5, "price": 3.0},
+        {"weight": -1, "price": 2},
+        {"weight": 2, "price": 4},
+        {"weight": -1, "price": "a"},
+        {"weight": 2},
+        {"weight": 2, "price": 4, "colour": "red"},
+        {"weight": 3, "price": 5.5},
+    ]
+
+
+def test_stream(cls, records):
+    rejects = []
+    items = list(pt.stream(cls, records, chunk_size=2, rejects=rejects.append))
+    assert all(type(item) is cls for item in items)
+    assert [(item.weight, item.price) for item in items] == [
+        (1.5, 3),
+        (2, 4),
+        (3, 5),
+    ]
+    assert [reject.index for reject in rejects] == [1, 3, 4, 5]
+    assert rejects[0].record is records[1]
+    assert set(rejects[0].errors) == {"weight"}
+    assert isinstance(rejects[0].errors["weight"], ValueError)
+    # All failing fields are reported
+    assert set(rejects[1].errors) == {"weight", "price"}
+    assert "'price' in class" in str(rejects[1].errors["price"])
+    assert set(rejects[2].errors) == {"price"}
+    assert isinstance(rejects[2].errors["price"], TypeError)
+    assert set(rejects[3].errors) == {"colour"}
+
+
+def test_no_rejects_sink(cls, records):
+    assert len(list(pt.stream(cls, records))) == 3
+
+
+def test_lazy(cls):
+    # Unbounded input is consumed one chunk at a time
+    records = ({"weight": i, "price": i} for i in itertools.count())
+    items = pt.stream(cls, records, chunk_size=10)
+    assert [item.price for item in itertools.islice(items, 25)] == list(range(25))
+    assert next(records)["price"] == 30
+
+
+def test_bad_chunk_size():
+    with pytest.raises(ValueError):
+        pt.stream(Item, [], chunk_size=0)
@@ -0,0 +1,110 @@
+import pytest
+import numpy as np
+import proper_tea as pt
+import proper_tea.numpy
+
+
+class Item:
+    weight = pt.positive()
+    price = pt.positive_int()
+    fraction = pt.in_range((0, 1))
+    colour = pt.in_set({"red", "green", "blue"})
+
+
+@pytest.fixture
+def table():
+    return pt.numpy.Table(Item, 5)
+
+
+def test_columns(table):
+    assert len(table) == 5
+    assert table.columns == ["weight", "price", "fraction", "colour"]
+    assert table["weight"].dtype == np.float64
+    assert table["price"].dtype == np.int64
+    assert table["fraction"].dtype == np.float64
+    assert table["colour"].dtype == object
+    assert np.all(table["price"] == 0)
+    assert np.all(table["colour"] == None)  # noqa: E711
+
+
+def test_dtypes():
+    table = pt.numpy.Table(Item, 3, dtypes={"price": np.int32, "weight": "f4"})
+    assert table["price"].dtype == np.int32
+    assert table["weight"].dtype == np.float32
+    with pytest.raises(ValueError):
+        pt.numpy.Table(Item, 3, dtypes={"size": int})
+
+
+def test_row_proxy(table):
+    row = table[1]
+    row.weight = 2.5
+    row.price = 3.7
+    row.colour = "red"
+    assert row.weight == 2.5
+    assert row.price == 3
+    assert type(row.price) is int
+    assert row.colour == "red"
+    assert table["price"][1] == 3
+    assert table[-4].price == 3
+    assert "price=3" in repr(row)
+    with pytest.raises(IndexError):
+        table[5]
+
+
+def test_row_proxy_validation(table):
+    row = table[0]
+    with pytest.raises(ValueError) as excinfo:
+        row.weight = -1
+    assert "'weight' in class Item" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        row.price = "a"
+    with pytest.raises(ValueError):
+        row.colour = "purple"
+    with pytest.raises(AttributeError):
+        row.size = 3
+    assert row.weight == 0.0
+    assert row.colour is None
+
+
+def test_column_assignment(table):
+    table["price"] = [1, 2, 3.5, 4, 5]
+    np.testing.assert_array_equal(table["price"], [1, 2, 3, 4, 5])
+    table["price", 1:3] = 10
+    np.testing.assert_array_equal(table["price"], [1, 10, 10, 4, 5])
+    table["price", [0, 4]] = [7, 8]
+    np.testing.assert_array_equal(table["price"], [7, 10, 10, 4, 8])
+    table["colour"] = "blue"
+    assert list(table["colour"]) == ["blue"] * 5
+    assert [row.price for row in table] == [7, 10, 10, 4, 8]
+
+
+def test_column_validation(table):
+    values = [0.5, 2, 0.1, -1, 1]
+    with pytest.raises(pt.BatchError) as excinfo:
+        table["fraction"] = values
+    assert "failed for 2 of 5 values, at indices [1, 3]" in str(excinfo.value)
+    assert list(excinfo.value.indices) == [1, 3]
+    assert excinfo.value.value is values
+    assert excinfo.value.field == "fraction"
+    assert isinstance(excinfo.value, pt.ProperTeaValidationError)
+    # Nothing is assigned if any value fails
+    assert np.all(table["fraction"] == 0)
+    with pytest.raises(ValueError):
+        table["colour", 0] = "purple"
+    with pytest.raises(KeyError):
+        table["size"] = 1
+
+
+def test_columns_read_only(table):
+    with pytest.raises(ValueError):
+        table["price"][0] = -1
+
+
+def test_trusted(table):
+    with pt.trusted():
+        table[0].weight = -1
+        table["price"] = -2
+    assert table[0].weight == -1
+    assert table[0].price == -2
+    with pytest.raises(ValueError):
+        table[0].weight = -1
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import warnings
+
+import proper_tea as pt
+import pytest
+
+
+@pytest.fixture
+def trusted_test_class():
+    class MyClass:
+        pos = pt.positive()
+        pos_int = pt.positive_int()
+
+    return MyClass()
+
+
+def test_trusted_skips_validation(trusted_test_class):
+    test_class = trusted_test_class
+    assert not pt.is_trusted()
+    with pt.trusted():
+        assert pt.is_trusted()
+        test_class.pos = -1.0
+        assert test_class.pos == -1.0
+        # Transforms are also skipped by default
+        test_class.pos_int = 2.5
+        assert test_class.pos_int == 2.5
+    assert not pt.is_trusted()
+    # Validation resumes on exit
+    with pytest.raises(ValueError):
+        test_class.pos = -1.0
+    test_class.pos_int = 2.5
+    assert test_class.pos_int == 2
+
+
+def test_trusted_with_transforms(trusted_test_class):
+    test_class = trusted_test_class
+    with pt.trusted(transforms=True):
+        test_class.pos_int = -2.5
+        assert test_class.pos_int == -2
+        assert isinstance(test_class.pos_int, int)
+        # Nested contexts restore the enclosing mode
+        with pt.trusted():
+            test_class.pos_int = -2.5
+            assert test_class.pos_int == -2.5
+        test_class.pos_int = -3.5
+        assert test_class.pos_int == -3
+
+
+def test_trusted_restored_after_exception(trusted_test_class):
+    with pytest.raises(RuntimeError):
+        with pt.trusted():
+            raise RuntimeError()
+    assert not pt.is_trusted()
+    with pytest.raises(ValueError):
+        trusted_test_class.pos = -1.0
+
+
+def test_trusted_interleaved_exits(trusted_test_class):
+    test_class = trusted_test_class
+    # Blocks in concurrent tasks need not exit in the reverse order they were
+    # entered
+
+    async def first(entered, second_entered):
+        with pt.trusted():
+            entered.set()
+            await second_entered.wait()
+        # The second block is still active
+        assert pt.is_trusted()
+
+    async def second(first_entered, entered, first_task):
+        await first_entered.wait()
+        with pt.trusted(transforms=True):
+            entered.set()
+            await first_task
+            test_class.pos_int = -2.5
+            assert test_class.pos_int == -2
+
+    async def main():
+        first_entered, second_entered = asyncio.Event(), asyncio.Event()
+        first_task = asyncio.ensure_future(first(first_entered, second_entered))
+        await second(first_entered, second_entered, first_task)
+
+    asyncio.run(main())
+    assert not pt.is_trusted()
+    with pytest.raises(ValueError):
+        test_class.pos = -5
+
+
+def test_trusted_overlapping_generators(trusted_test_class):
+    # Exiting in the order entered, rather than reverse order
+    outer, inner = pt.trusted(), pt.trusted(transforms=True)
+    outer.__enter__()
+    inner.__enter__()
+    outer.__exit__(None, None, None)
+    trusted_test_class.pos_int = -2.5
+    assert trusted_test_class.pos_int == -2
+    inner.__exit__(None, None, None)
+    assert not pt.is_trusted()
+    # set_trusted applies once all blocks have exited
+    with pt.trusted():
+        pt.set_trusted()
+    assert pt.is_trusted()
+    with pt.trusted():
+        pt.set_trusted(False)
+        assert pt.is_trusted()
+    assert not pt.is_trusted()
+
+
+def test_set_trusted(trusted_test_class):
+    test_class = trusted_test_class
+    pt.set_trusted()
+    try:
+        # Properties created while trusted should also skip validation
+        class OtherClass:
+            neg = pt.negative()
+
+        other = OtherClass()
+        other.neg = 5
+        test_class.pos = -5
+    finally:
+        pt.set_trusted(False)
+    with pytest.raises(ValueError):
+        other.neg = 5
+    with pytest.raises(ValueError):
+        test_class.pos = -5
+
+
+def test_trusted_model():
+    @pt.model
+    class Item:
+        weight = pt.positive()
+        price = pt.positive_int()
+
+    with pt.trusted():
+        item = Item(-1.0, 2.5)
+    assert item.weight == -1.0
+    assert item.price == 2.5
+    with pytest.raises(ValueError):
+        Item(-1.0, 2.5)
+
+
+def test_trusted_warns_off_main_thread():
+    caught = []
+
+    def enter():
+        with warnings.catch_warnings(record=True) as records:
+            warnings.simplefilter("always")
+            with pt.trusted():
+                pass
+            pt.set_trusted()
+            pt.set_trusted(False)
+        caught.extend(records)
+
+    thread = threading.Thread(target=enter)
+    thread.start()
+    thread.join()
+    assert [record.category for record in caught] == [RuntimeWarning] * 2
+    # Warnings refer to the caller, not to proper_tea or contextlib
+    assert all(record.filename == __file__ for record in caught)
+    assert not pt.is_trusted()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pt.trusted():
+            pass